@@ -1,24 +1,55 @@
-import argparse
 import importlib
 import logging
 import os
 import pathlib
 import sys
-from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Any
 
-from . import j1939, logreader, tester
 from .errors import Error
 
-# Remove once less users are using the old package structure.
-from . import database as db  # isort: skip
+if TYPE_CHECKING:
+    from . import aio, database, j1939, logreader, tester
+
+    # Remove once less users are using the old package structure.
+    from . import database as db  # isort: skip
 
 __author__ = 'Erik Moqvist'
 
-try:
-    __version__ = version("cantools")
-except PackageNotFoundError:
-    # package is not installed
-    pass
+# Submodules and attributes that are imported on first access to keep
+# "import cantools" and the command line fast.
+_LAZY_SUBMODULES = {
+    'aio': 'aio',
+    'database': 'database',
+    'db': 'database',
+    'j1939': 'j1939',
+    'logreader': 'logreader',
+    'tester': 'tester'
+}
+
+
+def __getattr__(name: str) -> Any:
+    value: Any
+
+    if name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f'.{_LAZY_SUBMODULES[name]}', __name__)
+    elif name == '__version__':
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            value = version("cantools")
+        except PackageNotFoundError:
+            # package is not installed
+            raise AttributeError(name) from None
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_SUBMODULES, '__version__'])
 
 
 class _ErrorSubparser:
@@ -54,7 +85,47 @@ def _load_subparser(subparser_name, subparsers):
                                  f'Command "{subparser_name}" is unavailable: "{e}"')
         result.add_subparser(subparsers)
 
+def _subparser_names(subparsers_dir):
+    """Returns the names of all subparsers, which have a source file in
+    the cantools module's 'subparsers' sub-directory.
+
+    """
+
+    subparser_names = []
+
+    for cur_file_name in sorted(os.listdir(subparsers_dir)):
+        if cur_file_name.startswith('__'):
+            continue
+
+        if cur_file_name.endswith('.py'):
+            subparser_names.append(cur_file_name[:-3])
+        elif (subparsers_dir / cur_file_name / "__init__.py").is_file():
+            subparser_names.append(cur_file_name)
+
+    return subparser_names
+
+
+def _requested_subparser_name(argv, subparser_names):
+    """Returns the subcommand given on the command line, or ``None`` if
+    not found before any other positional argument.
+
+    """
+
+    for arg in argv:
+        if arg in ['-d', '--debug']:
+            continue
+
+        if arg in subparser_names:
+            return arg
+
+        break
+
+    return None
+
+
 def _main():
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog='cantools',
         description='Various CAN utilities.',
@@ -64,7 +135,7 @@ def _main():
     parser.add_argument('-d', '--debug', action='store_true')
     parser.add_argument('--version',
                         action='version',
-                        version=__version__,
+                        version=__getattr__('__version__'),
                         help='Print version information and exit.')
 
     # Workaround to make the subparser required in Python 3.
@@ -72,20 +143,17 @@ def _main():
                                        dest='subcommand')
     subparsers.required = True
 
-
-    # load all subparses which have a source file in the cantools
-    # module's 'subparsers' sub-directory
+    # only load the subparser of given subcommand, or all subparsers
+    # if none was given, e.g. to print the help text
     subparsers_dir = pathlib.Path(__file__).parent / 'subparsers'
-    for cur_file_name in os.listdir(subparsers_dir):
-        if cur_file_name.startswith('__'):
-            continue
+    subparser_names = _subparser_names(subparsers_dir)
+    subparser_name = _requested_subparser_name(sys.argv[1:], subparser_names)
 
-        if cur_file_name.endswith('.py'):
-            subparser_name = cur_file_name[:-3]
-            _load_subparser(subparser_name, subparsers)
-        elif (subparsers_dir / cur_file_name / "__init__.py").is_file():
-            subparser_name = cur_file_name
-            _load_subparser(subparser_name, subparsers)
+    if subparser_name is not None:
+        subparser_names = [subparser_name]
+
+    for subparser_name in subparser_names:
+        _load_subparser(subparser_name, subparsers)
 
     args = parser.parse_args()
 
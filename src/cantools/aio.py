@@ -0,0 +1,209 @@
+# Asyncio streaming of CAN frames.
+
+import asyncio
+import datetime
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from . import logreader
+from .database.errors import DecodeError
+
+if TYPE_CHECKING:
+    from .database.can import Database, Message
+    from .typechecking import DecodeResultType
+
+#: Default maximum number of bytes read from a stream per batch.
+BLOCK_SIZE = 64 * 1024
+
+#: Default maximum number of messages read from a bus per batch.
+BATCH_SIZE = 1000
+
+
+class DecodedFrame(NamedTuple):
+    """A frame decoded by :func:`decode_frames`.
+
+    """
+
+    #: The frame.
+    frame: logreader.DataFrame
+
+    #: The database message of the frame.
+    message: 'Message'
+
+    #: The decoded signals of the frame.
+    signals: 'DecodeResultType'
+
+
+async def _read_lines(stream: Any, block_size: int) -> AsyncIterator[list[str]]:
+    tail = b''
+
+    while True:
+        data = await stream.read(block_size)
+
+        if not data:
+            if tail:
+                yield [tail.decode('utf-8', 'replace')]
+
+            return
+
+        lines, separator, tail = (tail + data).rpartition(b'\n')
+
+        if separator:
+            yield lines.decode('utf-8', 'replace').split('\n')
+
+
+async def _read_messages(reader: Any, batch_size: int) -> AsyncIterator[list[Any]]:
+    buffer = reader.buffer
+
+    while True:
+        messages = [await buffer.get()]
+
+        while len(messages) < batch_size:
+            try:
+                messages.append(buffer.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        yield messages
+
+
+async def read_frames(reader: Any,
+                      timestamps: str = 'datetime',
+                      frame_ids: Any = None,
+                      block_size: int = BLOCK_SIZE,
+                      batch_size: int = BATCH_SIZE) \
+        -> AsyncIterator[list[logreader.DataFrame]]:
+    """Returns an asynchronous generator that yields lists of DataFrames
+    read from given reader.
+
+    `reader` is either an :class:`asyncio.StreamReader` of a log in
+    any format supported by :class:`~cantools.logreader.Parser`, or a
+    python-can :class:`can.AsyncBufferedReader`. Each list holds the
+    frames that were available when it was read. That is, from at most
+    `block_size` bytes of the stream, or at most `batch_size` messages
+    of the bus. Remote and error frames of the bus are discarded.
+
+    The next list is only read once the previous one is consumed. A
+    slow consumer therefore leaves data in the stream reader, whose
+    transport stops reading once its buffer limit is reached. The
+    buffer of a :class:`can.AsyncBufferedReader` has no limit.
+
+    `timestamps` and `frame_ids` are the same as for
+    :class:`~cantools.logreader.Parser`. Timestamps of bus messages
+    are absolute.
+
+    >>> async for frames in cantools.aio.read_frames(reader): #doctest: +SKIP
+            for frame in frames:
+                print(f'{frame.timestamp}: {frame.frame_id}')
+    """
+
+    parser = logreader.Parser(timestamps=timestamps, frame_ids=frame_ids)
+
+    if hasattr(reader, 'read'):
+        async for lines in _read_lines(reader, block_size):
+            frames = []
+
+            for line in lines:
+                frame = parser.parse(line.rstrip('\r'))
+
+                if frame is not None:
+                    frames.append(frame)
+
+            if frames:
+                yield frames
+    else:
+        frame_ids = parser.frame_ids
+        float_timestamps = parser.float_timestamps
+        channels: dict[Any, str] = {}
+
+        async for messages in _read_messages(reader, batch_size):
+            frames = []
+
+            for message in messages:
+                if message.is_error_frame or message.is_remote_frame:
+                    continue
+
+                frame_id = message.arbitration_id
+
+                if frame_ids is not None and frame_id not in frame_ids:
+                    continue
+
+                try:
+                    channel = channels[message.channel]
+                except KeyError:
+                    channel = '' if message.channel is None else str(message.channel)
+                    channels[message.channel] = channel
+
+                timestamp = message.timestamp
+
+                if not float_timestamps:
+                    timestamp = datetime.datetime.fromtimestamp(
+                        timestamp,
+                        datetime.timezone.utc)
+
+                frames.append(logreader.DataFrame(channel,
+                                                  frame_id,
+                                                  message.data,
+                                                  timestamp,
+                                                  logreader.TimestampFormat.ABSOLUTE))
+
+            if frames:
+                yield frames
+
+
+async def decode_frames(reader: Any,
+                        database: 'Database',
+                        decode_choices: bool = True,
+                        scaling: bool = True,
+                        decode_containers: bool = False,
+                        allow_truncated: bool = False,
+                        allow_excess: bool = True,
+                        timestamps: str = 'datetime',
+                        block_size: int = BLOCK_SIZE,
+                        batch_size: int = BATCH_SIZE) \
+        -> AsyncIterator[list[DecodedFrame]]:
+    """Returns an asynchronous generator that yields lists of
+    :class:`DecodedFrame` read from given reader and decoded with given
+    database.
+
+    Frames of messages not in the database are discarded without
+    fully parsing them. Frames that fail to decode, for example as
+    they are truncated, are discarded as well. The decode options are
+    the same as for :meth:`~cantools.database.can.Message.decode()`,
+    and all other arguments the same as for :func:`read_frames()`.
+
+    >>> async for frames in cantools.aio.decode_frames(reader, db): #doctest: +SKIP
+            for frame, message, signals in frames:
+                print(f'{frame.timestamp}: {message.name}{signals}')
+    """
+
+    messages: dict[int, Message] = {}
+
+    async for frames in read_frames(reader,
+                                    timestamps,
+                                    database,
+                                    block_size,
+                                    batch_size):
+        decoded_frames = []
+
+        for frame in frames:
+            try:
+                message = messages[frame.frame_id]
+            except KeyError:
+                message = database.get_message_by_frame_id(frame.frame_id)
+                messages[frame.frame_id] = message
+
+            try:
+                signals = message.decode(frame.data,
+                                         decode_choices,
+                                         scaling,
+                                         decode_containers,
+                                         allow_truncated,
+                                         allow_excess)
+            except DecodeError:
+                continue
+
+            decoded_frames.append(DecodedFrame(frame, message, signals))
+
+        if decoded_frames:
+            yield decoded_frames
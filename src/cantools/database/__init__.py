@@ -1,16 +1,39 @@
+import io
+import logging
 import os
-from contextlib import nullcontext
+import re
+import time
+from collections.abc import Iterable
 from typing import Any, Optional, TextIO, Union
 
-import diskcache
-
 from ..typechecking import StringPathLike
-from . import can, diagnostics, utils
+from . import cache, can, diagnostics, utils
 
 # Remove once less users are using the old package structure.
 from .can import *  # noqa: F403
 from .errors import Error, ParseError
 
+LOGGER = logging.getLogger(__name__)
+
+# All supported database formats in probing order.
+_DATABASE_FORMATS = ('arxml', 'dbc', 'kcd', 'sym', 'cdd')
+
+# Only the beginning of a database string is inspected by
+# detect_format().
+_DETECT_FORMAT_LENGTH = 8192
+
+_XML_PROLOG_RE = re.compile(r'\s*(?:<\?.*?\?>|<!--.*?-->|<!DOCTYPE[^>]*>)',
+                            re.DOTALL)
+_XML_ROOT_RE = re.compile(r'\s*<(?:[\w.-]+:)?([\w.-]+)[\s/>]')
+_XML_ROOT_FORMATS = {
+    'AUTOSAR': 'arxml',
+    'NetworkDefinition': 'kcd',
+    'CANDELA': 'cdd'
+}
+_SYM_RE = re.compile(r'^[ \t]*FormatVersion[ \t]*=', re.MULTILINE)
+_DBC_RE = re.compile(r'^[ \t]*(?:VERSION[ \t]+"|NS_[ \t]*:|BS_[ \t]*:|BU_[ \t]*:|BO_[ \t]+\d)',
+                     re.MULTILINE)
+
 
 class UnsupportedDatabaseFormatError(Error):
     """This exception is raised when
@@ -75,6 +98,8 @@ def load_file(filename: StringPathLike,
               strict: bool = True,
               cache_dir: Optional[str] = None,
               sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit,
+              cache_size_limit: Optional[int] = None,
+              memoize: bool = False,
               ) -> Union[can.Database, diagnostics.Database]:
     """Open, read and parse given database file and return a
     :class:`can.Database<.can.Database>` or
@@ -130,11 +155,28 @@ def load_file(filename: StringPathLike,
     `cache_dir` specifies the database cache location in the file
     system. Give as ``None`` to disable the cache. By default the
     cache is disabled, but can be enabled with environment variable
-    `CANTOOLS_CACHE_DIR`. The cache key is db path with modification
-    time and all arguments that may influence the result. Using a
-    cache will significantly reduce the load time when reloading the
-    same file. The cache directory is automatically created if it does
-    not exist. Remove the cache directory `cache_dir` to clear the cache.
+    `CANTOOLS_CACHE_DIR`. The cache key is a hash of the file
+    contents and all arguments that may influence the result, so
+    copies of a file share the cache entry. Using a cache will
+    significantly reduce the load time when reloading the same
+    file. The cache directory is automatically created if it does not
+    exist.
+
+    `cache_size_limit` is the maximum size of the cache in bytes. The
+    least recently used databases are evicted once the limit is
+    exceeded. If ``None``, the limit is read from the environment
+    variable `CANTOOLS_CACHE_SIZE_LIMIT`, or the limit of an existing
+    cache is kept, which is 1 GiB for new caches. Use the functions
+    in :mod:`cantools.database.cache` or the ``cantools cache``
+    subcommand to inspect, prune and clear the cache.
+
+    If `memoize` is ``True``, the loaded database is kept in memory
+    and the same object is returned by later calls with the same
+    resolved path, file size, modification time and arguments. The
+    returned database is shared between all callers, so do not modify
+    it. At most :data:`cantools.database.cache.MEMOIZE_MAXSIZE` least
+    recently used databases are kept. Call
+    :func:`cantools.database.cache.clear_memoized()` to release them.
 
     See :func:`~cantools.database.load_string()` for descriptions of
     other arguments.
@@ -155,44 +197,269 @@ def load_file(filename: StringPathLike,
         encoding,
         filename)
 
+    if not memoize:
+        return _load_file(filename,
+                          database_format,
+                          encoding,
+                          frame_id_mask,
+                          prune_choices,
+                          strict,
+                          cache_dir,
+                          sort_signals,
+                          cache_size_limit)
+
+    stat = os.stat(filename)
+    memoize_key = (
+        os.path.realpath(filename),
+        stat.st_size,
+        stat.st_mtime_ns,
+        database_format,
+        encoding,
+        frame_id_mask,
+        prune_choices,
+        strict,
+        sort_signals,
+    )
+    db = cache.get_memoized(memoize_key)
+
+    if db is None:
+        db = _load_file(filename,
+                        database_format,
+                        encoding,
+                        frame_id_mask,
+                        prune_choices,
+                        strict,
+                        cache_dir,
+                        sort_signals,
+                        cache_size_limit)
+        cache.set_memoized(memoize_key, db)
+
+    return db
+
+def _load_file(filename: StringPathLike,
+               database_format: Optional[str],
+               encoding: Optional[str],
+               frame_id_mask: Optional[int],
+               prune_choices: bool,
+               strict: bool,
+               cache_dir: Optional[str],
+               sort_signals: utils.type_sort_signals,
+               cache_size_limit: Optional[int],
+               ) -> Union[can.Database, diagnostics.Database]:
     cache_dir = cache_dir or os.getenv("CANTOOLS_CACHE_DIR", None)
+
+    if not cache_dir:
+        with open(filename, encoding=encoding, errors='replace') as fin:
+            return load(fin,
+                        database_format,
+                        frame_id_mask,
+                        prune_choices,
+                        strict,
+                        sort_signals)
+
+    with open(filename, 'rb') as fin:
+        data = fin.read()
+
     cache_key: Optional[tuple[Any, ...]] = None
+
+    # do not cache if user-defined sort_signals function is provided
+    # the key cannot be created if function is local or depends on context
+    # pickle serializer will fail anyway
+    if not callable(sort_signals) or sort_signals.__module__ == 'cantools.database.utils':
+        cache_key = cache.make_key(data,
+                                   database_format,
+                                   encoding,
+                                   frame_id_mask,
+                                   prune_choices,
+                                   strict,
+                                   sort_signals)
+
     db: Union[can.Database, diagnostics.Database]
 
-    with diskcache.Cache(cache_dir) if cache_dir else nullcontext() as cache:
-        if cache:
-            # do not cache if user-defined sort_signals function is provided
-            # the key cannot be created if function is local or depends on context
-            # pickle serializer will fail anyway
-            if not callable(sort_signals) or sort_signals.__module__ == 'cantools.database.utils':
-                cache_key = (
-                    database_format,
-                    encoding,
-                    frame_id_mask,
-                    prune_choices,
-                    strict,
-                    sort_signals,
-                    filename,
-                    os.path.getmtime(filename),
-                )
-
-            db = cache.get(cache_key)
+    with cache.open_cache(cache_dir, cache_size_limit) as dbcache:
+        if cache_key is not None:
+            db = dbcache.get(cache_key)
+
             if isinstance(db, (can.Database, diagnostics.Database)):
+                cache.record_hit(cache_dir)
+
                 return db
 
-        with open(filename, encoding=encoding, errors='replace') as fin:
+        start_time = time.perf_counter()
+
+        with io.TextIOWrapper(io.BytesIO(data),
+                              encoding=encoding,
+                              errors='replace') as fin:
             db = load(fin,
-                    database_format,
-                    frame_id_mask,
-                    prune_choices,
-                    strict,
-                    sort_signals)
+                      database_format,
+                      frame_id_mask,
+                      prune_choices,
+                      strict,
+                      sort_signals)
 
-        if cache:
-            cache[cache_key] = db
+        if cache_key is not None:
+            dbcache[cache_key] = db
+            cache.record_miss(cache_dir, time.perf_counter() - start_time)
 
         return db
 
+def _load_can_file(filename: StringPathLike,
+                   options: dict[str, Any]) -> can.Database:
+    """Load a single file of a bundle. This is executed in the worker
+    processes of :func:`~cantools.database.load_files()`.
+
+    """
+
+    db = load_file(filename, **options)
+
+    if not isinstance(db, can.Database):
+        raise Error(f'"{filename}" is not a CAN database and cannot be '
+                    f'merged with other databases.')
+
+    return db
+
+
+def _merge_can_databases(databases: list[tuple[StringPathLike, can.Database]],
+                         frame_id_mask: Optional[int],
+                         strict: bool,
+                         sort_signals: utils.type_sort_signals) -> can.Database:
+    messages: list[can.Message] = []
+    nodes: list[can.Node] = []
+    buses: list[can.Bus] = []
+    version = None
+    dbc_specifics = None
+    autosar_specifics = None
+    mask = 0xffffffff if frame_id_mask is None else frame_id_mask
+    message_names: dict[str, StringPathLike] = {}
+    frame_ids: dict[int, tuple[str, StringPathLike]] = {}
+    node_names: set[str] = set()
+    bus_names: set[str] = set()
+
+    for filename, database in databases:
+        for message in database.messages:
+            if message.name in message_names:
+                LOGGER.warning("Message '%s' from '%s' is also defined in '%s'.",
+                               message.name,
+                               filename,
+                               message_names[message.name])
+
+            masked_frame_id = message.frame_id & mask
+
+            if message.is_extended_frame:
+                masked_frame_id |= 0x80000000
+
+            if masked_frame_id in frame_ids:
+                other_name, other_filename = frame_ids[masked_frame_id]
+                LOGGER.warning("Message '%s' from '%s' and message '%s' from "
+                               "'%s' have identical masked frame ids 0x%x.",
+                               message.name,
+                               filename,
+                               other_name,
+                               other_filename,
+                               masked_frame_id)
+
+            message_names[message.name] = filename
+            frame_ids[masked_frame_id] = (message.name, filename)
+            messages.append(message)
+
+        for node in database.nodes:
+            if node.name not in node_names:
+                node_names.add(node.name)
+                nodes.append(node)
+
+        for bus in database.buses:
+            if bus.name not in bus_names:
+                bus_names.add(bus.name)
+                buses.append(bus)
+
+        if database.version is not None:
+            version = database.version
+
+        if database.dbc is not None:
+            dbc_specifics = database.dbc
+
+        if database.autosar is not None:
+            autosar_specifics = database.autosar
+
+    # The database constructor refreshes all messages once.
+    return can.Database(messages,
+                        nodes,
+                        buses,
+                        version,
+                        dbc_specifics,
+                        autosar_specifics,
+                        frame_id_mask=frame_id_mask,
+                        strict=strict,
+                        sort_signals=sort_signals)
+
+
+def load_files(filenames: Iterable[StringPathLike],
+               database_format: Optional[str] = None,
+               encoding: Optional[str] = None,
+               frame_id_mask: Optional[int] = None,
+               prune_choices: bool = False,
+               strict: bool = True,
+               cache_dir: Optional[str] = None,
+               sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit,
+               jobs: Optional[int] = None) -> can.Database:
+    """Open, read and parse given CAN database files and merge them into
+    a single :class:`can.Database<.can.Database>` object.
+
+    The files are parsed in parallel by up to `jobs` worker
+    processes. If `jobs` is ``None``, the number of CPUs is used. Pass
+    ``jobs=1`` to load all files in the calling process. When using
+    worker processes, `sort_signals` must be picklable, i.e., a module
+    level function.
+
+    Messages are added in the order of `filenames`. A warning is
+    logged if a message name or a masked frame id is defined in more
+    than one file. In this case the message of the later file is
+    found by :meth:`~cantools.database.can.Database.get_message_by_name()`
+    and :meth:`~cantools.database.can.Database.get_message_by_frame_id()`.
+    Nodes and buses are merged by name, while the version and the
+    format specific properties of the last file defining them are
+    used.
+
+    See :func:`~cantools.database.load_file()` for descriptions of
+    other arguments.
+
+    >>> db = cantools.database.load_files(['foo.dbc', 'bar.arxml'], jobs=4)
+
+    """
+
+    filenames = list(filenames)
+    options = {
+        'database_format': database_format,
+        'encoding': encoding,
+        'frame_id_mask': frame_id_mask,
+        'prune_choices': prune_choices,
+        'strict': strict,
+        'cache_dir': cache_dir,
+        'sort_signals': sort_signals,
+    }
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    jobs = min(jobs, len(filenames))
+
+    if jobs <= 1:
+        databases = [_load_can_file(filename, options)
+                     for filename in filenames]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            databases = list(executor.map(_load_can_file,
+                                          filenames,
+                                          [options] * len(filenames)))
+
+    return _merge_can_databases(list(zip(filenames, databases)),
+                                frame_id_mask,
+                                strict,
+                                sort_signals)
+
+
 def dump_file(database,
               filename,
               database_format=None,
@@ -227,22 +494,47 @@ def dump_file(database,
         encoding,
         filename)
 
-    newline = None
+    if database_format not in ['dbc', 'kcd', 'sym']:
+        raise Error(
+            f"Unsupported output database format '{database_format}'.")
+
+    # the dbc writer outputs windows-style line endings itself
+    newline = '' if database_format == 'dbc' else None
+
+    with open(filename, 'w', encoding=encoding, newline=newline, errors='replace') as fout:
+        dump(database, fout, database_format, sort_signals)
+
+
+def dump(database: can.Database,
+         fp: TextIO,
+         database_format: str,
+         sort_signals: utils.type_sort_signals = utils.SORT_SIGNALS_DEFAULT) -> None:
+    """Write given database `database` in given format to given
+    file-like object `fp`. The database is written incrementally, so
+    the whole output is never held in memory.
+
+    `database_format` is one of ``'dbc'``, ``'kcd'`` and ``'sym'``.
+
+    See :func:`~cantools.database.dump_file()` for a description of
+    `sort_signals`. Open files for the ``'dbc'`` format with
+    ``newline=''`` to keep its Windows-style line endings.
+
+    >>> db = cantools.database.load_file('foo.dbc')
+    >>> with open('bar.kcd', 'w') as fout:
+    ...     cantools.database.dump(db, fout, 'kcd')
+
+    """
 
     if database_format == 'dbc':
-        output = database.as_dbc_string(sort_signals=sort_signals)
-        newline = ''
+        database.dump_dbc(fp, sort_signals=sort_signals)
     elif database_format == 'kcd':
-        output = database.as_kcd_string(sort_signals=sort_signals)
+        database.dump_kcd(fp, sort_signals=sort_signals)
     elif database_format == 'sym':
-        output = database.as_sym_string(sort_signals=sort_signals)
+        database.dump_sym(fp, sort_signals=sort_signals)
     else:
         raise Error(
             f"Unsupported output database format '{database_format}'.")
 
-    with open(filename, 'w', encoding=encoding, newline=newline, errors='replace') as fout:
-        fout.write(output)
-
 
 def load(fp: TextIO,
          database_format: Optional[str] = None,
@@ -278,6 +570,46 @@ def load(fp: TextIO,
                        sort_signals)
 
 
+def detect_format(string: str) -> Optional[str]:
+    """Returns the format of given database string, one of ``'arxml'``,
+    ``'dbc'``, ``'kcd'``, ``'sym'`` and ``'cdd'``, or ``None`` if it
+    cannot be determined.
+
+    The format is detected without parsing the database by inspecting
+    the root element of XML formats, the ``FormatVersion=`` header of
+    SYM and the ``VERSION``, ``NS_``, ``BU_`` and ``BO_`` keywords of
+    DBC in the beginning of the string.
+
+    >>> with open('foo.dbc') as fin:
+    ...    cantools.database.detect_format(fin.read())
+    'dbc'
+
+    """
+
+    head = string[:_DETECT_FORMAT_LENGTH].lstrip('\ufeff')
+    pos = 0
+
+    while True:
+        mo = _XML_PROLOG_RE.match(head, pos)
+
+        if mo is None or mo.end() == pos:
+            break
+
+        pos = mo.end()
+
+    mo = _XML_ROOT_RE.match(head, pos)
+
+    if mo is not None:
+        return _XML_ROOT_FORMATS.get(mo.group(1))
+
+    if _SYM_RE.search(head):
+        return 'sym'
+
+    if _DBC_RE.search(head):
+        return 'dbc'
+
+    return None
+
 def load_string(string: str,
                 database_format: Optional[str] = None,
                 frame_id_mask: Optional[int] = None,
@@ -292,7 +624,9 @@ def load_string(string: str,
 
     `database_format` may be one of ``'arxml'``, ``'dbc'``, ``'kcd'``,
     ``'sym'``, ``'cdd'`` or ``None``, where ``None`` means transparent
-    format.
+    format. The format is detected with
+    :func:`~cantools.database.detect_format()` and only if that fails
+    all formats are tried one after another.
 
     `prune_choices` is a bool indicating whether signal names are supposed to be abbreviated
     by stripping a common prefix ending on an underscore. This is enabled by default.
@@ -318,16 +652,12 @@ def load_string(string: str,
 
     """
 
-    if database_format not in ['arxml', 'dbc', 'kcd', 'sym', 'cdd', None]:
+    if database_format not in [*_DATABASE_FORMATS, None]:
         raise ValueError(
             f"expected database format 'arxml', 'dbc', 'kcd', 'sym', 'cdd' or "
             f"None, but got '{database_format}'")
 
-    e_arxml = None
-    e_dbc = None
-    e_kcd = None
-    e_sym = None
-    e_cdd = None
+    errors: dict[str, Optional[Exception]] = dict.fromkeys(_DATABASE_FORMATS)
 
     def load_can_database(fmt: str) -> can.Database:
         db = can.Database(frame_id_mask=frame_id_mask,
@@ -348,37 +678,35 @@ def load_string(string: str,
 
         return db
 
-    if database_format in ['arxml', None]:
-        try:
-            return load_can_database('arxml')
-        except Exception as e:
-            e_arxml = e
+    if database_format is not None:
+        database_formats = [database_format]
+    else:
+        # try the detected format first and probe all formats only if
+        # that fails
+        database_formats = list(_DATABASE_FORMATS)
+        detected_format = detect_format(string)
 
-    if database_format in ['dbc', None]:
-        try:
-            return load_can_database('dbc')
-        except Exception as e:
-            e_dbc = e
+        if detected_format is not None:
+            database_formats.remove(detected_format)
+            database_formats.insert(0, detected_format)
 
-    if database_format in ['kcd', None]:
+    for fmt in database_formats:
         try:
-            return load_can_database('kcd')
-        except Exception as e:
-            e_kcd = e
+            if fmt == 'cdd':
+                db = diagnostics.Database()
+                db.add_cdd_string(string)
 
-    if database_format in ['sym', None]:
-        try:
-            return load_can_database('sym')
+                return db
+            else:
+                return load_can_database(fmt)
         except Exception as e:
-            e_sym = e
+            errors[fmt] = e
 
-    if database_format in ['cdd', None]:
-        try:
-            db = diagnostics.Database()
-            db.add_cdd_string(string)
-            return db
-        except Exception as e:
-            e_cdd = e
+    e_arxml = errors['arxml']
+    e_dbc = errors['dbc']
+    e_kcd = errors['kcd']
+    e_sym = errors['sym']
+    e_cdd = errors['cdd']
 
     if database_format is not None:
         # raise an error while keeping the traceback of the original
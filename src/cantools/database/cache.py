@@ -0,0 +1,211 @@
+# Database cache.
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import cache
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    import diskcache
+
+# Loaded databases are stored in the cache directory itself, while
+# the statistics are stored in this subdirectory, which is not
+# subject to eviction.
+_STATS_DIRECTORY = 'stats'
+
+#: Maximum number of databases kept in memory by
+#: ``load_file(..., memoize=True)``.
+MEMOIZE_MAXSIZE = 32
+
+# Databases loaded with memoize=True, least recently used first.
+_memoized: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+_memoized_lock = threading.Lock()
+
+
+class CacheStats(NamedTuple):
+    """Statistics of a database cache directory.
+
+    """
+
+    #: Number of databases found in the cache.
+    hits: int
+
+    #: Number of databases not found in the cache.
+    misses: int
+
+    #: Total time in seconds spent loading the missed databases.
+    load_time: float
+
+    #: Number of databases in the cache.
+    databases: int
+
+    #: Size of the cache in bytes.
+    size: int
+
+    #: Maximum size of the cache in bytes.
+    size_limit: int
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of hits to all lookups, or 0 if the cache was never used.
+
+        """
+
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
+
+
+@cache
+def _version() -> Optional[str]:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version('cantools')
+    except PackageNotFoundError:
+        return None
+
+
+def content_hash(data: bytes) -> str:
+    """Returns the hash of given database file contents, which is used as
+    part of the cache key.
+
+    """
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_key(data: bytes, *options: Any) -> tuple[Any, ...]:
+    """Returns the cache key of a database file with contents `data`
+    loaded with given options.
+
+    The key does not depend on the path or the modification time of
+    the file, i.e., a copy of a file hits the cache.
+
+    """
+
+    return (content_hash(data), _version(), *options)
+
+
+def open_cache(cache_dir: str,
+               size_limit: Optional[int] = None) -> 'diskcache.Cache':
+    """Open the cache in given directory, which is created if missing.
+
+    The least recently used databases are evicted once the cache
+    exceeds `size_limit` bytes. If ``None``, the limit is read from
+    the environment variable `CANTOOLS_CACHE_SIZE_LIMIT`, or the limit
+    stored in the cache directory is kept.
+
+    """
+
+    import diskcache
+
+    if size_limit is None:
+        env_size_limit = os.getenv('CANTOOLS_CACHE_SIZE_LIMIT')
+
+        if env_size_limit:
+            size_limit = int(env_size_limit)
+
+    settings: dict[str, Any] = {
+        'eviction_policy': 'least-recently-used'
+    }
+
+    if size_limit is not None:
+        settings['size_limit'] = size_limit
+
+    return diskcache.Cache(cache_dir, **settings)
+
+
+def _open_stats(cache_dir: str) -> 'diskcache.Cache':
+    import diskcache
+
+    return diskcache.Cache(os.path.join(cache_dir, _STATS_DIRECTORY),
+                           eviction_policy='none')
+
+
+def record_hit(cache_dir: str) -> None:
+    with _open_stats(cache_dir) as stats:
+        stats.incr('hits')
+
+
+def record_miss(cache_dir: str, load_time: float) -> None:
+    with _open_stats(cache_dir) as stats:
+        with stats.transact():
+            stats.incr('misses')
+            stats.set('load_time', stats.get('load_time', 0.0) + load_time)
+
+
+def get_stats(cache_dir: str) -> CacheStats:
+    """Returns the statistics of the cache in given directory.
+
+    """
+
+    with open_cache(cache_dir) as cache, _open_stats(cache_dir) as stats:
+        return CacheStats(hits=stats.get('hits', 0),
+                          misses=stats.get('misses', 0),
+                          load_time=stats.get('load_time', 0.0),
+                          databases=len(cache),
+                          size=cache.volume(),
+                          size_limit=cache.size_limit)
+
+
+def prune(cache_dir: str, size_limit: Optional[int] = None) -> int:
+    """Evict the least recently used databases from the cache in given
+    directory until it is smaller than `size_limit` bytes. If `size_limit`
+    is given, it is stored as the new limit of the cache. Returns the
+    number of evicted databases.
+
+    """
+
+    with open_cache(cache_dir, size_limit) as cache:
+        count = len(cache)
+        cache.expire()
+        cache.cull()
+
+        return count - len(cache)
+
+
+def clear(cache_dir: str) -> int:
+    """Remove all databases and statistics from the cache in given
+    directory. Returns the number of removed databases.
+
+    """
+
+    with open_cache(cache_dir) as cache, _open_stats(cache_dir) as stats:
+        stats.clear()
+
+        return int(cache.clear())
+
+
+def get_memoized(key: tuple[Any, ...]) -> Optional[Any]:
+    with _memoized_lock:
+        db = _memoized.get(key)
+
+        if db is not None:
+            _memoized.move_to_end(key)
+
+        return db
+
+
+def set_memoized(key: tuple[Any, ...], db: Any) -> None:
+    with _memoized_lock:
+        _memoized[key] = db
+        _memoized.move_to_end(key)
+
+        while len(_memoized) > max(MEMOIZE_MAXSIZE, 0):
+            _memoized.popitem(last=False)
+
+
+def clear_memoized() -> int:
+    """Remove all databases kept in memory by ``load_file(...,
+    memoize=True)``. Returns the number of removed databases.
+
+    """
+
+    with _memoized_lock:
+        count = len(_memoized)
+        _memoized.clear()
+
+        return count
@@ -2,4 +2,5 @@ from .bus import Bus
 from .database import Database
 from .message import DecodeError, EncodeError, Message
 from .node import Node
+from .shared_database import SharedDatabase
 from .signal import Signal
@@ -1,6 +1,7 @@
 import logging
 from collections import OrderedDict
 from typing import (
+    TYPE_CHECKING,
     Any,
     Optional,
     TextIO,
@@ -11,19 +12,21 @@ from ...typechecking import DecodeResultType, EncodeInputType, StringPathLike
 from ..errors import DecodeError
 from ..utils import (
     SORT_SIGNALS_DEFAULT,
+    compact_database,
     sort_signals_by_start_bit,
     type_sort_attributes,
     type_sort_choices,
     type_sort_signals,
 )
 from .bus import Bus
-from .formats import arxml, dbc, kcd, sym
-from .formats.arxml import AutosarDatabaseSpecifics
-from .formats.dbc import DbcSpecifics
 from .internal_database import InternalDatabase
 from .message import Message
 from .node import Node
 
+if TYPE_CHECKING:
+    from .formats.arxml import AutosarDatabaseSpecifics
+    from .formats.dbc import DbcSpecifics
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -50,8 +53,8 @@ class Database:
                  nodes: Optional[list[Node]] = None,
                  buses: Optional[list[Bus]] = None,
                  version: Optional[str] = None,
-                 dbc_specifics: Optional[DbcSpecifics] = None,
-                 autosar_specifics: Optional[AutosarDatabaseSpecifics] = None,
+                 dbc_specifics: Optional['DbcSpecifics'] = None,
+                 autosar_specifics: Optional['AutosarDatabaseSpecifics'] = None,
                  frame_id_mask: Optional[int] = None,
                  strict: bool = True,
                  sort_signals: type_sort_signals = sort_signals_by_start_bit,
@@ -61,6 +64,9 @@ class Database:
         self._buses = buses or []
         self._name_to_message: dict[str, Message] = {}
         self._frame_id_to_message: dict[int, Message] = {}
+        # The messages in the lookup tables with their name and masked
+        # frame id at the time they were added.
+        self._index_entries: list[tuple[Message, str, int]] = []
         self._version = version
         self._dbc = dbc_specifics
         self._autosar = autosar_specifics
@@ -114,7 +120,7 @@ class Database:
         self._version = value
 
     @property
-    def dbc(self) -> Optional[DbcSpecifics]:
+    def dbc(self) -> Optional['DbcSpecifics']:
         """An object containing dbc specific properties like e.g. attributes.
 
         """
@@ -122,11 +128,11 @@ class Database:
         return self._dbc
 
     @dbc.setter
-    def dbc(self, value: Optional[DbcSpecifics]) -> None:
+    def dbc(self, value: Optional['DbcSpecifics']) -> None:
         self._dbc = value
 
     @property
-    def autosar(self) -> Optional[AutosarDatabaseSpecifics]:
+    def autosar(self) -> Optional['AutosarDatabaseSpecifics']:
         """An object containing AUTOSAR specific properties like e.g. attributes.
 
         """
@@ -134,7 +140,7 @@ class Database:
         return self._autosar
 
     @autosar.setter
-    def autosar(self, value: Optional[AutosarDatabaseSpecifics]) -> None:
+    def autosar(self, value: Optional['AutosarDatabaseSpecifics']) -> None:
         self._autosar = value
 
 
@@ -256,15 +262,16 @@ class Database:
 
         """
 
+        from .formats import arxml
+
         database = arxml.load_string(string, self._strict, sort_signals=self._sort_signals)
 
-        self._messages += database.messages
+        self._add_messages(database.messages)
         self._nodes = database.nodes
         self._buses = database.buses
         self._version = database.version
         self._dbc = database.dbc
         self._autosar = database.autosar
-        self.refresh()
 
     def add_dbc(self, fp: TextIO) -> None:
         """Read and parse DBC data from given file-like object and add the
@@ -304,14 +311,15 @@ class Database:
 
         """
 
+        from .formats import dbc
+
         database = dbc.load_string(string, self._strict, sort_signals=self._sort_signals)
 
-        self._messages += database.messages
+        self._add_messages(database.messages)
         self._nodes = database.nodes
         self._buses = database.buses
         self._version = database.version
         self._dbc = database.dbc
-        self.refresh()
 
     def add_kcd(self, fp: TextIO) -> None:
         """Read and parse KCD data from given file-like object and add the
@@ -340,14 +348,15 @@ class Database:
 
         """
 
+        from .formats import kcd
+
         database = kcd.load_string(string, self._strict, sort_signals=self._sort_signals)
 
-        self._messages += database.messages
+        self._add_messages(database.messages)
         self._nodes = database.nodes
         self._buses = database.buses
         self._version = database.version
         self._dbc = database.dbc
-        self.refresh()
 
     def add_sym(self, fp: TextIO) -> None:
         """Read and parse SYM data from given file-like object and add the
@@ -376,30 +385,36 @@ class Database:
 
         """
 
+        from .formats import sym
+
         database = sym.load_string(string, self._strict, sort_signals=self._sort_signals)
 
-        self._messages += database.messages
+        self._add_messages(database.messages)
         self._nodes = database.nodes
         self._buses = database.buses
         self._version = database.version
         self._dbc = database.dbc
-        self.refresh()
 
-    def _add_message(self, message: Message) -> None:
-        """Add given message to the database.
+    def _masked_frame_id(self, message: Message) -> int:
+        masked_frame_id = (message.frame_id & self._frame_id_mask)
 
-        """
+        if message.is_extended_frame:
+            masked_frame_id |= 0x80000000
+
+        return masked_frame_id
 
+    def _add_message_name(self, message: Message) -> None:
         if message.name in self._name_to_message:
             LOGGER.warning("Overwriting message '%s' with '%s' in the "
                            "name to message dictionary.",
                            self._name_to_message[message.name].name,
                            message.name)
 
-        masked_frame_id = (message.frame_id & self._frame_id_mask)
-        if message.is_extended_frame:
-            masked_frame_id |= 0x80000000
+        self._name_to_message[message.name] = message
 
+    def _add_message_frame_id(self,
+                              message: Message,
+                              masked_frame_id: int) -> None:
         if masked_frame_id in self._frame_id_to_message:
             LOGGER.warning(
                 "Overwriting message '%s' with '%s' in the frame id to message "
@@ -408,9 +423,165 @@ class Database:
                 message.name,
                 masked_frame_id)
 
-        self._name_to_message[message.name] = message
         self._frame_id_to_message[masked_frame_id] = message
 
+    def _add_message(self, message: Message) -> None:
+        """Add given message to the database.
+
+        """
+
+        masked_frame_id = self._masked_frame_id(message)
+        self._add_message_name(message)
+        self._add_message_frame_id(message, masked_frame_id)
+        self._index_entries.append((message, message.name, masked_frame_id))
+
+    def _add_messages(self, messages: list[Message]) -> None:
+        """Refresh given messages if needed and add them to the database.
+        Messages already in the database are left untouched.
+
+        """
+
+        for message in messages:
+            if message.needs_refresh(self._strict):
+                message.refresh(self._strict)
+
+            self._messages.append(message)
+            self._add_message(message)
+
+    def _reindex(self,
+                 names: set[str],
+                 masked_frame_ids: set[int]) -> None:
+        """Rebuild the lookup table entries of given names and masked frame
+        ids. If multiple messages share a key, the last one wins.
+
+        """
+
+        for name in names:
+            self._name_to_message.pop(name, None)
+
+        for masked_frame_id in masked_frame_ids:
+            self._frame_id_to_message.pop(masked_frame_id, None)
+
+        for message, name, masked_frame_id in self._index_entries:
+            if name in names:
+                self._add_message_name(message)
+
+            if masked_frame_id in masked_frame_ids:
+                self._add_message_frame_id(message, masked_frame_id)
+
+    def _find_message(self, message_or_name: Union[Message, str]) -> Message:
+        if isinstance(message_or_name, str):
+            return self._name_to_message[message_or_name]
+
+        for message in self._messages:
+            if message is message_or_name:
+                return message
+
+        raise KeyError(message_or_name.name)
+
+    def add_message(self, message: Message) -> None:
+        """Add given message to the database.
+
+        The message is refreshed and added to the lookup tables. An
+        existing message with the same name or masked frame id is
+        shadowed by the new one.
+
+        """
+
+        message.refresh(self._strict)
+
+        self._messages.append(message)
+        self._add_message(message)
+
+    def remove_message(self, message_or_name: Union[Message, str]) -> None:
+        """Remove given message, or the message with given name, from the
+        database.
+
+        Raises a ``KeyError`` if the message is not part of the database.
+
+        """
+
+        message = self._find_message(message_or_name)
+        self._messages = [m for m in self._messages if m is not message]
+        removed = [entry for entry in self._index_entries if entry[0] is message]
+        self._index_entries = [
+            entry for entry in self._index_entries if entry[0] is not message
+        ]
+        self._reindex({entry[1] for entry in removed},
+                      {entry[2] for entry in removed})
+
+    def replace_message(self,
+                        old: Union[Message, str],
+                        new: Message) -> None:
+        """Replace given message, or the message with given name, by message
+        `new` at the same position in the database.
+
+        The new message is refreshed. Raises a ``KeyError`` if the
+        replaced message is not part of the database.
+
+        """
+
+        old_message = self._find_message(old)
+        new.refresh(self._strict)
+
+        self._messages = [
+            new if m is old_message else m for m in self._messages
+        ]
+        masked_frame_id = self._masked_frame_id(new)
+        names = {new.name}
+        masked_frame_ids = {masked_frame_id}
+        index_entries = []
+
+        for entry in self._index_entries:
+            if entry[0] is old_message:
+                names.add(entry[1])
+                masked_frame_ids.add(entry[2])
+                entry = (new, new.name, masked_frame_id)
+
+            index_entries.append(entry)
+
+        self._index_entries = index_entries
+        self._reindex(names, masked_frame_ids)
+
+    def _as_internal_database(self) -> InternalDatabase:
+        return InternalDatabase(self._messages,
+                                self._nodes,
+                                self._buses,
+                                self._version,
+                                self._dbc)
+
+    def dump_dbc(self,
+                 fp: TextIO,
+                 *,
+                 sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT,
+                 sort_attribute_signals:type_sort_signals=SORT_SIGNALS_DEFAULT,
+                 sort_attributes:type_sort_attributes=None,
+                 sort_choices:type_sort_choices=None,
+                 shorten_long_names:bool=True) -> None:
+        """Write the database formatted as a DBC file to given file-like
+        object. The file is written incrementally, which requires much
+        less memory than :meth:`as_dbc_string()` for large databases.
+
+        See :meth:`as_dbc_string()` for a description of the
+        arguments.
+
+        >>> with open('foo.dbc', 'w', newline='') as fout:
+        ...     db.dump_dbc(fout)
+
+        """
+        if not self._sort_signals and sort_signals == SORT_SIGNALS_DEFAULT:
+            sort_signals = None
+
+        from .formats import dbc
+
+        dbc.dump(self._as_internal_database(),
+                 fp,
+                 sort_signals=sort_signals,
+                 sort_attribute_signals=sort_attribute_signals,
+                 sort_attributes=sort_attributes,
+                 sort_choices=sort_choices,
+                 shorten_long_names=shorten_long_names)
+
     def as_dbc_string(self, *,
                       sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT,
                       sort_attribute_signals:type_sort_signals=SORT_SIGNALS_DEFAULT,
@@ -426,17 +597,30 @@ class Database:
         if not self._sort_signals and sort_signals == SORT_SIGNALS_DEFAULT:
             sort_signals = None
 
-        return dbc.dump_string(InternalDatabase(self._messages,
-                                                self._nodes,
-                                                self._buses,
-                                                self._version,
-                                                self._dbc),
+        from .formats import dbc
+
+        return dbc.dump_string(self._as_internal_database(),
                                sort_signals=sort_signals,
                                sort_attribute_signals=sort_attribute_signals,
                                sort_attributes=sort_attributes,
                                sort_choices=sort_choices,
                                shorten_long_names=shorten_long_names)
 
+    def dump_kcd(self,
+                 fp: TextIO,
+                 *,
+                 sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> None:
+        """Write the database formatted as a KCD file to given file-like
+        object.
+
+        """
+        if not self._sort_signals and sort_signals == SORT_SIGNALS_DEFAULT:
+            sort_signals = None
+
+        from .formats import kcd
+
+        kcd.dump(self._as_internal_database(), fp, sort_signals=sort_signals)
+
     def as_kcd_string(self, *, sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> str:
         """Return the database as a string formatted as a KCD file.
 
@@ -444,13 +628,26 @@ class Database:
         if not self._sort_signals and sort_signals == SORT_SIGNALS_DEFAULT:
             sort_signals = None
 
-        return kcd.dump_string(InternalDatabase(self._messages,
-                                                self._nodes,
-                                                self._buses,
-                                                self._version,
-                                                self._dbc),
+        from .formats import kcd
+
+        return kcd.dump_string(self._as_internal_database(),
                                sort_signals=sort_signals)
 
+    def dump_sym(self,
+                 fp: TextIO,
+                 *,
+                 sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> None:
+        """Write the database formatted as a SYM file to given file-like
+        object.
+
+        """
+        if not self._sort_signals and sort_signals == SORT_SIGNALS_DEFAULT:
+            sort_signals = None
+
+        from .formats import sym
+
+        sym.dump(self._as_internal_database(), fp, sort_signals=sort_signals)
+
     def as_sym_string(self, *, sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> str:
         """Return the database as a string formatted as a SYM file.
 
@@ -458,11 +655,9 @@ class Database:
         if not self._sort_signals and sort_signals == SORT_SIGNALS_DEFAULT:
             sort_signals = None
 
-        return sym.dump_string(InternalDatabase(self._messages,
-                                                self._nodes,
-                                                self._buses,
-                                                self._version,
-                                                self._dbc),
+        from .formats import sym
+
+        return sym.dump_string(self._as_internal_database(),
                                sort_signals=sort_signals)
 
     def get_message_by_name(self, name: str) -> Message:
@@ -603,21 +798,101 @@ class Database:
                               scaling,
                               allow_truncated=allow_truncated)
 
-    def refresh(self) -> None:
+    def compact(self) -> int:
+        """Reduce the memory footprint of the database and return the
+        number of bytes saved.
+
+        Units, receivers, senders, node names and choice names are
+        interned, so equal strings are stored once, even across
+        databases. Signals with equal receivers share a single list
+        and signals with equal scaling and choices share a single
+        conversion. Modify the shared lists and choices by assigning
+        new ones instead of changing them in place.
+
+        """
+
+        return compact_database(self)
+
+    def precompile(self) -> None:
+        """Create the codecs of all messages now instead of on their
+        first encode or decode, for example to avoid the delay in a
+        service handling its first frames.
+
+        """
+
+        for message in self._messages:
+            message.precompile()
+
+    def check_layout(self) -> None:
+        """Raise an exception if the signals of any message are
+        overlapping or don't fit in their message.
+
+        This check is done when loading a database with `strict` set
+        to ``True``, and may be done separately for databases loaded
+        with `strict` set to ``False``.
+
+        """
+
+        for message in self._messages:
+            message.check_layout()
+
+    def refresh(self, incremental: bool = False) -> None:
         """Refresh the internal database state.
 
         This method must be called after modifying any message in the
         database to refresh the internal lookup tables used when
-        encoding and decoding messages.
+        encoding and decoding messages. Adding data with the
+        ``add_*()`` methods only refreshes the added messages, so
+        earlier modifications, for example of a single signal, still
+        require a call to this method. ``refresh(incremental=True)``
+        is usually sufficient and only recompiles the modified
+        messages.
+
+        If `incremental` is ``True``, only messages which were modified
+        since they were last refreshed are recompiled, see
+        :meth:`~cantools.database.can.Message.needs_refresh()`, and
+        only the lookup table entries of added, removed or renamed
+        messages are rebuilt. In-place modifications of mutable signal
+        attributes, such as
+        :attr:`~cantools.database.can.Signal.multiplexer_ids`, are not
+        detected and require a full refresh.
 
         """
 
-        self._name_to_message = {}
-        self._frame_id_to_message = {}
+        if not incremental:
+            self._name_to_message = {}
+            self._frame_id_to_message = {}
+            self._index_entries = []
+
+            for message in self._messages:
+                message.refresh(self._strict)
+                self._add_message(message)
+
+            return
+
+        index_entries = []
 
         for message in self._messages:
-            message.refresh(self._strict)
-            self._add_message(message)
+            if message.needs_refresh(self._strict):
+                message.refresh(self._strict)
+
+            index_entries.append((message,
+                                  message.name,
+                                  self._masked_frame_id(message)))
+
+        if index_entries == self._index_entries:
+            return
+
+        changed = set(index_entries) ^ set(self._index_entries)
+        self._index_entries = index_entries
+
+        if changed:
+            self._reindex({entry[1] for entry in changed},
+                          {entry[2] for entry in changed})
+        else:
+            # Only the order of the messages changed.
+            self._reindex(set(self._name_to_message),
+                          set(self._frame_id_to_message))
 
     def __repr__(self) -> str:
         lines = [f"version('{self._version}')", '']
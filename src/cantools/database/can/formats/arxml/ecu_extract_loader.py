@@ -47,6 +47,14 @@ PARAMETER_VALUES_XPATH = make_xpath(['PARAMETER-VALUES'])
 REFERENCE_VALUES_XPATH = make_xpath([
     'REFERENCE-VALUES'
 ])
+AR_PACKAGE_XPATH = make_xpath(['AR-PACKAGES', 'AR-PACKAGE'])
+ECUC_MODULE_CONFIGURATION_VALUES_XPATH = make_xpath([
+    'ELEMENTS',
+    'ECUC-MODULE-CONFIGURATION-VALUES'
+])
+CONTAINERS_XPATH = make_xpath(['CONTAINERS'])
+SUB_CONTAINERS_XPATH = make_xpath(['SUB-CONTAINERS'])
+ECUC_CONTAINER_VALUE_XPATH = make_xpath(['ECUC-CONTAINER-VALUE'])
 
 class EcuExtractLoader:
 
@@ -57,6 +65,8 @@ class EcuExtractLoader:
         self.root = root
         self.strict = strict
         self.sort_signals = sort_signals
+        self._containers = None
+        self._can_if_pdu_cfgs = None
 
     def load(self) -> InternalDatabase:
         buses: list[Bus] = []
@@ -288,60 +298,114 @@ class EcuExtractLoader:
                       )
 
     def find_com_config(self, xpath):
-        return self.root.find(make_xpath([
-            "AR-PACKAGES",
-            "AR-PACKAGE/[ns:SHORT-NAME='{}']".format(xpath.split('/')[1]),
-            "ELEMENTS",
-            "ECUC-MODULE-CONFIGURATION-VALUES/[ns:SHORT-NAME='Com']",
-            "CONTAINERS",
-            "ECUC-CONTAINER-VALUE/[ns:SHORT-NAME='ComConfig']",
-            "SUB-CONTAINERS"
-        ]),
-                              NAMESPACES)
+        com_config = self.find_container(
+            '/{}/Com/ComConfig'.format(xpath.split('/')[1]))
+
+        if com_config is None:
+            return None
+
+        return com_config.find(SUB_CONTAINERS_XPATH, NAMESPACES)
 
     def find_value(self, xpath):
-        return self.root.find(make_xpath([
-            "AR-PACKAGES",
-            "AR-PACKAGE/[ns:SHORT-NAME='{}']".format(xpath.split('/')[1]),
-            "ELEMENTS",
-            "ECUC-MODULE-CONFIGURATION-VALUES/[ns:SHORT-NAME='Com']",
-            "CONTAINERS",
-            "ECUC-CONTAINER-VALUE/[ns:SHORT-NAME='ComConfig']",
-            "SUB-CONTAINERS",
-            "ECUC-CONTAINER-VALUE/[ns:SHORT-NAME='{}']".format(xpath.split('/')[-1])
-        ]),
-                              NAMESPACES)
+        parts = xpath.split('/')
+
+        return self.find_container(
+            f'/{parts[1]}/Com/ComConfig/{parts[-1]}')
 
     def find_can_if_rx_tx_pdu_cfg(self, com_pdu_id_ref):
-        messages = self.root.iterfind(
-            make_xpath([
-                "AR-PACKAGES",
-                "AR-PACKAGE/[ns:SHORT-NAME='{}']".format(
-                    com_pdu_id_ref.split('/')[1]),
-                "ELEMENTS",
-                "ECUC-MODULE-CONFIGURATION-VALUES/[ns:SHORT-NAME='CanIf']",
-                'CONTAINERS',
-                "ECUC-CONTAINER-VALUE/[ns:SHORT-NAME='CanIfInitCfg']",
-                'SUB-CONTAINERS',
-                'ECUC-CONTAINER-VALUE'
-            ]),
-            NAMESPACES)
+        if self._can_if_pdu_cfgs is None:
+            self._can_if_pdu_cfgs = self._create_can_if_pdu_cfgs()
+
+        return self._can_if_pdu_cfgs.get(
+            (com_pdu_id_ref.split('/')[1], com_pdu_id_ref))
+
+    def find_container(self, path):
+        """Returns the ECUC container value with given short name path,
+        ``/<package>/<module>/<container>[/<sub-container>...]``, or
+        ``None`` if missing.
+
+        """
+
+        if self._containers is None:
+            self._containers = self._create_containers()
+
+        return self._containers.get(path)
+
+    def _create_containers(self):
+        """Index all ECUC container values by their short name path in
+        a single traversal of the document, instead of searching from
+        the root for every PDU and signal.
+
+        """
+
+        containers = {}
 
-        for message in messages:
-            definition_ref = message.find(DEFINITION_REF_XPATH,
-                                          NAMESPACES).text
+        def add(parent_path, parent):
+            for container in parent.iterfind(ECUC_CONTAINER_VALUE_XPATH,
+                                              NAMESPACES):
+                path = parent_path + '/' + container.find(SHORT_NAME_XPATH,
+                                                          NAMESPACES).text
+                # The first container wins, just like root.find().
+                containers.setdefault(path, container)
 
-            if definition_ref.endswith('CanIfTxPduCfg'):
-                expected_reference = 'CanIfTxPduRef'
-            elif definition_ref.endswith('CanIfRxPduCfg'):
-                expected_reference = 'CanIfRxPduRef'
-            else:
+                sub_containers = container.find(SUB_CONTAINERS_XPATH,
+                                                NAMESPACES)
+
+                if sub_containers is not None:
+                    add(path, sub_containers)
+
+        for package in self.root.iterfind(AR_PACKAGE_XPATH, NAMESPACES):
+            package_name = package.find(SHORT_NAME_XPATH, NAMESPACES).text
+
+            for module in package.iterfind(
+                    ECUC_MODULE_CONFIGURATION_VALUES_XPATH,
+                    NAMESPACES):
+                module_name = module.find(SHORT_NAME_XPATH, NAMESPACES).text
+                module_containers = module.find(CONTAINERS_XPATH, NAMESPACES)
+
+                if module_containers is not None:
+                    add(f'/{package_name}/{module_name}', module_containers)
+
+        return containers
+
+    def _create_can_if_pdu_cfgs(self):
+        """Index the CanIf Tx and Rx PDU configurations by package name
+        and referenced PDU.
+
+        """
+
+        pdu_cfgs = {}
+
+        for package in self.root.iterfind(AR_PACKAGE_XPATH, NAMESPACES):
+            package_name = package.find(SHORT_NAME_XPATH, NAMESPACES).text
+            init_cfg = self.find_container(f'/{package_name}/CanIf/CanIfInitCfg')
+
+            if init_cfg is None:
                 continue
 
-            for reference, value in self.iter_reference_values(message):
-                if reference == expected_reference:
-                    if value == com_pdu_id_ref:
-                        return message
+            messages = init_cfg.iterfind(SUB_CONTAINERS_XPATH
+                                         + '/ns:ECUC-CONTAINER-VALUE',
+                                         NAMESPACES)
+
+            for message in messages:
+                definition_ref = message.find(DEFINITION_REF_XPATH,
+                                              NAMESPACES).text
+
+                if definition_ref.endswith('CanIfTxPduCfg'):
+                    expected_reference = 'CanIfTxPduRef'
+                elif definition_ref.endswith('CanIfRxPduCfg'):
+                    expected_reference = 'CanIfRxPduRef'
+                else:
+                    continue
+
+                if message.find(REFERENCE_VALUES_XPATH, NAMESPACES) is None:
+                    continue
+
+                for reference, value in self.iter_reference_values(message):
+                    if reference == expected_reference:
+                        pdu_cfgs.setdefault((package_name, value), message)
+
+        return pdu_cfgs
 
     def iter_parameter_values(self, param_conf_container):
         parameters = param_conf_container.find(PARAMETER_VALUES_XPATH,
@@ -1,9 +1,9 @@
 # Load and dump a CAN database in DBC format.
 
+import io
 import re
 import typing
 from collections import OrderedDict, defaultdict
-from copy import deepcopy
 from decimal import Decimal
 
 import textparser
@@ -44,7 +44,7 @@ from ..signal_group import SignalGroup
 from .dbc_specifics import DbcSpecifics
 from .utils import num
 
-DBC_FMT = (
+DBC_HEADER_FMT = (
     'VERSION "{version}"\r\n'
     '\r\n'
     '\r\n'
@@ -80,26 +80,7 @@ DBC_FMT = (
     '\r\n'
     'BS_:\r\n'
     '\r\n'
-    'BU_: {bu}\r\n'
-    '{val_table}'
-    '\r\n'
-    '\r\n'
-    '{bo}\r\n'
-    '\r\n'
-    '{bo_tx_bu}\r\n'
-    '\r\n'
-    '\r\n'
-    '{cm}\r\n'
-    '{ba_def}\r\n'
-    '{ba_def_rel}'
-    '{ba_def_def}\r\n'
-    '{ba_def_def_rel}'
-    '{ba}\r\n'
-    '{ba_rel}'
-    '{val}\r\n'
-    '{signal_types}\r\n'
-    '{sig_group}\r\n'
-    '{sig_mux_values}\r\n'
+    'BU_: '
 )
 
 
@@ -430,6 +411,125 @@ class LongNamesConverter:
         return short_name
 
 
+class _DumpNames:
+    """Names and attribute definitions of a database as written to a
+    DBC file. Long names are shortened in this side mapping instead
+    of modifying (a copy of) the database.
+
+    """
+
+    def __init__(self,
+                 database: InternalDatabase,
+                 shorten_long_names: bool) -> None:
+        if database.dbc is None:
+            self.definitions = OrderedDict()
+        else:
+            self.definitions = OrderedDict(database.dbc.attribute_definitions)
+
+        self._node_names: dict[str, str] = {}
+        self._names: dict[int, str] = {}
+        self._long_name_attributes: dict[int, Attribute] = {}
+
+        if shorten_long_names:
+            self._shorten_node_names(database)
+            self._shorten_message_names(database)
+            self._shorten_signal_names(database)
+
+        self._add_attribute_definitions(database)
+
+    def _shorten(self,
+                 item: typing.Union[Node, Message, Signal],
+                 name: str,
+                 attribute_name: str,
+                 default_definition: AttributeDefinition) -> None:
+        definition = self.definitions.setdefault(attribute_name,
+                                                 default_definition)
+        self._names[id(item)] = name
+        self._long_name_attributes[id(item)] = Attribute(item.name, definition)
+
+    def _shorten_node_names(self, database: InternalDatabase) -> None:
+        converter = LongNamesConverter()
+
+        for node in database.nodes:
+            name = converter.convert(node.name)
+
+            if name is not None:
+                self._node_names[node.name] = name
+                self._shorten(node,
+                              name,
+                              'SystemNodeLongSymbol',
+                              ATTRIBUTE_DEFINITION_LONG_NODE_NAME)
+
+    def _shorten_message_names(self, database: InternalDatabase) -> None:
+        converter = LongNamesConverter()
+
+        for message in database.messages:
+            name = converter.convert(message.name)
+
+            if name is not None:
+                self._shorten(message,
+                              name,
+                              'SystemMessageLongSymbol',
+                              ATTRIBUTE_DEFINITION_LONG_MESSAGE_NAME)
+
+    def _shorten_signal_names(self, database: InternalDatabase) -> None:
+        converter = LongNamesConverter()
+
+        for message in database.messages:
+            for signal in message.signals:
+                name = converter.convert(signal.name)
+
+                if name is not None:
+                    self._shorten(signal,
+                                  name,
+                                  'SystemSignalLongSymbol',
+                                  ATTRIBUTE_DEFINITION_LONG_SIGNAL_NAME)
+
+    def _add_attribute_definitions(self, database: InternalDatabase) -> None:
+        definitions = self.definitions
+
+        # define "GenMsgCycleTime" attribute for specifying the cycle
+        # times of messages if it has not been explicitly defined
+        if 'GenMsgCycleTime' not in definitions and _need_cycletime_def(database):
+            definitions['GenMsgCycleTime'] = ATTRIBUTE_DEFINITION_GENMSGCYCLETIME
+        if 'GenSigStartValue' not in definitions and _need_startval_def(database):
+            definitions['GenSigStartValue'] = ATTRIBUTE_DEFINITION_GENSIGSTARTVALUE
+
+        # create 'VFrameFormat' and 'CANFD_BRS' attribute definitions if bus is CAN FD
+        if _bus_is_canfd(database):
+            if 'VFrameFormat' not in definitions:
+                definitions['VFrameFormat'] = ATTRIBUTE_DEFINITION_VFRAMEFORMAT
+            if 'CANFD_BRS' not in definitions:
+                definitions['CANFD_BRS'] = ATTRIBUTE_DEFINITION_CANFD_BRS
+
+    def name(self, item: typing.Union[Node, Message, Signal]) -> str:
+        return self._names.get(id(item), item.name)
+
+    def node_name(self, name: str) -> str:
+        return self._node_names.get(name, name)
+
+    def attributes(self,
+                   item: typing.Union[Node, Message, Signal],
+                   long_name_attribute: str) -> OrderedDict:
+        """Returns the attributes of given node, message or signal with
+        the long name attribute replaced.
+
+        """
+
+        attributes = OrderedDict()
+
+        if item.dbc is not None and item.dbc.attributes is not None:
+            attributes.update(item.dbc.attributes)
+
+        attributes.pop(long_name_attribute, None)
+        attribute = self._long_name_attributes.get(id(item))
+
+        if attribute is not None:
+            attributes[long_name_attribute] = attribute
+
+        return attributes
+
+
 def get_dbc_frame_id(message):
     frame_id = message.frame_id
 
@@ -457,34 +557,24 @@ def _dump_version(database):
     return '' if database.version is None else database.version
 
 
-def _dump_nodes(database):
-    bu = []
-
+def _dump_nodes(database, names):
     for node in database.nodes:
-        bu.append(node.name)
-
-    return bu
+        yield names.name(node)
 
 
 def _dump_value_tables(database):
     if database.dbc is None:
-        return []
-
-    val_table = []
+        return
 
     for name, choices in database.dbc.value_tables.items():
         choices = [
             f'{number} "{text}"'
             for number, text in sorted(choices.items(), reverse=True)
         ]
-        val_table.append('VAL_TABLE_ {} {} ;'.format(name, ' '.join(choices)))
-
-    return [*val_table, '']
-
+        yield 'VAL_TABLE_ {} {} ;'.format(name, ' '.join(choices))
 
-def _dump_messages(database, sort_signals):
-    bo = []
 
+def _dump_messages(database, names, sort_signals):
     def format_mux(signal):
         if signal.is_multiplexer:
             return ' M'
@@ -495,20 +585,21 @@ def _dump_messages(database, sort_signals):
 
     def format_receivers(signal):
         if signal.receivers:
-            return ' ' + ','.join(signal.receivers)
+            return ' ' + ','.join([names.node_name(receiver)
+                                   for receiver in signal.receivers])
         else:
             return 'Vector__XXX'
 
     def format_senders(message):
         if message.senders:
-            return message.senders[0]
+            return names.node_name(message.senders[0])
         else:
             return 'Vector__XXX'
 
     for message in database.messages:
         msg = []
         msg.append(
-            f'BO_ {get_dbc_frame_id(message)} {message.name}: {message.length} {format_senders(message)}')
+            f'BO_ {get_dbc_frame_id(message)} {names.name(message)}: {message.length} {format_senders(message)}')
 
         if sort_signals:
             signals = sort_signals(message.signals)
@@ -519,7 +610,7 @@ def _dump_messages(database, sort_signals):
                    ' ({scale},{offset})'
                    ' [{minimum}|{maximum}] "{unit}" {receivers}')
             msg.append(fmt.format(
-                name=signal.name,
+                name=names.name(signal),
                 mux=format_mux(signal),
                 start=signal.start,
                 length=signal.length,
@@ -532,44 +623,34 @@ def _dump_messages(database, sort_signals):
                 maximum=(0 if signal.maximum is None else signal.maximum),
                 unit='' if signal.unit is None else signal.unit))
 
-        bo.append('\r\n'.join(msg))
-
-    return bo
-
+        yield '\r\n'.join(msg)
 
-def _dump_senders(database):
-    bo_tx_bu = []
 
+def _dump_senders(database, names):
     for message in database.messages:
         if len(message.senders) > 1:
-            bo_tx_bu.append(
-                'BO_TX_BU_ {frame_id} : {senders};'.format(
-                    frame_id=get_dbc_frame_id(message),
-                    senders=','.join(message.senders)))
-
-    return bo_tx_bu
+            yield 'BO_TX_BU_ {frame_id} : {senders};'.format(
+                frame_id=get_dbc_frame_id(message),
+                senders=','.join([names.node_name(sender)
+                                  for sender in message.senders]))
 
 
-def _dump_comments(database, sort_signals):
-    cm = []
-
+def _dump_comments(database, names, sort_signals):
     for bus in database.buses:
         if bus.comment is not None:
-            cm.append(f'CM_ "{bus.comment}";')
+            yield f'CM_ "{bus.comment}";'
 
     for node in database.nodes:
         if node.comment is not None:
-            cm.append(
-                'CM_ BU_ {name} "{comment}";'.format(
-                    name=node.name,
-                    comment=node.comment.replace('"', '\\"')))
+            yield 'CM_ BU_ {name} "{comment}";'.format(
+                name=names.name(node),
+                comment=node.comment.replace('"', '\\"'))
 
     for message in database.messages:
         if message.comment is not None:
-            cm.append(
-                'CM_ BO_ {frame_id} "{comment}";'.format(
-                    frame_id=get_dbc_frame_id(message),
-                    comment=message.comment.replace('"', '\\"')))
+            yield 'CM_ BO_ {frame_id} "{comment}";'.format(
+                frame_id=get_dbc_frame_id(message),
+                comment=message.comment.replace('"', '\\"'))
 
         if sort_signals:
             signals = sort_signals(message.signals)
@@ -577,27 +658,19 @@ def _dump_comments(database, sort_signals):
             signals = message.signals
         for signal in signals:
             if signal.comment is not None:
-                cm.append(
-                    'CM_ SG_ {frame_id} {name} "{comment}";'.format(
-                        frame_id=get_dbc_frame_id(message),
-                        name=signal.name,
-                        comment=signal.comment.replace('"', '\\"')))
-
-    return cm
-
+                yield 'CM_ SG_ {frame_id} {name} "{comment}";'.format(
+                    frame_id=get_dbc_frame_id(message),
+                    name=names.name(signal),
+                    comment=signal.comment.replace('"', '\\"'))
 
-def _dump_signal_types(database):
-    valtype = []
 
+def _dump_signal_types(database, names):
     for message in database.messages:
         for signal in message.signals:
             if not signal.is_float:
                 continue
 
-            valtype.append(
-                f'SIG_VALTYPE_ {get_dbc_frame_id(message)} {signal.name} : {FLOAT_LENGTH_TO_SIGNAL_TYPE[signal.length]};')
-
-    return valtype
+            yield f'SIG_VALTYPE_ {get_dbc_frame_id(message)} {names.name(signal)} : {FLOAT_LENGTH_TO_SIGNAL_TYPE[signal.length]};'
 
 
 def _need_startval_def(database):
@@ -619,28 +692,7 @@ def _bus_is_canfd(database: InternalDatabase) -> bool:
         return False
     return bus_type.value == 'CAN FD'  # type: ignore[no-any-return]
 
-def _dump_attribute_definitions(database: InternalDatabase) -> list[str]:
-    ba_def = []
-
-    if database.dbc is None:
-        definitions = OrderedDict()
-    else:
-        definitions = database.dbc.attribute_definitions
-
-    # define "GenMsgCycleTime" attribute for specifying the cycle
-    # times of messages if it has not been explicitly defined
-    if 'GenMsgCycleTime' not in definitions and _need_cycletime_def(database):
-        definitions['GenMsgCycleTime'] = ATTRIBUTE_DEFINITION_GENMSGCYCLETIME
-    if 'GenSigStartValue' not in definitions and _need_startval_def(database):
-        definitions['GenSigStartValue'] = ATTRIBUTE_DEFINITION_GENSIGSTARTVALUE
-
-    # create 'VFrameFormat' and 'CANFD_BRS' attribute definitions if bus is CAN FD
-    if _bus_is_canfd(database):
-        if 'VFrameFormat' not in definitions:
-            definitions['VFrameFormat'] = ATTRIBUTE_DEFINITION_VFRAMEFORMAT
-        if 'CANFD_BRS' not in definitions:
-            definitions['CANFD_BRS'] = ATTRIBUTE_DEFINITION_CANFD_BRS
-
+def _dump_attribute_definitions(names: _DumpNames) -> typing.Iterator[str]:
     def get_value(definition, value):
         if definition.minimum is None:
             value = ''
@@ -658,25 +710,18 @@ def _dump_attribute_definitions(database: InternalDatabase) -> list[str]:
     def get_kind(definition):
         return '' if definition.kind is None else definition.kind + ' '
 
-    for definition in definitions.values():
+    for definition in names.definitions.values():
         if definition.type_name == 'ENUM':
             choices = ','.join([f'"{choice}"'
                                 for choice in definition.choices])
-            ba_def.append(
-                f'BA_DEF_ {get_kind(definition)} "{definition.name}" {definition.type_name}  {choices};')
+            yield f'BA_DEF_ {get_kind(definition)} "{definition.name}" {definition.type_name}  {choices};'
         elif definition.type_name in ['INT', 'FLOAT', 'HEX']:
-            ba_def.append(
-                f'BA_DEF_ {get_kind(definition)} "{definition.name}" {definition.type_name}{get_minimum(definition)}{get_maximum(definition)};')
+            yield f'BA_DEF_ {get_kind(definition)} "{definition.name}" {definition.type_name}{get_minimum(definition)}{get_maximum(definition)};'
         elif definition.type_name == 'STRING':
-            ba_def.append(
-                f'BA_DEF_ {get_kind(definition)} "{definition.name}" {definition.type_name} ;')
-
-    return ba_def
+            yield f'BA_DEF_ {get_kind(definition)} "{definition.name}" {definition.type_name} ;'
 
 
 def _dump_attribute_definitions_rel(database):
-    ba_def_rel = []
-
     if database.dbc is None:
         definitions = OrderedDict()
     else:
@@ -700,42 +745,26 @@ def _dump_attribute_definitions_rel(database):
         if definition.type_name == 'ENUM':
             choices = ','.join([f'"{choice}"'
                                 for choice in definition.choices])
-            ba_def_rel.append(
-                f'BA_DEF_REL_ {definition.kind}  "{definition.name}" {definition.type_name}  {choices};')
+            yield f'BA_DEF_REL_ {definition.kind}  "{definition.name}" {definition.type_name}  {choices};'
         elif definition.type_name in ['INT', 'FLOAT', 'HEX']:
-            ba_def_rel.append(
-                f'BA_DEF_REL_ {definition.kind}  "{definition.name}" {definition.type_name}{get_minimum(definition)}{get_maximum(definition)};')
+            yield f'BA_DEF_REL_ {definition.kind}  "{definition.name}" {definition.type_name}{get_minimum(definition)}{get_maximum(definition)};'
         elif definition.type_name == 'STRING':
-            ba_def_rel.append(
-                f'BA_DEF_REL_ {definition.kind}  "{definition.name}" {definition.type_name} ;')
-
-    return ba_def_rel
-
+            yield f'BA_DEF_REL_ {definition.kind}  "{definition.name}" {definition.type_name} ;'
 
-def _dump_attribute_definition_defaults(database):
-    ba_def_def = []
-
-    if database.dbc is None:
-        definitions = OrderedDict()
-    else:
-        definitions = database.dbc.attribute_definitions
 
-    for definition in definitions.values():
+def _dump_attribute_definition_defaults(names):
+    for definition in names.definitions.values():
         if definition.default_value is not None:
             if definition.type_name in ["STRING", "ENUM"]:
                 fmt = 'BA_DEF_DEF_  "{name}" "{value}";'
             else:
                 fmt = 'BA_DEF_DEF_  "{name}" {value};'
 
-            ba_def_def.append(fmt.format(name=definition.name,
-                                         value=definition.default_value))
-
-    return ba_def_def
+            yield fmt.format(name=definition.name,
+                             value=definition.default_value)
 
 
 def _dump_attribute_definition_defaults_rel(database):
-    ba_def_def_rel = []
-
     if database.dbc is None:
         definitions = OrderedDict()
     else:
@@ -748,15 +777,11 @@ def _dump_attribute_definition_defaults_rel(database):
             else:
                 fmt = 'BA_DEF_DEF_REL_ "{name}" {value};'
 
-            ba_def_def_rel.append(fmt.format(name=definition.name,
-                                             value=definition.default_value))
-
-    return ba_def_def_rel
+            yield fmt.format(name=definition.name,
+                             value=definition.default_value)
 
 
-def _dump_attributes(database, sort_signals, sort_attributes):
-    attributes = []
-
+def _dump_attributes(database, names, sort_signals, sort_attributes):
     def get_value(attribute):
         result = attribute.value
 
@@ -765,121 +790,113 @@ def _dump_attributes(database, sort_signals, sort_attributes):
 
         return result
 
-    if database.dbc is not None:
-        if database.dbc.attributes is not None:
-            for attribute in database.dbc.attributes.values():
-                attributes.append(('dbc', attribute, None, None, None))
+    def iter_attributes():
+        if database.dbc is not None:
+            if database.dbc.attributes is not None:
+                for attribute in database.dbc.attributes.values():
+                    yield ('dbc', attribute, None, None, None)
 
-    for node in database.nodes:
-        if node.dbc is not None:
-            if node.dbc.attributes is not None:
-                for attribute in node.dbc.attributes.values():
-                    attributes.append(('node', attribute, node, None, None))
+        for node in database.nodes:
+            for attribute in names.attributes(node, 'SystemNodeLongSymbol').values():
+                yield ('node', attribute, node, None, None)
 
-    for message in database.messages:
-        # retrieve the ordered dictionary of message attributes
-        msg_attributes = OrderedDict()
-        if message.dbc is not None and message.dbc.attributes is not None:
-            msg_attributes.update(message.dbc.attributes)
-
-        # synchronize the attribute for the message cycle time with
-        # the cycle time specified by the message object
-        gen_msg_cycle_time_def: AttributeDefinition  # type: ignore[annotation-unchecked]
-        msg_cycle_time = message.cycle_time or 0
-        if gen_msg_cycle_time_def := database.dbc.attribute_definitions.get("GenMsgCycleTime"):
-            if msg_cycle_time != gen_msg_cycle_time_def.default_value:
-                msg_attributes['GenMsgCycleTime'] = Attribute(
-                    value=msg_cycle_time,
-                    definition=gen_msg_cycle_time_def,
-                )
+        for message in database.messages:
+            # retrieve the ordered dictionary of message attributes
+            msg_attributes = names.attributes(message, 'SystemMessageLongSymbol')
+
+            # synchronize the attribute for the message cycle time with
+            # the cycle time specified by the message object
+            gen_msg_cycle_time_def: AttributeDefinition  # type: ignore[annotation-unchecked]
+            msg_cycle_time = message.cycle_time or 0
+            if gen_msg_cycle_time_def := names.definitions.get("GenMsgCycleTime"):
+                if msg_cycle_time != gen_msg_cycle_time_def.default_value:
+                    msg_attributes['GenMsgCycleTime'] = Attribute(
+                        value=msg_cycle_time,
+                        definition=gen_msg_cycle_time_def,
+                    )
+                elif 'GenMsgCycleTime' in msg_attributes:
+                    del msg_attributes['GenMsgCycleTime']
             elif 'GenMsgCycleTime' in msg_attributes:
                 del msg_attributes['GenMsgCycleTime']
-        elif 'GenMsgCycleTime' in msg_attributes:
-            del msg_attributes['GenMsgCycleTime']
-
-        # if bus is CAN FD, set VFrameFormat
-        v_frame_format_def: AttributeDefinition  # type: ignore[annotation-unchecked]
-        if v_frame_format_def := database.dbc.attribute_definitions.get("VFrameFormat"):
-            if message.protocol == 'j1939':
-                v_frame_format_str = 'J1939PG'
-            elif message.is_fd and message.is_extended_frame:
-                v_frame_format_str = 'ExtendedCAN_FD'
-            elif message.is_fd:
-                v_frame_format_str = 'StandardCAN_FD'
-            elif message.is_extended_frame:
-                v_frame_format_str = 'ExtendedCAN'
+
+            # if bus is CAN FD, set VFrameFormat
+            v_frame_format_def: AttributeDefinition  # type: ignore[annotation-unchecked]
+            if v_frame_format_def := names.definitions.get("VFrameFormat"):
+                if message.protocol == 'j1939':
+                    v_frame_format_str = 'J1939PG'
+                elif message.is_fd and message.is_extended_frame:
+                    v_frame_format_str = 'ExtendedCAN_FD'
+                elif message.is_fd:
+                    v_frame_format_str = 'StandardCAN_FD'
+                elif message.is_extended_frame:
+                    v_frame_format_str = 'ExtendedCAN'
+                else:
+                    v_frame_format_str = 'StandardCAN'
+
+                # only set the VFrameFormat if it valid according to the attribute definition
+                if (
+                    v_frame_format_str in v_frame_format_def.choices
+                    and v_frame_format_str != v_frame_format_def.default_value
+                ):
+                    msg_attributes['VFrameFormat'] = Attribute(
+                        value=v_frame_format_def.choices.index(v_frame_format_str),
+                        definition=v_frame_format_def,
+                    )
+
+            # output all message attributes
+            for attribute in msg_attributes.values():
+                yield ('message', attribute, None, message, None)
+
+            # handle the signals contained in the message
+            if sort_signals:
+                signals = sort_signals(message.signals)
             else:
-                v_frame_format_str = 'StandardCAN'
-
-            # only set the VFrameFormat if it valid according to the attribute definition
-            if (
-                v_frame_format_str in v_frame_format_def.choices
-                and v_frame_format_str != v_frame_format_def.default_value
-            ):
-                msg_attributes['VFrameFormat'] = Attribute(
-                    value=v_frame_format_def.choices.index(v_frame_format_str),
-                    definition=v_frame_format_def,
-                )
-
-        # output all message attributes
-        for attribute in msg_attributes.values():
-            attributes.append(('message', attribute, None, message, None))
-
-        # handle the signals contained in the message
-        if sort_signals:
-            signals = sort_signals(message.signals)
-        else:
-            signals = message.signals
-        for signal in signals:
-            # retrieve the ordered dictionary of signal attributes
-            sig_attributes = OrderedDict()
-            if signal.dbc is not None and signal.dbc.attributes is not None:
-                sig_attributes = signal.dbc.attributes
-
-            # synchronize the attribute for the signal start value with
-            # the start value specified by the message object
-            if signal.raw_initial is None and 'GenSigStartValue' in sig_attributes:
-                del sig_attributes['GenSigStartValue']
-            elif signal.raw_initial is not None:
-                sig_attributes['GenSigStartValue'] = Attribute(
-                    value=signal.raw_initial,
-                    definition=ATTRIBUTE_DEFINITION_GENSIGSTARTVALUE)
-
-            # output all signal attributes
-            for attribute in sig_attributes.values():
-                attributes.append(('signal', attribute, None, message, signal))
+                signals = message.signals
+            for signal in signals:
+                # retrieve the ordered dictionary of signal attributes
+                sig_attributes = names.attributes(signal, 'SystemSignalLongSymbol')
+
+                # synchronize the attribute for the signal start value with
+                # the start value specified by the message object
+                if signal.raw_initial is None and 'GenSigStartValue' in sig_attributes:
+                    del sig_attributes['GenSigStartValue']
+                elif signal.raw_initial is not None:
+                    sig_attributes['GenSigStartValue'] = Attribute(
+                        value=signal.raw_initial,
+                        definition=ATTRIBUTE_DEFINITION_GENSIGSTARTVALUE)
+
+                # output all signal attributes
+                for attribute in sig_attributes.values():
+                    yield ('signal', attribute, None, message, signal)
+
+    attributes = iter_attributes()
 
     if sort_attributes:
-        attributes = sort_attributes(attributes)
+        attributes = sort_attributes(list(attributes))
 
-    ba = []
     for typ, attribute, node, message, signal in attributes:
         if typ == 'dbc':
-            ba.append(f'BA_ "{attribute.definition.name}" '
-                      f'{get_value(attribute)};')
+            yield (f'BA_ "{attribute.definition.name}" '
+                   f'{get_value(attribute)};')
         elif typ == 'node':
-            ba.append(f'BA_ "{attribute.definition.name}" '
-                      f'{attribute.definition.kind} '
-                      f'{node.name} '
-                      f'{get_value(attribute)};')
+            yield (f'BA_ "{attribute.definition.name}" '
+                   f'{attribute.definition.kind} '
+                   f'{names.name(node)} '
+                   f'{get_value(attribute)};')
         elif typ == 'message':
-            ba.append(f'BA_ "{attribute.definition.name}" '
-                      f'{attribute.definition.kind} '
-                      f'{get_dbc_frame_id(message)} '
-                      f'{get_value(attribute)};')
+            yield (f'BA_ "{attribute.definition.name}" '
+                   f'{attribute.definition.kind} '
+                   f'{get_dbc_frame_id(message)} '
+                   f'{get_value(attribute)};')
         elif typ == 'signal':
-            ba.append(f'BA_ "{attribute.definition.name}" '
-                      f'{attribute.definition.kind} '
-                      f'{get_dbc_frame_id(message)} '
-                      f'{signal.name} '
-                      f'{get_value(attribute)};')
-
-    return ba
+            yield (f'BA_ "{attribute.definition.name}" '
+                   f'{attribute.definition.kind} '
+                   f'{get_dbc_frame_id(message)} '
+                   f'{names.name(signal)} '
+                   f'{get_value(attribute)};')
 
 
-def _dump_attributes_rel(database, sort_signals):
-    ba_rel = []
-
+def _dump_attributes_rel(database):
     def get_value(attribute):
         result = attribute.value
 
@@ -895,28 +912,24 @@ def _dump_attributes_rel(database, sort_signals):
                 for signal_name, signal_lst in element['signal'].items():
                     for node_name, node_dict in signal_lst['node'].items():
                         for attribute in node_dict.values():
-                            ba_rel.append(f'BA_REL_ "{attribute.definition.name}" '
-                                          f'BU_SG_REL_ '
-                                          f'{node_name} '
-                                          f'SG_ '
-                                          f'{frame_id} '
-                                          f'{signal_name} '
-                                          f'{get_value(attribute)};')
+                            yield (f'BA_REL_ "{attribute.definition.name}" '
+                                   f'BU_SG_REL_ '
+                                   f'{node_name} '
+                                   f'SG_ '
+                                   f'{frame_id} '
+                                   f'{signal_name} '
+                                   f'{get_value(attribute)};')
             elif "node" in element:
                 for node_name, node_dict in element['node'].items():
                     for attribute in node_dict.values():
-                        ba_rel.append(f'BA_REL_ "{attribute.definition.name}" '
-                                      f'BU_BO_REL_ '
-                                      f'{node_name} '
-                                      f'{frame_id} '
-                                      f'{get_value(attribute)};')
-
-    return ba_rel
+                        yield (f'BA_REL_ "{attribute.definition.name}" '
+                               f'BU_BO_REL_ '
+                               f'{node_name} '
+                               f'{frame_id} '
+                               f'{get_value(attribute)};')
 
 
-def _dump_choices(database, sort_signals, sort_choices):
-    val = []
-
+def _dump_choices(database, names, sort_signals, sort_choices):
     for message in database.messages:
         if sort_signals:
             signals = sort_signals(message.signals)
@@ -931,34 +944,30 @@ def _dump_choices(database, sort_signals, sort_choices):
             else:
                 choices = signal.choices
 
-            val.append(
-                'VAL_ {frame_id} {name} {choices} ;'.format(
-                    frame_id=get_dbc_frame_id(message),
-                    name=signal.name,
-                    choices=' '.join([f'{value} "{text}"' for value, text in choices.items()])))
-
-    return val
+            yield 'VAL_ {frame_id} {name} {choices} ;'.format(
+                frame_id=get_dbc_frame_id(message),
+                name=names.name(signal),
+                choices=' '.join([f'{value} "{text}"' for value, text in choices.items()]))
 
 
-def _dump_signal_groups(database):
-    sig_group = []
-
+def _dump_signal_groups(database, names):
     for message in database.messages:
         if message.signal_groups is None:
             continue
 
-        for signal_group in message.signal_groups:
-            all_sig_names = [sig.name for sig in message.signals]
-            signal_group.signal_names = list(filter(lambda sig_name: sig_name in all_sig_names, signal_group.signal_names))
-            sig_group.append(
-                'SIG_GROUP_ {frame_id} {signal_group_name} {repetitions} : {signal_names};'.format(
-                    frame_id=get_dbc_frame_id(message),
-                    signal_group_name=signal_group.name,
-                    repetitions=signal_group.repetitions,
-                    signal_names=' '.join(signal_group.signal_names)
-                ))
+        all_sig_names = {names.name(sig) for sig in message.signals}
 
-    return sig_group
+        for signal_group in message.signal_groups:
+            signal_names = [
+                signal_name
+                for signal_name in signal_group.signal_names
+                if signal_name in all_sig_names
+            ]
+            yield 'SIG_GROUP_ {frame_id} {signal_group_name} {repetitions} : {signal_names};'.format(
+                frame_id=get_dbc_frame_id(message),
+                signal_group_name=signal_group.name,
+                repetitions=signal_group.repetitions,
+                signal_names=' '.join(signal_names))
 
 
 def _is_extended_mux_needed(messages):
@@ -1010,16 +1019,14 @@ def _create_mux_ranges(multiplexer_ids):
     return ranges
 
 
-def _dump_signal_mux_values(database):
+def _dump_signal_mux_values(database, names):
     """Create multiplex entries ("SG_MUL_VAL_") if extended multiplexing
     is used.
 
     """
 
     if not _is_extended_mux_needed(database.messages):
-        return []
-
-    sig_mux_values = []
+        return
 
     for message in database.messages:
         for signal in message.signals:
@@ -1031,10 +1038,7 @@ def _dump_signal_mux_values(database):
                 for minimum, maximum in _create_mux_ranges(signal.multiplexer_ids)
             ])
 
-            sig_mux_values.append(
-                f'SG_MUL_VAL_ {get_dbc_frame_id(message)} {signal.name} {signal.multiplexer_signal} {ranges};')
-
-    return sig_mux_values
+            yield f'SG_MUL_VAL_ {get_dbc_frame_id(message)} {names.name(signal)} {signal.multiplexer_signal} {ranges};'
 
 
 def _load_comments(tokens):
@@ -1790,120 +1794,89 @@ def _load_nodes(tokens, comments, attributes, definitions):
     return nodes
 
 
-def get_attribute_definition(database, name, default):
-    if database.dbc is None:
-        database.dbc = DbcSpecifics()
-
-    if name not in database.dbc.attribute_definitions:
-        database.dbc.attribute_definitions[name] = default
-
-    return database.dbc.attribute_definitions[name]
-
-
-def get_long_node_name_attribute_definition(database):
-    return get_attribute_definition(database,
-                                    'SystemNodeLongSymbol',
-                                    ATTRIBUTE_DEFINITION_LONG_NODE_NAME)
-
-
-def get_long_message_name_attribute_definition(database):
-    return get_attribute_definition(database,
-                                    'SystemMessageLongSymbol',
-                                    ATTRIBUTE_DEFINITION_LONG_MESSAGE_NAME)
-
-
-def get_long_signal_name_attribute_definition(database):
-    return get_attribute_definition(database,
-                                    'SystemSignalLongSymbol',
-                                    ATTRIBUTE_DEFINITION_LONG_SIGNAL_NAME)
-
-
-def try_remove_attribute(dbc, name):
-    try:
-        dbc.attributes.pop(name)
-    except (KeyError, AttributeError):
-        pass
-
-
-def make_node_names_unique(database, shorten_long_names):
-    converter = LongNamesConverter()
-
-    for node in database.nodes:
-        name = converter.convert(node.name)
-        try_remove_attribute(node.dbc, 'SystemNodeLongSymbol')
-
-        if name is None or not shorten_long_names:
-            continue
-
-        for message in database.messages:
-            for index, sender in enumerate(message.senders):
-                if sender == node.name:
-                    message.senders[index] = name
-
-            for signal in message.signals:
-                for index, receiver in enumerate(signal.receivers):
-                    if receiver == node.name:
-                        signal.receivers[index] = name
-
-        if node.dbc is None:
-            node.dbc = DbcSpecifics()
-
-        node.dbc.attributes['SystemNodeLongSymbol'] = Attribute(
-            node.name,
-            get_long_node_name_attribute_definition(database))
-        node.name = name
-
+def _write_joined(fp: typing.TextIO,
+                  items: typing.Iterable[str],
+                  separator: str) -> None:
+    for index, item in enumerate(items):
+        if index > 0:
+            fp.write(separator)
 
-def make_message_names_unique(database, shorten_long_names):
-    converter = LongNamesConverter()
+        fp.write(item)
 
-    for message in database.messages:
-        name = converter.convert(message.name)
-        try_remove_attribute(message.dbc, 'SystemMessageLongSymbol')
-
-        if name is None or not shorten_long_names:
-            continue
-
-        if message.dbc is None:
-            message.dbc = DbcSpecifics()
-
-        message.dbc.attributes['SystemMessageLongSymbol'] = Attribute(
-            message.name,
-            get_long_message_name_attribute_definition(database))
-        message.name = name
 
+def _write_terminated(fp: typing.TextIO,
+                      items: typing.Iterable[str],
+                      terminator: str) -> None:
+    for item in items:
+        fp.write(item)
+        fp.write(terminator)
 
-def make_signal_names_unique(database, shorten_long_names):
-    converter = LongNamesConverter()
 
-    for message in database.messages:
-        for signal in message.signals:
-            name = converter.convert(signal.name)
-            try_remove_attribute(signal.dbc, 'SystemSignalLongSymbol')
-
-            if name is None or not shorten_long_names:
-                continue
-
-            if signal.dbc is None:
-                signal.dbc = DbcSpecifics()
-
-            signal.dbc.attributes['SystemSignalLongSymbol'] = Attribute(
-                signal.name,
-                get_long_signal_name_attribute_definition(database))
-            signal.name = name
-
-
-def make_names_unique(database, shorten_long_names):
-    """Make message, signal and node names unique and add attributes for
-    their long names.
+def dump(database: InternalDatabase,
+         fp: typing.TextIO,
+         sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT,
+         sort_attribute_signals:type_sort_signals=SORT_SIGNALS_DEFAULT,
+         sort_attributes:type_sort_attributes=None,
+         sort_choices:type_sort_choices=None,
+         shorten_long_names:bool=True) -> None:
+    """Write database in DBC file format to given file-like object.
+       The file is written section by section and the database is not
+       modified, long names are shortened in the output only.
+       sort_signals defines how to sort signals in message definitions
+       sort_attribute_signals defines how to sort signals in metadata -
+          comments, value table definitions and attributes
 
     """
 
-    make_node_names_unique(database, shorten_long_names)
-    make_message_names_unique(database, shorten_long_names)
-    make_signal_names_unique(database, shorten_long_names)
+    if sort_signals == SORT_SIGNALS_DEFAULT:
+        sort_signals = sort_signals_by_start_bit_reversed
+    if sort_attribute_signals == SORT_SIGNALS_DEFAULT:
+        sort_attribute_signals = sort_signals_by_start_bit_reversed
 
-    return database
+    names = _DumpNames(database, shorten_long_names)
+
+    fp.write(DBC_HEADER_FMT.format(version=_dump_version(database)))
+    _write_joined(fp, _dump_nodes(database, names), ' ')
+    fp.write('\r\n')
+    _write_terminated(fp, _dump_value_tables(database), '\r\n')
+    fp.write('\r\n\r\n')
+    _write_joined(fp, _dump_messages(database, names, sort_signals), '\r\n\r\n')
+    fp.write('\r\n\r\n')
+    _write_joined(fp, _dump_senders(database, names), '\r\n')
+    fp.write('\r\n\r\n\r\n')
+    _write_joined(fp,
+                  _dump_comments(database, names, sort_attribute_signals),
+                  '\r\n')
+    fp.write('\r\n')
+    _write_joined(fp, _dump_attribute_definitions(names), '\r\n')
+    fp.write('\r\n')
+    _write_terminated(fp, _dump_attribute_definitions_rel(database), '\r\n')
+    _write_joined(fp, _dump_attribute_definition_defaults(names), '\r\n')
+    fp.write('\r\n')
+    _write_terminated(fp,
+                      _dump_attribute_definition_defaults_rel(database),
+                      '\r\n')
+    _write_joined(fp,
+                  _dump_attributes(database,
+                                   names,
+                                   sort_attribute_signals,
+                                   sort_attributes),
+                  '\r\n')
+    fp.write('\r\n')
+    _write_terminated(fp, _dump_attributes_rel(database), '\r\n')
+    _write_joined(fp,
+                  _dump_choices(database,
+                                names,
+                                sort_attribute_signals,
+                                sort_choices),
+                  '\r\n')
+    fp.write('\r\n')
+    _write_joined(fp, _dump_signal_types(database, names), '\r\n')
+    fp.write('\r\n')
+    _write_joined(fp, _dump_signal_groups(database, names), '\r\n')
+    fp.write('\r\n')
+    _write_joined(fp, _dump_signal_mux_values(database, names), '\r\n')
+    fp.write('\r\n')
 
 
 def dump_string(database: InternalDatabase,
@@ -1919,51 +1892,16 @@ def dump_string(database: InternalDatabase,
 
     """
 
-    if sort_signals == SORT_SIGNALS_DEFAULT:
-        sort_signals = sort_signals_by_start_bit_reversed
-    if sort_attribute_signals == SORT_SIGNALS_DEFAULT:
-        sort_attribute_signals = sort_signals_by_start_bit_reversed
-
-    # Make a deep copy of the database as names and attributes will be
-    # modified for items with long names.
-    database = deepcopy(database)
+    fp = io.StringIO()
+    dump(database,
+         fp,
+         sort_signals=sort_signals,
+         sort_attribute_signals=sort_attribute_signals,
+         sort_attributes=sort_attributes,
+         sort_choices=sort_choices,
+         shorten_long_names=shorten_long_names)
 
-    if database.dbc is None:
-        database.dbc = DbcSpecifics()
-
-    database = make_names_unique(database, shorten_long_names)
-    bu = _dump_nodes(database)
-    val_table = _dump_value_tables(database)
-    bo = _dump_messages(database, sort_signals)
-    bo_tx_bu = _dump_senders(database)
-    cm = _dump_comments(database, sort_attribute_signals)
-    signal_types = _dump_signal_types(database)
-    ba_def = _dump_attribute_definitions(database)
-    ba_def_rel = _dump_attribute_definitions_rel(database)
-    ba_def_def = _dump_attribute_definition_defaults(database)
-    ba_def_def_rel = _dump_attribute_definition_defaults_rel(database)
-    ba = _dump_attributes(database, sort_attribute_signals, sort_attributes)
-    ba_rel = _dump_attributes_rel(database, sort_attribute_signals)
-    val = _dump_choices(database, sort_attribute_signals, sort_choices)
-    sig_group = _dump_signal_groups(database)
-    sig_mux_values = _dump_signal_mux_values(database)
-
-    return DBC_FMT.format(version=_dump_version(database),
-                          bu=' '.join(bu),
-                          val_table='\r\n'.join(val_table),
-                          bo='\r\n\r\n'.join(bo),
-                          bo_tx_bu='\r\n'.join(bo_tx_bu),
-                          cm='\r\n'.join(cm),
-                          signal_types='\r\n'.join(signal_types),
-                          ba_def='\r\n'.join(ba_def),
-                          ba_def_rel="".join([elem+"\r\n" for elem in ba_def_rel]),
-                          ba_def_def='\r\n'.join(ba_def_def),
-                          ba_def_def_rel="".join([elem+"\r\n" for elem in ba_def_def_rel]),
-                          ba='\r\n'.join(ba),
-                          ba_rel="".join([elem+"\r\n" for elem in ba_rel]),
-                          val='\r\n'.join(val),
-                          sig_group='\r\n'.join(sig_group),
-                          sig_mux_values='\r\n'.join(sig_mux_values))
+    return fp.getvalue()
 
 
 def get_definitions_dict(definitions, defaults):
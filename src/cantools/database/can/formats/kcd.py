@@ -1,7 +1,9 @@
 # Load and dump a CAN database in KCD format.
 
+import io
 import logging
 from collections import defaultdict
+from typing import TextIO
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element, SubElement
 
@@ -368,13 +370,12 @@ def _dump_mux_groups(multiplexer_name, signals, node_refs, parent):
                         parent)
 
 
-def _dump_message(message, bus, node_refs, sort_signals):
+def _dump_message(message, node_refs, sort_signals):
     frame_id = f'0x{message.frame_id:03X}'
-    message_element = SubElement(bus,
-                                 'Message',
-                                 id=frame_id,
-                                 name=message.name,
-                                 length=str(message.length))
+    message_element = Element('Message',
+                              id=frame_id,
+                              name=message.name,
+                              length=str(message.length))
 
     if message.cycle_time is not None:
         message_element.set('interval', str(message.cycle_time))
@@ -416,6 +417,8 @@ def _dump_message(message, bus, node_refs, sort_signals):
                          node_refs,
                          SubElement(message_element, 'Signal'))
 
+    return message_element
+
 
 def _dump_version(version, parent):
     if version is not None:
@@ -428,15 +431,12 @@ def _dump_nodes(nodes, node_refs, parent):
         node_refs[node.name] = node_id
 
 
-def _dump_messages(messages, node_refs, parent, sort_signals):
-    bus = SubElement(parent, 'Bus', name='Bus')
-
-    for message in messages:
-        _dump_message(message, bus, node_refs, sort_signals)
-
-
-def dump_string(database: InternalDatabase, *, sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> str:
-    """Format given database in KCD file format.
+def dump(database: InternalDatabase,
+         fp: TextIO,
+         *,
+         sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> None:
+    """Write given database in KCD file format to given file-like
+    object. Messages are converted to XML and written one at a time.
 
     """
     if sort_signals == SORT_SIGNALS_DEFAULT:
@@ -456,11 +456,44 @@ def dump_string(database: InternalDatabase, *, sort_signals:type_sort_signals=SO
 
     _dump_version(database.version, network_definition)
     _dump_nodes(database.nodes, node_refs, network_definition)
-    _dump_messages(database.messages, node_refs, network_definition, sort_signals)
+    bus = SubElement(network_definition, 'Bus', name='Bus')
+
+    if not database.messages:
+        _indent_xml(network_definition, '  ')
+        fp.write(ElementTree.tostring(network_definition, encoding='unicode'))
+
+        return
 
+    # the messages are written in place of a placeholder element
+    SubElement(bus, 'Message')
     _indent_xml(network_definition, '  ')
+    head, tail = ElementTree.tostring(network_definition,
+                                      encoding='unicode').split('<Message />')
+    separator = bus.text or ''
+    fp.write(head)
+
+    for index, message in enumerate(database.messages):
+        message_element = _dump_message(message, node_refs, sort_signals)
+        _indent_xml(message_element, '  ', 2)
+        message_element.tail = None
+
+        if index > 0:
+            fp.write(separator)
+
+        fp.write(ElementTree.tostring(message_element, encoding='unicode'))
+
+    fp.write(tail)
+
+
+def dump_string(database: InternalDatabase, *, sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> str:
+    """Format given database in KCD file format.
+
+    """
+
+    fp = io.StringIO()
+    dump(database, fp, sort_signals=sort_signals)
 
-    return ElementTree.tostring(network_definition, encoding='unicode')
+    return fp.getvalue()
 
 
 def load_string(string:str, strict:bool=True, sort_signals:type_sort_signals=sort_signals_by_start_bit) -> InternalDatabase:
@@ -1,11 +1,13 @@
 # Load and dump a CAN database in SYM format.
 
 import collections
+import io
 import logging
 import re
 from collections import OrderedDict as odict
+from collections.abc import Iterable, Iterator
 from itertools import groupby
-from typing import TYPE_CHECKING, Callable
+from typing import Callable, TextIO
 from typing import Optional as TypingOptional
 
 import textparser
@@ -35,9 +37,6 @@ from ..message import Message
 from ..signal import Signal
 from .utils import num
 
-if TYPE_CHECKING:
-    from collections.abc import Iterator
-
 LOGGER = logging.getLogger(__name__)
 
 # PCAN Symbol Editor will fail to open a SYM File with signals of a longer length
@@ -795,8 +794,7 @@ def _dump_choice(signal: Signal) -> str:
     enum_str += ')'
     return enum_str
 
-def _dump_choices(database: InternalDatabase) -> str:
-    choices = []
+def _dump_choices(database: InternalDatabase) -> Iterator[str]:
     # SYM requires unique signals
     generated_signals = set()
     for message in database.messages:
@@ -805,12 +803,7 @@ def _dump_choices(database: InternalDatabase) -> str:
                 generated_signals.add(signal.name)
                 new_choice = _dump_choice(signal)
                 if new_choice:
-                    choices.append(new_choice)
-
-    if choices:
-        return '{ENUMS}\n' + '\n'.join(choices)
-    else:
-        return ''
+                    yield new_choice
 
 def _get_signal_type(signal: Signal) -> str:
     if signal.is_float:
@@ -852,8 +845,7 @@ def _dump_signal(signal: Signal) -> str:
 
     return signal_str
 
-def _dump_signals(database: InternalDatabase, sort_signals: TypingOptional[Callable[[list[Signal]], list[Signal]]]) -> str:
-    signal_dumps = []
+def _dump_signals(database: InternalDatabase, sort_signals: TypingOptional[Callable[[list[Signal]], list[Signal]]]) -> Iterator[str]:
     # SYM requires unique signals
     generated_signals = set()
     for message in database.messages:
@@ -864,12 +856,7 @@ def _dump_signals(database: InternalDatabase, sort_signals: TypingOptional[Calla
         for signal in signals:
             if signal.name not in generated_signals:
                 generated_signals.add(signal.name)
-                signal_dumps.append(_dump_signal(signal))
-
-    if signals:
-        return '{SIGNALS}\n' + '\n'.join(signal_dumps)
-    else:
-        return ''
+                yield _dump_signal(signal)
 
 def _dump_message(message: Message, signals: list[Signal], min_frame_id: TypingOptional[int], max_frame_id: TypingOptional[int] = None,
                   multiplexer_id: TypingOptional[int] = None, multiplexer_signal: TypingOptional[Signal] = None) -> str:
@@ -916,14 +903,37 @@ def _dump_message(message: Message, signals: list[Signal], min_frame_id: TypingO
         message_str += f'Sig="{_get_signal_name(signal)}" {_convert_start(signal.start, signal.byte_order)}\n'
     return message_str
 
-def _dump_messages(database: InternalDatabase) -> str:
+def _dump_message_group(message: Message, min_frame_id: int, max_frame_id: TypingOptional[int]) -> Iterator[str]:
+    if message.is_multiplexed():
+        non_multiplexed_signals = []
+        # Store all non-multiplexed signals first
+        for signal_tree_signal in message.signal_tree:
+            if not isinstance(signal_tree_signal, collections.abc.Mapping):
+                non_multiplexed_signals.append(signal_tree_signal)
+
+        for signal_tree_signal in message.signal_tree:
+            if isinstance(signal_tree_signal, collections.abc.Mapping):
+                signal_name, multiplexed_signals = next(iter(signal_tree_signal.items()))
+                is_first_message = True
+                for multiplexer_id, signals_for_multiplexer in multiplexed_signals.items():
+                    yield _dump_message(message, [message.get_signal_by_name(s) for s in signals_for_multiplexer] + non_multiplexed_signals,
+                                        min_frame_id if is_first_message else None, max_frame_id, multiplexer_id, message.get_signal_by_name(signal_name))
+                    is_first_message = False
+    else:
+        yield _dump_message(message, message.signals, min_frame_id, max_frame_id)
+
+def _group_messages(database: InternalDatabase) -> tuple[list[tuple[Message, int, TypingOptional[int]]], ...]:
+    """Returns the send, receive and send/receive messages with their
+    frame id ranges.
+
+    """
+
     send_messages = []
     receive_messages = []
     send_receive_messages = []
     message_name: str
     messages_with_name: Iterator[Message]
     for message_name, messages_with_name in groupby(sorted(database.messages, key=lambda m: m.name), key=lambda m: m.name):
-        message_dumps = []
         # Cantools represents SYM CAN ID range with multiple messages - need to dedup multiple cantools messages
         # into a single message with a CAN ID range
         messages_with_name_list = list(messages_with_name)
@@ -940,55 +950,69 @@ def _dump_messages(database: InternalDatabase) -> str:
             if frame_id_range != num_messages_with_name:
                 raise ValueError(f'Expected {frame_id_range} messages with name {message_name} - given {num_messages_with_name}')
 
-        if message.is_multiplexed():
-            non_multiplexed_signals = []
-            # Store all non-multiplexed signals first
-            for signal_tree_signal in message.signal_tree:
-                if not isinstance(signal_tree_signal, collections.abc.Mapping):
-                    non_multiplexed_signals.append(signal_tree_signal)
-
-            for signal_tree_signal in message.signal_tree:
-                if isinstance(signal_tree_signal, collections.abc.Mapping):
-                    signal_name, multiplexed_signals = next(iter(signal_tree_signal.items()))
-                    is_first_message = True
-                    for multiplexer_id, signals_for_multiplexer in multiplexed_signals.items():
-                        message_dumps.append(_dump_message(message, [message.get_signal_by_name(s) for s in signals_for_multiplexer] + non_multiplexed_signals,
-                                                           min_frame_id if is_first_message else None, max_frame_id, multiplexer_id, message.get_signal_by_name(signal_name)))
-                        is_first_message = False
-        else:
-            message_dumps.append(_dump_message(message, message.signals, min_frame_id, max_frame_id))
-
         if message.senders == [SEND_MESSAGE_SENDER]:
-            send_messages.extend(message_dumps)
+            send_messages.append((message, min_frame_id, max_frame_id))
         elif message.senders == [RECEIVE_MESSAGE_SENDER]:
-            receive_messages.extend(message_dumps)
+            receive_messages.append((message, min_frame_id, max_frame_id))
         else:
-            send_receive_messages.extend(message_dumps)
+            send_receive_messages.append((message, min_frame_id, max_frame_id))
 
-    messages_dump = ''
-    if send_messages:
-        messages_dump += '{SEND}\n' + '\n'.join(send_messages) + '\n'
-    if receive_messages:
-        messages_dump += '{RECEIVE}\n' + '\n'.join(receive_messages) + '\n'
-    if send_receive_messages:
-        messages_dump += '{SENDRECEIVE}\n' + '\n'.join(send_receive_messages) + '\n'
-    return messages_dump
+    return send_messages, receive_messages, send_receive_messages
 
-def dump_string(database: InternalDatabase, *, sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> str:
-    """Format given database in SYM file format.
+def _write_section(fp: TextIO, header: str, items: Iterable[str], terminator: str = '') -> None:
+    """Write given items separated by newlines after given header. Nothing
+    is written if there are no items.
+
+    """
+
+    separator = header
+
+    for item in items:
+        fp.write(separator)
+        fp.write(item)
+        separator = '\n'
+
+    if separator != header:
+        fp.write(terminator)
+
+def dump(database: InternalDatabase, fp: TextIO, *, sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> None:
+    """Write given database in SYM file format to given file-like object.
 
     """
     if sort_signals == SORT_SIGNALS_DEFAULT:
         sort_signals = sort_signals_by_start_bit
 
-    sym_str = 'FormatVersion=6.0 // Do not edit this line!\n'
-    sym_str += 'Title="SYM Database"\n\n'
+    send_messages, receive_messages, send_receive_messages = _group_messages(database)
+
+    fp.write('FormatVersion=6.0 // Do not edit this line!\n')
+    fp.write('Title="SYM Database"\n\n')
+
+    _write_section(fp, '{ENUMS}\n', _dump_choices(database))
+    fp.write('\n\n')
+    _write_section(fp, '{SIGNALS}\n', _dump_signals(database, sort_signals))
+    fp.write('\n\n')
+
+    for header, messages in [('{SEND}\n', send_messages),
+                             ('{RECEIVE}\n', receive_messages),
+                             ('{SENDRECEIVE}\n', send_receive_messages)]:
+        _write_section(fp,
+                       header,
+                       (message_dump
+                        for message, min_frame_id, max_frame_id in messages
+                        for message_dump in _dump_message_group(message,
+                                                                min_frame_id,
+                                                                max_frame_id)),
+                       '\n')
+
+def dump_string(database: InternalDatabase, *, sort_signals:type_sort_signals=SORT_SIGNALS_DEFAULT) -> str:
+    """Format given database in SYM file format.
+
+    """
 
-    sym_str += _dump_choices(database) + '\n\n'
-    sym_str += _dump_signals(database, sort_signals) + '\n\n'
-    sym_str += _dump_messages(database)
+    fp = io.StringIO()
+    dump(database, fp, sort_signals=sort_signals)
 
-    return sym_str
+    return fp.getvalue()
 
 def load_string(string:str, strict:bool=True, sort_signals:type_sort_signals=sort_signals_by_start_bit) -> InternalDatabase:
     """Parse given string.
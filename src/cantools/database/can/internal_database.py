@@ -1,13 +1,15 @@
 # Internal CAN database.
 
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from .bus import Bus
-from .formats.arxml.database_specifics import AutosarDatabaseSpecifics
-from .formats.dbc_specifics import DbcSpecifics
 from .message import Message
 from .node import Node
 
+if TYPE_CHECKING:
+    from .formats.arxml.database_specifics import AutosarDatabaseSpecifics
+    from .formats.dbc_specifics import DbcSpecifics
+
 
 class InternalDatabase:
     """Internal CAN database.
@@ -19,8 +21,8 @@ class InternalDatabase:
                  nodes: list[Node],
                  buses: list[Bus],
                  version : Optional[str],
-                 dbc_specifics: Optional[DbcSpecifics] = None,
-                 autosar_specifics: Optional[AutosarDatabaseSpecifics] = None):
+                 dbc_specifics: Optional['DbcSpecifics'] = None,
+                 autosar_specifics: Optional['AutosarDatabaseSpecifics'] = None):
         self.messages = messages
         self.nodes = nodes
         self.buses = buses
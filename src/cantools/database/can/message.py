@@ -1,9 +1,11 @@
 # A CAN message.
 
 import logging
-from copy import deepcopy
+import sys
+from operator import attrgetter
 from typing import (
     TYPE_CHECKING,
+    Any,
     Optional,
     Union,
     cast,
@@ -44,6 +46,42 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# Maps each byte value to the value with reversed bit order.
+_REVERSED_BITS = bytes(int(f'{i:08b}'[::-1], 2) for i in range(256))
+
+
+class _MessageBits:
+    """The bits of a message occupied by signals.
+
+    Bit ``n`` of `mask` is bit ``n`` of the message in network order,
+    i.e., bit 0 is the most significant bit of the first byte. `owners`
+    is a list of ``(signal name, signal mask)`` tuples in the order the
+    signals were added.
+
+    """
+
+    def __init__(self,
+                 mask: int = 0,
+                 owners: Optional[list[tuple[str, int]]] = None) -> None:
+        self.mask = mask
+        self.owners = owners if owners is not None else []
+
+    def copy(self) -> '_MessageBits':
+        return _MessageBits(self.mask, list(self.owners))
+
+    def owner(self, bit: int) -> str:
+        """Returns the name of the signal which was last added at given bit.
+
+        """
+
+        bit_mask = (1 << bit)
+
+        for name, mask in reversed(self.owners):
+            if mask & bit_mask:
+                return name
+
+        raise KeyError(bit)
+
 
 class Message:
     """A CAN message with frame id, comment, signals and other
@@ -58,6 +96,35 @@ class Message:
     `sort_signals = lambda signals: list(sorted(signals, key=lambda sig: sig.name))`
     """
 
+    __slots__ = (
+        '_autosar',
+        '_bus_name',
+        '_codecs',
+        '_comments',
+        '_contained_messages',
+        '_cycle_time',
+        '_dbc',
+        '_dirty',
+        '_frame_id',
+        '_header_byte_order',
+        '_header_id',
+        '_is_extended_frame',
+        '_is_fd',
+        '_length',
+        '_name',
+        '_protocol',
+        '_refreshed_signals',
+        '_refreshed_strict',
+        '_send_type',
+        '_senders',
+        '_signal_dict',
+        '_signal_groups',
+        '_signal_tree',
+        '_signals',
+        '_strict',
+        '_unused_bit_pattern',
+    )
+
     def __init__(self,
                  frame_id: int,
                  name: str,
@@ -101,7 +168,7 @@ class Message:
         self._header_byte_order = header_byte_order
         self._is_extended_frame = is_extended_frame
         self._is_fd = is_fd
-        self._name = name
+        self._name = sys.intern(name)
         self._length = length
         self._unused_bit_pattern = unused_bit_pattern
         if sort_signals == SORT_SIGNALS_DEFAULT:
@@ -134,22 +201,28 @@ class Message:
         self._bus_name = bus_name
         self._signal_groups = signal_groups
         self._codecs: Optional[Codec] = None
-        self._signal_tree: Optional[list[Union[str, list[str]]]] = None
+        self._signal_tree: Optional[list[Union[str, dict]]] = None
         self._strict = strict
         self._protocol = protocol
+
+        # State of the last refresh. Used to skip refreshing messages
+        # which did not change since.
+        self._dirty = True
+        self._refreshed_strict: Optional[bool] = None
+        self._refreshed_signals: list[tuple[Signal, int]] = []
         self.refresh()
 
-    def _create_codec(self,
-                      parent_signal: Optional[str] = None,
-                      multiplexer_id: Optional[int] = None,
-                      ) -> Codec:
-        """Create a codec of all signals with given parent signal. This is a
-        recursive function.
+    def _codec_signals(self,
+                       parent_signal: Optional[str],
+                       multiplexer_id: Optional[int],
+                       ) -> list[tuple[Signal, set[int]]]:
+        """Returns all signals with given parent signal and multiplexer id
+        together with the multiplexer ids of their children, which is
+        empty for signals that are not multiplexers.
 
         """
 
         signals = []
-        multiplexers: dict[str, dict[int, Codec]] = {}
 
         # Find all signals matching given parent signal name and given
         # multiplexer id. Root signals' parent and multiplexer id are
@@ -164,9 +237,9 @@ class Message:
             ):
                 continue
 
-            if signal.is_multiplexer:
-                children_ids: set[int] = set()
+            children_ids: set[int] = set()
 
+            if signal.is_multiplexer:
                 for s in self._signals:
                     if s.multiplexer_signal != signal.name:
                         continue
@@ -183,13 +256,29 @@ class Message:
                 if signal.conversion.choices:
                     children_ids.update(signal.conversion.choices.keys())
 
-                for child_id in children_ids:
-                    codec = self._create_codec(signal.name, child_id)
+            signals.append((signal, children_ids))
+
+        return signals
+
+    def _create_codec(self,
+                      parent_signal: Optional[str] = None,
+                      multiplexer_id: Optional[int] = None,
+                      ) -> Codec:
+        """Create a codec of all signals with given parent signal. This is a
+        recursive function.
+
+        """
 
-                    if signal.name not in multiplexers:
-                        multiplexers[signal.name] = {}
+        signals = []
+        multiplexers: dict[str, dict[int, Codec]] = {}
 
-                    multiplexers[signal.name][child_id] = codec
+        for signal, children_ids in self._codec_signals(parent_signal,
+                                                        multiplexer_id):
+            if children_ids:
+                multiplexers[signal.name] = {
+                    child_id: self._create_codec(signal.name, child_id)
+                    for child_id in children_ids
+                }
 
             signals.append(signal)
 
@@ -200,31 +289,67 @@ class Message:
             'multiplexers': multiplexers
         }
 
-    def _create_signal_tree(self, codec):
-        """Create a multiplexing tree node of given codec. This is a recursive
-        function.
+    def _create_signal_tree(self,
+                            parent_signal: Optional[str] = None,
+                            multiplexer_id: Optional[int] = None,
+                            ) -> list[Union[str, dict]]:
+        """Create a multiplexing tree node of all signals with given parent
+        signal. This is a recursive function.
 
         """
 
-        nodes = []
-
-        for signal in codec['signals']:
-            multiplexers = codec['multiplexers']
+        nodes: list[Union[str, dict]] = []
 
-            if signal.name in multiplexers:
-                node = {
+        for signal, children_ids in self._codec_signals(parent_signal,
+                                                        multiplexer_id):
+            if children_ids:
+                nodes.append({
                     signal.name: {
-                        mux: self._create_signal_tree(mux_codec)
-                        for mux, mux_codec in multiplexers[signal.name].items()
+                        child_id: self._create_signal_tree(signal.name,
+                                                           child_id)
+                        for child_id in children_ids
                     }
-                }
+                })
             else:
-                node = signal.name
-
-            nodes.append(node)
+                nodes.append(signal.name)
 
         return nodes
 
+    def _compile(self) -> Codec:
+        """Create the codecs of the message. Returns the codecs.
+
+        """
+
+        codecs = self._create_codec()
+        self._codecs = codecs
+
+        return codecs
+
+    def precompile(self) -> None:
+        """Create the codecs used to encode and decode the message and its
+        contained messages now, instead of on first use.
+
+        """
+
+        if self._codecs is None:
+            self._compile()
+
+        if self._contained_messages is not None:
+            for message in self._contained_messages:
+                message.precompile()
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        # The codecs contain compiled bitstruct formats, which are big
+        # and slow to pickle. They are recreated on first use instead.
+        return _get_pickled_slots(self)
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        for set_slot, value in zip(_set_pickled_slots, state):
+            set_slot(self, value)
+
+        self._codecs = None
+        self._signal_tree = None
+
     @property
     def header_id(self) -> Optional[int]:
         """The header ID of the message if it is part of a container message.
@@ -309,6 +434,7 @@ class Message:
     @length.setter
     def length(self, value: int) -> None:
         self._length = value
+        self._dirty = True
 
     @property
     def signals(self) -> list[Signal]:
@@ -518,6 +644,9 @@ class Message:
 
         """
 
+        if self._signal_tree is None:
+            self._signal_tree = self._create_signal_tree()
+
         return self._signal_tree
 
     def gather_signals(self,
@@ -533,8 +662,7 @@ class Message:
         '''
 
         if node is None:
-            node = self._codecs
-        assert node is not None
+            node = self._codecs or self._compile()
 
         result = {}
 
@@ -940,10 +1068,7 @@ class Message:
                                   f'signal value dictionary')
             self.assert_signals_encodable(data, scaling=scaling)
 
-        if self._codecs is None:
-            raise ValueError('Codec is not initialized.')
-
-        encoded, padding_mask, all_signals = self._encode(self._codecs,
+        encoded, padding_mask, all_signals = self._encode(self._codecs or self._compile(),
                                                           cast('SignalMappingType', data),
                                                           scaling)
 
@@ -1125,10 +1250,8 @@ class Message:
 
         if self.is_container:
             raise DecodeError(f'Message "{self.name}" is a container')
-        elif self._codecs is None:
-            raise ValueError('Codec is not initialized.')
 
-        return self._decode(self._codecs,
+        return self._decode(self._codecs or self._compile(),
                             data,
                             decode_choices,
                             scaling,
@@ -1223,61 +1346,71 @@ class Message:
         True
 
         """
-        if self._codecs is None:
-            raise ValueError('Codec is not initialized.')
+        return any(isinstance(node, dict) for node in self.signal_tree)
 
-        return bool(self._codecs['multiplexers'])
+    def _signal_mask(self, signal: Signal) -> int:
+        """Returns the bits occupied by given signal as a mask in network
+        bit order, see :class:`_MessageBits`.
 
-    def _check_signal(self, message_bits, signal):
-        signal_bits = signal.length * [signal.name]
+        """
+
+        message_length = 8 * self._length
 
         if signal.byte_order == 'big_endian':
-            padding = start_bit(signal) * [None]
-            signal_bits = padding + signal_bits
-        else:
-            signal_bits += signal.start * [None]
+            start = start_bit(signal)
 
-            if len(signal_bits) < len(message_bits):
-                padding = (len(message_bits) - len(signal_bits)) * [None]
-                reversed_signal_bits = padding + signal_bits
-            else:
-                reversed_signal_bits = signal_bits
+            if start + signal.length > message_length:
+                raise Error(f'The signal {signal.name} does not fit in message {self.name}.')
+
+            return ((1 << signal.length) - 1) << start
 
-            signal_bits = []
+        if signal.start + signal.length > message_length:
+            raise Error(f'The signal {signal.name} does not fit in message {self.name}.')
 
-            for i in range(0, len(reversed_signal_bits), 8):
-                signal_bits = reversed_signal_bits[i:i + 8] + signal_bits
+        # The bits of little endian signals are numbered from the
+        # least significant bit of each byte, so the bit order is
+        # reversed within every byte.
+        mask = ((1 << signal.length) - 1) << signal.start
+        mask_bytes = mask.to_bytes(self._length, 'little')
 
+        return int.from_bytes(mask_bytes.translate(_REVERSED_BITS), 'little')
+
+    def _check_signal(self, message_bits: _MessageBits, signal: Signal) -> None:
         # Check that the signal fits in the message.
-        if len(signal_bits) > len(message_bits):
-            raise Error(f'The signal {signal.name} does not fit in message {self.name}.')
+        mask = self._signal_mask(signal)
 
         # Check that the signal does not overlap with other
         # signals.
-        for offset, signal_bit in enumerate(signal_bits):
-            if signal_bit is not None:
-                if message_bits[offset] is not None:
-                    raise Error(
-                        f'The signals {signal.name} and {message_bits[offset]} are overlapping in message {self.name}.')
+        overlap = (mask & message_bits.mask)
 
-                message_bits[offset] = signal.name
+        if overlap:
+            # Report the first overlapping bit in network order.
+            bit = (overlap & -overlap).bit_length() - 1
 
-    def _check_mux(self, message_bits, mux):
+            raise Error(
+                f'The signals {signal.name} and {message_bits.owner(bit)} are overlapping in message {self.name}.')
+
+        message_bits.mask |= mask
+        message_bits.owners.append((signal.name, mask))
+
+    def _check_mux(self, message_bits: _MessageBits, mux: dict) -> None:
         signal_name, children = next(iter(mux.items()))
         self._check_signal(message_bits,
                            self.get_signal_by_name(signal_name))
-        children_message_bits = deepcopy(message_bits)
+        children_message_bits = message_bits.copy()
+        number_of_owners = len(children_message_bits.owners)
 
         for multiplexer_id in sorted(children):
             child_tree = children[multiplexer_id]
-            child_message_bits = deepcopy(children_message_bits)
+            child_message_bits = children_message_bits.copy()
             self._check_signal_tree(child_message_bits, child_tree)
 
-            for i, child_bit in enumerate(child_message_bits):
-                if child_bit is not None:
-                    message_bits[i] = child_bit
+            # Signals of different multiplexer ids may overlap, so the
+            # ones checked last take precedence.
+            message_bits.mask |= child_message_bits.mask
+            message_bits.owners += child_message_bits.owners[number_of_owners:]
 
-    def _check_signal_tree(self, message_bits, signal_tree):
+    def _check_signal_tree(self, message_bits: _MessageBits, signal_tree: list) -> None:
         for signal_name in signal_tree:
             if isinstance(signal_name, dict):
                 self._check_mux(message_bits, signal_name)
@@ -1292,6 +1425,40 @@ class Message:
                     f'The signal {signal.name} length {signal.length} is not greater than 0 in '
                     f'message {self.name}.')
 
+    def _signal_generations(self) -> list[tuple[Signal, int]]:
+        return [(signal, signal._generation) for signal in self._signals]
+
+    def needs_refresh(self, strict: Optional[bool] = None) -> bool:
+        """Returns ``True`` if the message was modified since its internal
+        state was last refreshed, otherwise ``False``.
+
+        Assigning the message length, adding, removing or replacing
+        signals and assigning signal attributes that influence the
+        layout of the message are detected. In-place modifications of
+        mutable signal attributes, e.g. of the multiplexer ids list,
+        are not detected.
+
+        """
+
+        if strict is None:
+            strict = self._strict
+
+        return (self._dirty
+                or strict != self._refreshed_strict
+                or self._signal_generations() != self._refreshed_signals)
+
+    def check_layout(self) -> None:
+        """Raise an exception if any signals are overlapping or if they
+        don't fit in the message.
+
+        This check is done by :meth:`refresh()` if `strict` is
+        ``True``, and may be done separately for messages created with
+        `strict` set to ``False``.
+
+        """
+
+        self._check_signal_tree(_MessageBits(), self.signal_tree)
+
     def refresh(self, strict: Optional[bool] = None) -> None:
         """Refresh the internal message state.
 
@@ -1300,19 +1467,27 @@ class Message:
         argument overrides the value of the same argument passed to
         the constructor.
 
+        The codecs used to encode and decode the message are created
+        on first use, or by :meth:`precompile()`.
+
         """
 
         self._check_signal_lengths()
-        self._codecs = self._create_codec()
-        self._signal_tree = self._create_signal_tree(self._codecs)
+
+        # The codecs and the signal tree are created on first use.
+        self._codecs = None
+        self._signal_tree = None
         self._signal_dict = {signal.name: signal for signal in self._signals}
 
         if strict is None:
             strict = self._strict
 
         if strict:
-            message_bits = 8 * self.length * [None]
-            self._check_signal_tree(message_bits, self.signal_tree)
+            self.check_layout()
+
+        self._dirty = False
+        self._refreshed_strict = strict
+        self._refreshed_signals = self._signal_generations()
 
     def __repr__(self) -> str:
         return \
@@ -1322,3 +1497,14 @@ class Message:
             f'{self._is_extended_frame}, '\
             f'{self._length}, ' \
             f'{self._comments})'
+
+
+# Pickling helpers, which get and set all slots of a message except
+# the compiled ones.
+_PICKLED_SLOTS = [
+    name
+    for name in Message.__slots__
+    if name not in ('_codecs', '_signal_tree')
+]
+_get_pickled_slots = attrgetter(*_PICKLED_SLOTS)
+_set_pickled_slots = [getattr(Message, name).__set__ for name in _PICKLED_SLOTS]
@@ -1,4 +1,5 @@
 # A CAN bus node (or Board unit)
+import sys
 import typing
 from typing import Optional
 
@@ -20,7 +21,7 @@ class Node:
                  dbc_specifics: Optional["DbcSpecifics"] = None,
                  autosar_specifics: Optional["AutosarNodeSpecifics"] = None,
                  ) -> None:
-        self._name = name
+        self._name = sys.intern(name)
 
         # If the 'comment' argument is a string, we assume that is an
         # English comment. This is slightly hacky, because the
@@ -0,0 +1,475 @@
+# A read-only CAN database in shared memory.
+import marshal
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Literal, Optional, Union
+
+from ...typechecking import Choices, Codec, SignalDictType
+from ..conversion import BaseConversion
+from ..errors import DecodeError
+from ..namedsignalvalue import NamedSignalValue
+from ..utils import create_encode_decode_formats, decode_data, format_or
+from .signal import Signal
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+    from .database import Database
+    from .message import Message
+
+# Magic, number of messages, frame ids and names, and size of the
+# name table.
+_HEADER = struct.Struct('<8sQQQQ')
+_MAGIC = b'CANTSDB2'
+
+# Python before 3.13 removes shared memory when any process which
+# opened it exits, unless it is unregistered from the resource
+# tracker.
+_UNTRACK = sys.version_info < (3, 13) and sys.platform != 'win32'
+
+
+def _untrack(shm: 'SharedMemory') -> None:
+    if _UNTRACK:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name,  # type: ignore[attr-defined]
+                                    'shared_memory')
+
+
+def _choices_to_record(choices: Optional[Choices]) -> Optional[tuple]:
+    if choices is None:
+        return None
+
+    return tuple(
+        (value, choice, None, False) if isinstance(choice, str) else
+        (value, choice.name, choice.comments or None, True)
+        for value, choice in choices.items()
+    )
+
+
+def _choices_from_record(record: Optional[tuple]) -> Optional[Choices]:
+    if record is None:
+        return None
+
+    return OrderedDict(
+        (value, NamedSignalValue(value, name, comments) if named else name)
+        for value, name, comments, named in record
+    )
+
+
+def _signal_to_record(signal: Signal) -> tuple:
+    return (signal.name,
+            signal.start,
+            signal.length,
+            signal.byte_order,
+            signal.is_signed,
+            signal.conversion.is_float,
+            signal.conversion.scale,
+            signal.conversion.offset,
+            _choices_to_record(signal.conversion.choices))
+
+
+def _codec_to_record(codec: Codec) -> tuple:
+    return (
+        tuple(_signal_to_record(signal) for signal in codec['signals']),
+        {
+            name: {
+                multiplexer_id: _codec_to_record(child)
+                for multiplexer_id, child in children.items()
+            }
+            for name, children in codec['multiplexers'].items()
+        }
+    )
+
+
+def _message_to_record(message: 'Message') -> bytes:
+    if message.is_container:
+        codec = None
+    else:
+        codec = _codec_to_record(message._codecs or message._compile())
+
+    return marshal.dumps((message.name, message.length, codec))
+
+
+class _SharedMessage:
+    """The decoder of a message of a shared database, which is created
+    from its record on first use.
+
+    """
+
+    __slots__ = ('codec', 'length', 'name')
+
+    def __init__(self, record: memoryview) -> None:
+        name, length, codec = marshal.loads(record)
+        self.name: str = name
+        self.length: int = length
+        self.codec: Optional[Codec] = None
+
+        if codec is not None:
+            self.codec = self._create_codec(codec)
+
+    def _create_codec(self, record: tuple) -> Codec:
+        signals_record, multiplexers_record = record
+        signals = []
+
+        for (name,
+             start,
+             length,
+             byte_order,
+             is_signed,
+             is_float,
+             scale,
+             offset,
+             choices) in signals_record:
+            conversion = BaseConversion.factory(
+                scale=scale,
+                offset=offset,
+                choices=_choices_from_record(choices),
+                is_float=is_float)
+            signals.append(Signal(name,
+                                  start,
+                                  length,
+                                  byte_order,
+                                  is_signed,
+                                  conversion=conversion))
+
+        return {
+            'signals': signals,
+            'formats': create_encode_decode_formats(signals, self.length),
+            'multiplexers': {
+                name: {
+                    multiplexer_id: self._create_codec(child)
+                    for multiplexer_id, child in children.items()
+                }
+                for name, children in multiplexers_record.items()
+            }
+        }
+
+    def decode(self,
+               node: Codec,
+               data: bytes,
+               decode_choices: bool,
+               scaling: bool,
+               allow_truncated: bool,
+               allow_excess: bool) -> SignalDictType:
+        decoded = decode_data(data,
+                              self.length,
+                              node['signals'],
+                              node['formats'],
+                              decode_choices,
+                              scaling,
+                              allow_truncated,
+                              allow_excess)
+
+        multiplexers = node['multiplexers']
+
+        for name in multiplexers:
+            if allow_truncated and name not in decoded:
+                continue
+
+            mux = decoded[name]
+
+            if isinstance(mux, (str, NamedSignalValue)):
+                signal = next(signal
+                              for signal in node['signals']
+                              if signal.name == name)
+                mux = signal.conversion.choice_to_number(str(mux))
+
+            try:
+                child = multiplexers[name][int(mux)]
+            except KeyError:
+                raise DecodeError(f'expected multiplexer id {format_or(sorted(multiplexers[name].keys()))}, but got {mux}') from None
+
+            decoded.update(self.decode(child,
+                                       data,
+                                       decode_choices,
+                                       scaling,
+                                       allow_truncated,
+                                       allow_excess))
+
+        return decoded
+
+
+class _Names:
+    """The sorted message names of a shared database as a sequence of
+    encoded names.
+
+    """
+
+    def __init__(self, offsets: memoryview, names: memoryview) -> None:
+        self._offsets = offsets
+        self._names = names
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return bytes(self._names[self._offsets[index]:self._offsets[index + 1]])
+
+
+class SharedDatabase:
+    """A read-only CAN database in shared memory, which many processes
+    use to decode messages without each loading the database into its
+    own memory.
+
+    Create it once with :meth:`publish()` and attach to it by name in
+    the worker processes with :meth:`attach()`. A worker compiles the
+    decoder of a message from the shared memory when first decoding
+    it, so attaching is fast and the memory of a worker only grows
+    with the messages it actually decodes.
+
+    >>> db = cantools.database.load_file('foo.dbc')
+    >>> shared_db = SharedDatabase.publish(db)
+    >>> # in the worker processes
+    >>> worker_db = SharedDatabase.attach(shared_db.name)
+    >>> worker_db.decode_message(158, b'\\x01\\x45\\x23\\x00\\x11')
+    {'Bar': 1, 'Fum': 5.0}
+
+    The publishing process must keep its instance open while the
+    workers use the database and :meth:`unlink()` it when done.
+
+    """
+
+    def __init__(self, shm: 'SharedMemory') -> None:
+        self._shm = shm
+        self._buf: memoryview = shm.buf  # type: ignore[assignment]
+        self._views: list[memoryview] = []
+        (magic,
+         messages_count,
+         frame_ids_count,
+         names_count,
+         names_size) = _HEADER.unpack_from(self._buf)
+
+        if magic != _MAGIC:
+            shm.close()
+
+            raise DecodeError(f"'{shm.name}' is not a shared database.")
+
+        # The sections of the shared memory. The arrays with 8 bytes
+        # items come first to keep them aligned.
+        offset = _HEADER.size
+        self._record_offsets = self._section(offset, 'Q', messages_count + 1)
+        offset += 8 * (messages_count + 1)
+        name_offsets = self._section(offset, 'Q', names_count + 1)
+        offset += 8 * (names_count + 1)
+        self._frame_ids = self._section(offset, 'I', frame_ids_count)
+        offset += 4 * frame_ids_count
+        self._name_indexes = self._section(offset, 'I', names_count)
+        offset += 4 * names_count
+        self._names = _Names(name_offsets,
+                             self._section(offset, 'B', names_size))
+        offset += names_size
+        self._records = self._section(offset,
+                                      'B',
+                                      len(self._buf) - offset)
+        self._messages: dict[int, _SharedMessage] = {}
+
+    def _section(self,
+                 offset: int,
+                 fmt: Literal['B', 'I', 'Q'],
+                 count: int) -> memoryview:
+        size = struct.calcsize(fmt)
+        view = self._buf[offset:offset + size * count].toreadonly().cast(fmt)
+        self._views.append(view)
+
+        return view
+
+    @classmethod
+    def publish(cls,
+                database: 'Database',
+                name: Optional[str] = None) -> 'SharedDatabase':
+        """Copy the messages of given database into a new shared memory
+        block with given name, or a random name if ``None``. Returns
+        the shared database of the publishing process.
+
+        Container messages are published, but can not be decoded.
+
+        """
+
+        from multiprocessing.shared_memory import SharedMemory
+
+        # Ordered as the lookup tables of the database to find the
+        # same message for any frame id or name. A message may only be
+        # found by name if its frame id is used by a later message.
+        entries = sorted(database._frame_id_to_message.items())
+        messages = [message for _, message in entries]
+        indexes = {id(message): i for i, message in enumerate(messages)}
+
+        for message in database._name_to_message.values():
+            if id(message) not in indexes:
+                indexes[id(message)] = len(messages)
+                messages.append(message)
+
+        records = [_message_to_record(message) for message in messages]
+        named = sorted(
+            (name.encode('utf-8'), indexes[id(message)])
+            for name, message in database._name_to_message.items()
+        )
+
+        record_offsets = array('Q', [0])
+
+        for record in records:
+            record_offsets.append(record_offsets[-1] + len(record))
+
+        name_offsets = array('Q', [0])
+
+        for encoded_name, _ in named:
+            name_offsets.append(name_offsets[-1] + len(encoded_name))
+
+        names = b''.join(encoded_name for encoded_name, _ in named)
+        sections = [
+            _HEADER.pack(_MAGIC,
+                         len(records),
+                         len(entries),
+                         len(named),
+                         len(names)),
+            record_offsets.tobytes(),
+            name_offsets.tobytes(),
+            array('I', [frame_id for frame_id, _ in entries]).tobytes(),
+            array('I', [index for _, index in named]).tobytes(),
+            names,
+            *records
+        ]
+        data = b''.join(sections)
+        shm = SharedMemory(name=name, create=True, size=len(data))
+        _untrack(shm)
+        shm.buf[:len(data)] = data  # type: ignore[index]
+
+        return cls(shm)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedDatabase':
+        """Attach to the shared database with given name, published by
+        another process.
+
+        """
+
+        from multiprocessing.shared_memory import SharedMemory
+
+        if sys.version_info >= (3, 13):
+            shm = SharedMemory(name=name, track=False)
+        else:
+            shm = SharedMemory(name=name)
+            _untrack(shm)
+
+        return cls(shm)
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block, which is passed to
+        :meth:`attach()`.
+
+        """
+
+        return self._shm.name
+
+    def _message(self, index: int) -> _SharedMessage:
+        message = self._messages.get(index)
+
+        if message is None:
+            begin = self._record_offsets[index]
+            end = self._record_offsets[index + 1]
+            message = _SharedMessage(self._records[begin:end])
+            self._messages[index] = message
+
+        return message
+
+    def _find_message(self, frame_id_or_name: Union[int, str],
+                      force_extended_id: bool) -> _SharedMessage:
+        if isinstance(frame_id_or_name, int):
+            if force_extended_id or frame_id_or_name > 0x7FF:
+                frame_id_or_name |= 0x80000000
+
+            index = bisect_left(self._frame_ids, frame_id_or_name)
+
+            if (index == len(self._frame_ids)
+                or self._frame_ids[index] != frame_id_or_name):
+                raise KeyError(frame_id_or_name)
+
+            return self._message(index)
+        elif isinstance(frame_id_or_name, str):
+            encoded_name = frame_id_or_name.encode('utf-8')
+            index = bisect_left(self._names, encoded_name)
+
+            if (index == len(self._names)
+                or self._names[index] != encoded_name):
+                raise KeyError(frame_id_or_name)
+
+            return self._message(self._name_indexes[index])
+        else:
+            raise ValueError(f"Invalid frame_id_or_name '{frame_id_or_name}'")
+
+    def decode_message(self,
+                       frame_id_or_name: Union[int, str],
+                       data: bytes,
+                       decode_choices: bool = True,
+                       scaling: bool = True,
+                       allow_truncated: bool = False,
+                       allow_excess: bool = True,
+                       force_extended_id: bool = False,
+                       ) -> SignalDictType:
+        """Decode given signal data `data` as a message of given frame id
+        or name `frame_id_or_name`, like
+        :meth:`Database.decode_message()<cantools.database.can.Database.decode_message()>`.
+        Returns a dictionary of signal name-value entries.
+
+        """
+
+        message = self._find_message(frame_id_or_name, force_extended_id)
+
+        if message.codec is None:
+            raise DecodeError(f'Message "{message.name}" is a container '
+                              f'message, which can not be decoded using a '
+                              f'shared database.')
+
+        return message.decode(message.codec,
+                              data,
+                              decode_choices,
+                              scaling,
+                              allow_truncated,
+                              allow_excess)
+
+    def close(self) -> None:
+        """Close the shared database in this process.
+
+        """
+
+        self._messages.clear()
+
+        # all views must be released before closing the shared memory
+        for view in self._views:
+            view.release()
+
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Remove the shared memory block once all processes closed it.
+        Called by the publishing process.
+
+        """
+
+        if _UNTRACK:
+            # unlinking unregisters the shared memory again
+            from multiprocessing import resource_tracker
+
+            resource_tracker.register(self._shm._name,  # type: ignore[attr-defined]
+                                      'shared_memory')
+
+        self._shm.unlink()
+
+    def __enter__(self) -> 'Self':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._record_offsets) - 1
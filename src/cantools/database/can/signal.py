@@ -1,5 +1,7 @@
 # A CAN signal.
-from typing import TYPE_CHECKING, Optional, Union
+import sys
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from ...typechecking import ByteOrder, Choices, Comments, SignalValueType
 from ..conversion import BaseConversion, IdentityConversion
@@ -8,6 +10,20 @@ from ..namedsignalvalue import NamedSignalValue
 if TYPE_CHECKING:
     from ...database.can.formats.dbc import DbcSpecifics
 
+# Attributes which influence the codecs, the signal tree and the
+# layout check of the messages featuring a signal.
+_CODEC_ATTRIBUTES = frozenset([
+    'name',
+    'conversion',
+    'start',
+    'length',
+    'byte_order',
+    'is_signed',
+    'is_multiplexer',
+    'multiplexer_ids',
+    'multiplexer_signal',
+])
+
 class Signal:
     """A CAN signal with position, size, unit and other information. A
     signal is part of a message.
@@ -42,8 +58,37 @@ class Signal:
               +--------+--------+--------+--- - -
        Bit:    7      0 15     8 23    16 31
 
+    Modifying a signal of a message in a database does not update the
+    database. Call
+    :meth:`Database.refresh(incremental=True)<cantools.database.can.Database.refresh>`
+    afterwards to recompile only the modified messages.
+
     """
 
+    __slots__ = (
+        '_generation',
+        'byte_order',
+        'comments',
+        'conversion',
+        'dbc',
+        'initial',
+        'invalid',
+        'is_multiplexer',
+        'is_signed',
+        'length',
+        'maximum',
+        'minimum',
+        'multiplexer_ids',
+        'multiplexer_signal',
+        'name',
+        'raw_initial',
+        'raw_invalid',
+        'receivers',
+        'spn',
+        'start',
+        'unit',
+    )
+
     def __init__(
         self,
         name: str,
@@ -65,10 +110,15 @@ class Signal:
         multiplexer_signal: Optional[str] = None,
         spn: Optional[int] = None,
     ) -> None:
+        # Incremented whenever an attribute listed in _CODEC_ATTRIBUTES
+        # is assigned. Messages compare it to the value seen during
+        # their last refresh to find out if they are outdated.
+        self._generation: int = 0
+
         # avoid using properties to improve encoding/decoding performance
 
         #: The signal name as a string.
-        self.name: str = name
+        self.name: str = sys.intern(name)
 
         #: The conversion instance, which is used to convert
         #: between raw and scaled/physical values.
@@ -154,6 +204,21 @@ class Signal:
             # multilingual dictionary
             self.comments = comment
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+
+        if name in _CODEC_ATTRIBUTES:
+            object.__setattr__(self, '_generation', self._generation + 1)
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        # the values in slot order are more compact than a dictionary
+        return _get_slots(self)
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        # restoring a pickled signal must not count as modification
+        for set_slot, value in zip(_set_slots, state):
+            set_slot(self, value)
+
     def raw_to_scaled(
         self, raw_value: Union[int, float], decode_choices: bool = True
     ) -> SignalValueType:
@@ -295,3 +360,8 @@ class Signal:
             f"{self.spn}, "
             f"{self.comments})"
         )
+
+
+# Pickling helpers, which get and set all slots of a signal.
+_get_slots = attrgetter(*Signal.__slots__)
+_set_slots = [getattr(Signal, name).__set__ for name in Signal.__slots__]
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 class BaseConversion(ABC):
     """The BaseConversion class defines the interface for all signal conversion classes."""
 
+    __slots__ = ()
+
     #: the scaling factor of the conversion
     scale: float
 
@@ -115,6 +117,8 @@ class BaseConversion(ABC):
 
 
 class IdentityConversion(BaseConversion):
+    __slots__ = ('is_float',)
+
     scale = 1
     offset = 0
     choices = None
@@ -146,6 +150,8 @@ class IdentityConversion(BaseConversion):
 
 
 class LinearIntegerConversion(BaseConversion):
+    __slots__ = ('offset', 'scale')
+
     is_float = False
     choices = None
 
@@ -184,6 +190,8 @@ class LinearIntegerConversion(BaseConversion):
 
 
 class LinearConversion(BaseConversion):
+    __slots__ = ('is_float', 'offset', 'scale')
+
     choices = None
 
     def __init__(self, scale: float, offset: float, is_float: bool) -> None:
@@ -221,6 +229,15 @@ class LinearConversion(BaseConversion):
 
 
 class NamedSignalConversion(BaseConversion):
+    __slots__ = (
+        '_conversion',
+        '_inverse_choices',
+        'choices',
+        'is_float',
+        'offset',
+        'scale',
+    )
+
     def __init__(
         self, scale: float, offset: float, choices: Choices, is_float: bool
     ) -> None:
@@ -237,8 +254,6 @@ class NamedSignalConversion(BaseConversion):
             choices=None,
             is_float=is_float,
         )
-        # monkeypatch method to avoid unnecessary function call
-        self.numeric_scaled_to_raw = self._conversion.numeric_scaled_to_raw  # type: ignore[method-assign]
 
     def raw_to_scaled(
         self,
@@ -265,7 +280,7 @@ class NamedSignalConversion(BaseConversion):
     def numeric_scaled_to_raw(
         self, scaled_value: Union[int, float]
     ) -> Union[int, float]:
-        return self._conversion.scaled_to_raw(scaled_value)
+        return self._conversion.numeric_scaled_to_raw(scaled_value)
 
     def set_choices(self, choices: Choices) -> None:
         self.choices = choices
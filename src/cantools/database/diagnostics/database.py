@@ -1,7 +1,5 @@
 import logging
 
-from .formats import cdd
-
 LOGGER = logging.getLogger(__name__)
 
 
@@ -55,6 +53,8 @@ class Database:
 
         """
 
+        from .formats import cdd
+
         database = cdd.load_string(string)
         self._dids = database.dids
         self.refresh()
@@ -9,6 +9,8 @@ class NamedSignalValue:
     descriptions for the named value.
     """
 
+    __slots__ = ('_comments', 'name', 'value')
+
     def __init__(
         self,
         value: int,
@@ -22,7 +24,9 @@ class NamedSignalValue:
         #: The integer value that gets mapped.
         self.value = value
 
-        self._comments = comments or {}
+        # most named values have no descriptions, so the dictionary
+        # is only created once it is accessed
+        self._comments: Optional[dict[str, str]] = comments or None
 
     @property
     def comments(self) -> dict[str, str]:
@@ -41,6 +45,9 @@ class NamedSignalValue:
 
         """
 
+        if self._comments is None:
+            self._comments = {}
+
         return self._comments
 
     def __str__(self) -> str:
@@ -54,7 +61,7 @@ class NamedSignalValue:
             return (
                 x.value == self.value
                 and x.name == self.name
-                and x.comments == self.comments
+                and (x._comments or None) == (self._comments or None)
             )
         elif isinstance(x, str):
             return x == self.name
@@ -2,8 +2,10 @@
 
 import os.path
 import re
+import sys
 from collections import OrderedDict
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
     Callable,
@@ -25,11 +27,16 @@ from .errors import DecodeError, EncodeError
 from .namedsignalvalue import NamedSignalValue
 
 if TYPE_CHECKING:
+    from functools import _CacheInfo
+
+    from bitstruct import CompiledFormatDict
+
     from ..database import Database
     from ..database.can.attribute import Attribute
     from ..database.can.message import Message
     from ..database.can.node import Node
     from ..database.can.signal import Signal
+    from ..database.conversion import BaseConversion
     from ..database.diagnostics import Data
 
 try:
@@ -193,6 +200,10 @@ def decode_data(data: bytes,
     return decoded
 
 
+# Maximum number of cached compiled signal layouts.
+_FORMATS_CACHE_MAXSIZE = 4096
+
+
 def create_encode_decode_formats(signals: Sequence[Union["Data", "Signal"]], number_of_bytes: int) -> Formats:
     format_length = (8 * number_of_bytes)
 
@@ -285,19 +296,28 @@ def create_encode_decode_formats(signals: Sequence[Union["Data", "Signal"]], num
     big_fmt, big_padding_mask, big_names = create_big()
     little_fmt, little_padding_mask, little_names = create_little()
 
-    try:
-        big_compiled = bitstruct.c.compile(big_fmt, big_names)
-    except Exception:
-        big_compiled = bitstruct.compile(big_fmt, big_names)
+    return Formats(_compile_format(big_fmt, tuple(big_names)),
+                   _compile_format(little_fmt, tuple(little_names)),
+                   big_padding_mask & little_padding_mask)
 
+
+@lru_cache(maxsize=_FORMATS_CACHE_MAXSIZE)
+def _compile_format(fmt: str, names: tuple[str, ...]) -> "CompiledFormatDict":
+    # Compiled formats are immutable, so messages and multiplexer
+    # branches with equal layouts and signal names share them.
     try:
-        little_compiled = bitstruct.c.compile(little_fmt, little_names)
+        return bitstruct.c.compile(fmt, list(names))
     except Exception:
-        little_compiled = bitstruct.compile(little_fmt, little_names)
+        return bitstruct.compile(fmt, list(names))
 
-    return Formats(big_compiled,
-                   little_compiled,
-                   big_padding_mask & little_padding_mask)
+
+def formats_cache_info() -> "_CacheInfo":
+    '''
+    Returns the hits, misses, maximum size and current size of the
+    cache of compiled signal layouts, which is shared by all messages
+    of all databases.
+    '''
+    return _compile_format.cache_info()
 
 
 def sawtooth_to_network_bitnum(sawtooth_bitnum: int) -> int:
@@ -414,19 +434,147 @@ def prune_signal_choices(signal: "Signal") -> None:
             choice.name = choice.name[n:]
 
 
+def _database_messages(database: "Database") -> Iterator["Message"]:
+    for message in database.messages:
+        yield message
+
+        if message.contained_messages is not None:
+            yield from message.contained_messages
+
+
+def _database_signals(database: "Database") -> Iterator["Signal"]:
+    for message in _database_messages(database):
+        yield from message.signals
+
+
 def prune_database_choices(database: "Database") -> None:
     '''
     Prune names of all named signal values of all signals of a database
     '''
-    for message in database.messages:
+    # signals may share their choices, which must be pruned only once
+    pruned = set()
+
+    for signal in _database_signals(database):
+        if signal.choices is None or id(signal.choices) in pruned:
+            continue
 
-        for signal in message.signals:
-            prune_signal_choices(signal)
+        prune_signal_choices(signal)
+        pruned.add(id(signal.choices))
 
-        if message.contained_messages is not None:
-            for cm in message.contained_messages:
-                for cs in cm.signals:
-                    prune_signal_choices(cs)
+
+def _conversion_key(conversion: "BaseConversion") -> tuple:
+    choices_key: Optional[tuple] = None
+
+    if conversion.choices is not None:
+        choices_key = tuple(
+            (raw, choice) if isinstance(choice, str) else
+            (raw,
+             choice.value,
+             choice.name,
+             tuple(choice._comments.items()) if choice._comments else None)
+            for raw, choice in conversion.choices.items()
+        )
+
+    # the types are part of the key as 1 and 1.0 are equal, but
+    # result in differently typed scaled values
+    return (type(conversion),
+            type(conversion.scale),
+            conversion.scale,
+            type(conversion.offset),
+            conversion.offset,
+            conversion.is_float,
+            choices_key)
+
+
+def share_database_conversions(database: "Database") -> None:
+    '''
+    Let all signals of a database with equal scaling and choices share
+    a single conversion instance, including its choices dictionary.
+
+    This considerably reduces the memory footprint of big databases,
+    in which many signals use the same value tables. Shared choices
+    must not be modified in place; assign new choices to
+    :attr:`~cantools.database.can.Signal.choices` instead.
+    '''
+    conversions: dict[tuple, BaseConversion] = {}
+
+    for signal in _database_signals(database):
+        conversion = conversions.setdefault(_conversion_key(signal.conversion),
+                                            signal.conversion)
+
+        if conversion is not signal.conversion:
+            # the conversions are equal, so the signal's codecs stay
+            # valid and the message does not need to be refreshed
+            object.__setattr__(signal, 'conversion', conversion)
+
+
+def _compactable_objects(database: "Database") -> Iterator[object]:
+    for message in _database_messages(database):
+        yield message.senders
+        yield from message.senders
+
+    for signal in _database_signals(database):
+        yield signal.unit
+        yield signal.receivers
+        yield from signal.receivers
+        yield signal.conversion
+
+        if signal.choices is not None:
+            yield signal.choices
+
+            for choice in signal.choices.values():
+                yield choice
+
+                if isinstance(choice, NamedSignalValue):
+                    yield choice.name
+
+    for node in database.nodes:
+        yield node.name
+
+
+def _compactable_size(database: "Database") -> int:
+    objects = {
+        id(obj): obj
+        for obj in _compactable_objects(database)
+        if obj is not None
+    }
+
+    return sum(sys.getsizeof(obj) for obj in objects.values())
+
+
+def compact_database(database: "Database") -> int:
+    '''
+    Intern the strings and share equal receiver lists, choices and
+    conversions of a database, see
+    :meth:`~cantools.database.can.Database.compact()`. Returns the
+    number of bytes saved.
+    '''
+    size = _compactable_size(database)
+    receivers: dict[tuple[str, ...], list[str]] = {}
+
+    for message in _database_messages(database):
+        message.senders[:] = [sys.intern(sender) for sender in message.senders]
+
+    for signal in _database_signals(database):
+        if signal.unit is not None:
+            signal.unit = sys.intern(signal.unit)
+
+        key = tuple(sys.intern(receiver) for receiver in signal.receivers)
+        signal.receivers = receivers.setdefault(key, list(key))
+
+        if signal.choices is not None:
+            for value, choice in signal.choices.items():
+                if isinstance(choice, str):
+                    signal.choices[value] = sys.intern(choice)
+                else:
+                    choice.name = sys.intern(choice.name)
+
+    for node in database.nodes:
+        node.name = sys.intern(node.name)
+
+    share_database_conversions(database)
+
+    return size - _compactable_size(database)
 
 
 SORT_SIGNALS_DEFAULT: Final = 'default'
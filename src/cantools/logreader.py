@@ -1,7 +1,85 @@
+import array
 import binascii
+import bz2
+import collections
 import datetime
 import enum
+import functools
+import gzip
+import io
+import json
+import lzma
+import math
+import mmap
+import os
+import queue
 import re
+import string
+import struct
+import sys
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# Characters of the fields checked by the fast paths of the candump
+# patterns, which must match the corresponding regex character classes.
+# Parentheses within the timestamp are rejected by float().
+_TIMESTAMP_CHARS = string.digits + '.'
+_HEX_DIGITS = string.digits + 'ABCDEF'
+_CHANNEL_CHARS = string.ascii_letters + string.digits
+
+#: Default size in bytes of the chunks parsed by the worker processes
+#: of :func:`parse_file`.
+CHUNK_SIZE = 16 * 1024 * 1024
+
+#: Default size in bytes of the blocks read from compressed log files
+#: by :func:`open_log`.
+BLOCK_SIZE = 1024 * 1024
+
+#: Default number of frames that fit in a :class:`FrameColumns`.
+COLUMNS_CAPACITY = 65536
+
+#: Default number of frames per block of the index files written by
+#: :func:`build_index`.
+INDEX_BLOCK_FRAMES = 10000
+
+#: Suffix appended to the log file name to form its index file name.
+INDEX_SUFFIX = '.idx'
+
+_INDEX_VERSION = 1
+
+# Compressed file openers by magic number.
+_DECOMPRESSORS = [
+    (b'\x1f\x8b', gzip.open),
+    (b'\xfd7zXZ\x00', lzma.open),
+    (b'BZh', bz2.open)
+]
+
+# Vector BLF file and object layouts.
+_BLF_FILE_HEADER = struct.Struct('<4sLBBBBBBBBQQLL8H8H')
+_BLF_OBJECT_HEADER_BASE = struct.Struct('<4sHHLL')
+_BLF_OBJECT_HEADER_V1 = struct.Struct('<LHHQ')
+_BLF_OBJECT_HEADER_V2 = struct.Struct('<LBxHQ8x')
+_BLF_LOG_CONTAINER = struct.Struct('<H6xL4x')
+_BLF_CAN_MESSAGE = struct.Struct('<HBBL8s')
+_BLF_CAN_FD_MESSAGE = struct.Struct('<HBBLLBBB5x64s')
+_BLF_CAN_FD_MESSAGE_64 = struct.Struct('<BBBBLLLLLLLHBBL')
+_BLF_CAN_MESSAGE_TYPES = (1, 86)
+_BLF_CAN_FD_MESSAGE_TYPE = 100
+_BLF_CAN_FD_MESSAGE_64_TYPE = 101
+_BLF_LOG_CONTAINER_TYPE = 10
+_BLF_HEADER_SIZES = {
+    1: _BLF_OBJECT_HEADER_BASE.size + _BLF_OBJECT_HEADER_V1.size,
+    2: _BLF_OBJECT_HEADER_BASE.size + _BLF_OBJECT_HEADER_V2.size
+}
+_BLF_OBJECT_SIZES = {
+    **dict.fromkeys(_BLF_CAN_MESSAGE_TYPES, _BLF_CAN_MESSAGE.size),
+    _BLF_CAN_FD_MESSAGE_TYPE: _BLF_CAN_FD_MESSAGE.size,
+    _BLF_CAN_FD_MESSAGE_64_TYPE: _BLF_CAN_FD_MESSAGE_64.size
+}
+_BLF_REMOTE_FLAG = 0x80
+_BLF_CAN_FD_64_REMOTE_FLAG = 0x0010
 
 
 class TimestampFormat(enum.Enum):
@@ -17,6 +95,8 @@ class TimestampFormat(enum.Enum):
 class DataFrame:
     """Container for a parsed log entry (ie. a CAN frame)."""
 
+    __slots__ = ('channel', 'data', 'frame_id', 'timestamp', 'timestamp_format')
+
     def __init__(self, channel: str,
                  frame_id: int,
                  data: bytes,
@@ -27,22 +107,246 @@ class DataFrame:
         :param channel: A string representation of the channel, eg. 'can0'
         :param frame_id: The numeric CAN frame ID :param data: The actual data
         :param timestamp: A timestamp, datetime.datetime if absolute, or
-            datetime.timedelta if relative, None if missing
+            datetime.timedelta if relative, None if missing. Seconds as
+            a float if parsed with ``timestamps='float'``
         :param timestamp_format: The format of the timestamp
         : """
-        self.channel = channel
+        # Channel names are interned and bytes payloads are not copied
+        # to keep many frames in memory compact. Channels which are not
+        # strings, such as numbers, are kept as is.
+        self.channel = sys.intern(channel) if type(channel) is str else channel
         self.frame_id = frame_id
-        self.data = bytes(data)
+        self.data = data if type(data) is bytes else bytes(data)
         self.timestamp = timestamp
         self.timestamp_format = timestamp_format
 
 
+class FrameColumns:
+    """Parsed log entries stored column by column in compact,
+    preallocated buffers, as filled by :meth:`Parser.read_columns()`.
+
+    The first :attr:`size` items of each column are valid. The columns
+    can be viewed as for example numpy arrays without copying them.
+
+    >>> columns = cantools.logreader.FrameColumns() #doctest: +SKIP
+    >>> while parser.read_columns(columns): #doctest: +SKIP
+            timestamps = numpy.frombuffer(columns.timestamps)[:columns.size]
+    """
+
+    def __init__(self, capacity=COLUMNS_CAPACITY, payloads_capacity=None):
+        if payloads_capacity is None:
+            payloads_capacity = 8 * capacity
+
+        #: Maximum number of frames.
+        self.capacity = capacity
+
+        #: Number of frames.
+        self.size = 0
+
+        #: Timestamps in seconds, as if parsed with
+        #: ``timestamps='float'``, or NaN if missing.
+        self.timestamps = array.array('d', bytes(8 * capacity))
+
+        #: Frame ids.
+        self.frame_ids = array.array('I', bytes(4 * capacity))
+
+        #: Indexes of the channels in :attr:`channel_names`.
+        self.channels = array.array('H', bytes(2 * capacity))
+
+        #: Channel names, kept when the columns are refilled.
+        self.channel_names = []
+
+        #: Offsets of the payloads in :attr:`payloads`. The payload of
+        #: frame i is ``payloads[offsets[i]:offsets[i + 1]]``.
+        self.offsets = array.array('Q', bytes(8 * (capacity + 1)))
+
+        #: All payloads, one after the other. Grows if needed.
+        self.payloads = bytearray(payloads_capacity)
+
+        #: The format of the timestamps.
+        self.timestamp_format = None
+
+        self._channel_indexes = {}
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        """Remove all frames, keeping the buffers.
+
+        """
+
+        self.size = 0
+
+    def append(self, frame):
+        """Append given DataFrame. Raises IndexError if full.
+
+        """
+
+        size = self.size
+
+        if size == self.capacity:
+            raise IndexError('Frame columns are full.')
+
+        try:
+            channel = self._channel_indexes[frame.channel]
+        except KeyError:
+            channel = len(self.channel_names)
+            self.channel_names.append(frame.channel)
+            self._channel_indexes[frame.channel] = channel
+
+        timestamp = frame.timestamp
+
+        if timestamp is None:
+            timestamp = math.nan
+        elif not isinstance(timestamp, float):
+            timestamp = _timestamp_seconds(timestamp)
+
+        offset = self.offsets[size]
+        end = offset + len(frame.data)
+        self.payloads[offset:end] = frame.data
+        self.timestamps[size] = timestamp
+        self.frame_ids[size] = frame.frame_id
+        self.channels[size] = channel
+        self.offsets[size + 1] = end
+        self.timestamp_format = frame.timestamp_format
+        self.size = size + 1
+
+    def data(self, index):
+        """Returns the payload of frame at given index.
+
+        """
+
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+
+        return bytes(self.payloads[self.offsets[index]:self.offsets[index + 1]])
+
+    def frame(self, index):
+        """Returns the frame at given index as a DataFrame, with timestamp
+        in seconds.
+
+        """
+
+        timestamp = self.timestamps[index]
+
+        return DataFrame(self.channel_names[self.channels[index]],
+                         self.frame_ids[index],
+                         self.data(index),
+                         None if math.isnan(timestamp) else timestamp,
+                         self.timestamp_format)
+
+
 class BasePattern:
+    # Index of the whitespace separated field starting with the frame
+    # id, if fixed. Makes frame_id() much faster than match().
+    frame_id_field: Optional[int] = None
+
     @classmethod
-    def match(clz, line):
+    def match(clz, line, float_timestamps=False):
         mo = clz.pattern.match(line)
         if mo:
-            return clz.unpack(mo)
+            return clz.unpack(mo, float_timestamps)
+
+    @classmethod
+    def frame_id(clz, line):
+        """Returns the frame id of given line without unpacking the rest of
+        it, or None if not found.
+
+        """
+
+        if clz.frame_id_field is None:
+            mo = clz.pattern.match(line)
+
+            if mo:
+                return int(mo.group('can_id'), 16)
+        else:
+            fields = line.split(None, clz.frame_id_field + 1)
+
+            try:
+                return int(fields[clz.frame_id_field].partition('#')[0], 16)
+            except (IndexError, ValueError):
+                pass
+
+        return None
+
+
+class SplitPattern(BasePattern):
+    """A pattern with a fast path that unpacks lines by splitting them at
+    their fixed delimiters. The regex is only matched for lines that the
+    fast path cannot unpack.
+
+    """
+
+    @classmethod
+    def match(clz, line, float_timestamps=False):
+        try:
+            frame = clz.unpack_line(line, float_timestamps)
+        except ValueError:
+            frame = None
+
+        if frame is None:
+            frame = super().match(line, float_timestamps)
+
+        return frame
+
+    @staticmethod
+    def unpack_line(line, float_timestamps=False):
+        """Returns given line unpacked as a DataFrame, or None if it has to
+        be matched with the regex instead.
+
+        """
+
+        raise NotImplementedError
+
+
+def _candump_timestamp(seconds, float_timestamps):
+    if seconds < 662688000:  # 1991-01-01 00:00:00, "Released in 1991, the Mercedes-Benz W140 was the first production vehicle to feature a CAN-based multiplex wiring system."
+        timestamp_format = TimestampFormat.RELATIVE
+
+        if not float_timestamps:
+            seconds = datetime.timedelta(seconds=seconds)
+    else:
+        timestamp_format = TimestampFormat.ABSOLUTE
+
+        if not float_timestamps:
+            seconds = datetime.datetime.fromtimestamp(seconds,
+                                                      datetime.timezone.utc)
+
+    return seconds, timestamp_format
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_minute(timestamp):
+    minute = datetime.datetime.strptime(timestamp, '%Y-%m-%d %H:%M')
+
+    return minute, minute.timestamp()
+
+
+def _candump_absolute_timestamp(timestamp, float_timestamps):
+    """Parse given local time timestamp on the format YYYY-MM-DD
+    HH:MM:SS.ffffff. Only the date and time up to the minute, which is
+    shared by many consecutive frames, is parsed with strptime().
+
+    """
+
+    seconds = timestamp[17:]
+
+    # Let strptime() reject leap seconds and more than six fraction
+    # digits.
+    if len(seconds) > 9 or seconds[:2] > '59':
+        timestamp = datetime.datetime.strptime(timestamp,
+                                               '%Y-%m-%d %H:%M:%S.%f')
+
+        return timestamp.timestamp() if float_timestamps else timestamp
+
+    minute, minute_seconds = _parse_minute(timestamp[:16])
+
+    if float_timestamps:
+        return minute_seconds + float(seconds)
+
+    return minute.replace(second=int(seconds[:2]),
+                          microsecond=int(seconds[3:].ljust(6, '0')))
 
 
 class CandumpDefaultPattern(BasePattern):
@@ -51,11 +355,12 @@ class CandumpDefaultPattern(BasePattern):
     #candump vcan0 -a
     # vcan0  1F0   [8]  00 00 00 00 00 00 1B C1   '.......Á'
     #(Ignore anything after the end of the data to work with candump's ASCII decoding)
+    frame_id_field = 1
     pattern = re.compile(
         r'^\s*?(?P<channel>[a-zA-Z0-9]+)\s+(?P<can_id>[0-9A-F]+)\s+\[\d+\]\s*(?P<can_data>[0-9A-F ]*).*?$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         channel = match_object.group('channel')
         frame_id = int(match_object.group('can_id'), 16)
         data = match_object.group('can_data')
@@ -67,17 +372,18 @@ class CandumpDefaultPattern(BasePattern):
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
 
 
-class CandumpTimestampedPattern(BasePattern):
+class CandumpTimestampedPattern(SplitPattern):
     #candump vcan0 -tz
     # (000.000000)  vcan0  0C8   [8]  F0 00 00 00 00 00 00 00
     #candump vcan0 -tz -a
     # (000.000000)  vcan0  0C8   [8]  31 30 30 2E 35 20 46 4D   '100.5 FM'
     #(Ignore anything after the end of the data to work with candump's ASCII decoding)
+    frame_id_field = 2
     pattern = re.compile(
         r'^\s*?\((?P<timestamp>[\d.]+)\)\s+(?P<channel>[a-zA-Z0-9]+)\s+(?P<can_id>[0-9A-F]+)\s+\[\d+\]\s*(?P<can_data>[0-9A-F ]*).*?$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         channel = match_object.group('channel')
         frame_id = int(match_object.group('can_id'), 16)
         data = match_object.group('can_data')
@@ -85,34 +391,109 @@ class CandumpTimestampedPattern(BasePattern):
         data = binascii.unhexlify(data)
 
         seconds = float(match_object.group('timestamp'))
-        if seconds < 662688000:  # 1991-01-01 00:00:00, "Released in 1991, the Mercedes-Benz W140 was the first production vehicle to feature a CAN-based multiplex wiring system."
-            timestamp = datetime.timedelta(seconds=seconds)
-            timestamp_format = TimestampFormat.RELATIVE
-        else:
-            timestamp = datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
-            timestamp_format = TimestampFormat.ABSOLUTE
+        timestamp, timestamp_format = _candump_timestamp(seconds,
+                                                         float_timestamps)
 
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
 
+    @staticmethod
+    def unpack_line(line, float_timestamps=False):
+        fields = line.split(maxsplit=4)
+
+        if len(fields) == 4:
+            fields.append('')
+        elif len(fields) != 5:
+            return None
+
+        timestamp, channel, can_id, dlc, rest = fields
 
-class CandumpDefaultLogPattern(BasePattern):
+        if (timestamp[0] != '('
+                or timestamp[-1] != ')'
+                or timestamp.strip(_TIMESTAMP_CHARS + '()')
+                or channel.strip(_CHANNEL_CHARS)
+                or can_id.strip(_HEX_DIGITS)
+                or dlc[0] != '['
+                or dlc[-1] != ']'
+                or not dlc[1:-1].isdecimal()):
+            return None
+
+        # The data bytes may be followed by their ASCII representation.
+        data = rest[:len(rest) - len(rest.lstrip(_HEX_DIGITS + ' '))]
+        timestamp, timestamp_format = _candump_timestamp(float(timestamp[1:-1]),
+                                                         float_timestamps)
+
+        return DataFrame(channel,
+                         int(can_id, 16),
+                         binascii.unhexlify(data.replace(' ', '')),
+                         timestamp,
+                         timestamp_format)
+
+
+class CandumpDefaultLogPattern(SplitPattern):
     # (1579857014.345944) can2 486#82967A6B006B07F8
     # (1613656104.501098) can2 14C##16A0FFE00606E022400000000000000A0FFFF00FFFF25000600000000000000FE
+    frame_id_field = 2
     pattern = re.compile(
         r'^\s*?\((?P<timestamp>[\d.]+?)\)\s+?(?P<channel>[a-zA-Z0-9]+)\s+?(?P<can_id>[0-9A-F]+?)#(#[0-9A-F])?(?P<can_data>([0-9A-Fa-f]{2})*)(\s+[RT])?$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         channel = match_object.group('channel')
         frame_id = int(match_object.group('can_id'), 16)
         data = match_object.group('can_data')
         data = data.replace(' ', '')
         data = binascii.unhexlify(data)
-        timestamp = datetime.datetime.fromtimestamp(float(match_object.group('timestamp')), datetime.timezone.utc)
+        timestamp = float(match_object.group('timestamp'))
+        if not float_timestamps:
+            timestamp = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
         timestamp_format = TimestampFormat.ABSOLUTE
 
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
 
+    @staticmethod
+    def unpack_line(line, float_timestamps=False):
+        fields = line.split()
+
+        if len(fields) == 4:
+            if fields[3] not in ['R', 'T']:
+                return None
+        elif len(fields) != 3:
+            return None
+
+        timestamp, channel, frame = fields[:3]
+        can_id, separator, data = frame.partition('#')
+
+        if (timestamp[0] != '('
+                or timestamp[-1] != ')'
+                or timestamp.strip(_TIMESTAMP_CHARS + '()')
+                or channel.strip(_CHANNEL_CHARS)
+                or not separator
+                or not can_id
+                or can_id.strip(_HEX_DIGITS)
+                or line[-1].isspace()):
+            return None
+
+        # CAN-FD frames have a second separator followed by a flags digit.
+        if data[:1] == '#':
+            flags = data[1:2]
+
+            if not flags or flags.strip(_HEX_DIGITS):
+                return None
+
+            data = data[2:]
+
+        timestamp = float(timestamp[1:-1])
+
+        if not float_timestamps:
+            timestamp = datetime.datetime.fromtimestamp(timestamp,
+                                                        datetime.timezone.utc)
+
+        return DataFrame(channel,
+                         int(can_id, 16),
+                         binascii.unhexlify(data),
+                         timestamp,
+                         TimestampFormat.ABSOLUTE)
+
 
 class CandumpAbsoluteLogPattern(BasePattern):
     #candump vcan0 -tA
@@ -120,17 +501,18 @@ class CandumpAbsoluteLogPattern(BasePattern):
     #candump vcan0 -tA -a
     # (2020-12-19 12:04:45.485261)  vcan0  0C8   [8]  31 30 30 2E 35 20 46 4D   '100.5 FM'
     #(Ignore anything after the end of the data to work with candump's ASCII decoding)
+    frame_id_field = 3
     pattern = re.compile(
         r'^\s*?\((?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+)\)\s+(?P<channel>[a-zA-Z0-9]+)\s+(?P<can_id>[0-9A-F]+)\s+\[\d+\]\s*(?P<can_data>[0-9A-F ]*).*?$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         channel = match_object.group('channel')
         frame_id = int(match_object.group('can_id'), 16)
         data = match_object.group('can_data')
         data = data.replace(' ', '')
         data = binascii.unhexlify(data)
-        timestamp = datetime.datetime.strptime(match_object.group('timestamp'), "%Y-%m-%d %H:%M:%S.%f")
+        timestamp = _candump_absolute_timestamp(match_object.group('timestamp'), float_timestamps)
         timestamp_format = TimestampFormat.ABSOLUTE
 
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
@@ -145,7 +527,7 @@ class PCANTracePatternV10(BasePattern):
         r'^\s*?\d+\)\s*?(?P<timestamp>\d+)\s+(?P<can_id>[0-9A-F]+)\s+(?P<dlc>[0-9])\s+(?P<can_data>[0-9A-F ]*)$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         """
         >>> PCANTracePatternV10().match(" 1) 1841 0001 8 00 00 00 00 00 00 00 00") #doctest: +ELLIPSIS
         <logreader.DataFrame object at ...>
@@ -157,7 +539,10 @@ class PCANTracePatternV10(BasePattern):
         data = binascii.unhexlify(data)
         millis = float(match_object.group('timestamp'))
         # timestamp = datetime.datetime.strptime(match_object.group('timestamp'), "%Y-%m-%d %H:%M:%S.%f")
-        timestamp = datetime.timedelta(milliseconds=millis)
+        if float_timestamps:
+            timestamp = millis / 1000
+        else:
+            timestamp = datetime.timedelta(milliseconds=millis)
         timestamp_format = TimestampFormat.RELATIVE
 
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
@@ -172,7 +557,7 @@ class PCANTracePatternV11(BasePattern):
         r'^\s*?\d+\)\s*?(?P<timestamp>\d+.\d+)\s+.+\s+(?P<can_id>[0-9A-F]+)\s+(?P<dlc>[0-9])\s+(?P<can_data>[0-9A-F ]*)$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         """
         >>> PCANTracePatternV11().match("  1)      6357.2  Rx        0401  8    00 00 00 00 00 00 00 00") #doctest: +ELLIPSIS
         <logreader.DataFrame object at ...>
@@ -184,7 +569,10 @@ class PCANTracePatternV11(BasePattern):
         data = binascii.unhexlify(data)
         millis = float(match_object.group('timestamp'))
         # timestamp = datetime.datetime.strptime(match_object.group('timestamp'), "%Y-%m-%d %H:%M:%S.%f")
-        timestamp = datetime.timedelta(milliseconds=millis)
+        if float_timestamps:
+            timestamp = millis / 1000
+        else:
+            timestamp = datetime.timedelta(milliseconds=millis)
         timestamp_format = TimestampFormat.RELATIVE
 
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
@@ -199,7 +587,7 @@ class PCANTracePatternV12(BasePattern):
         r'^\s*?\d+\)\s*?(?P<timestamp>\d+.\d+)\s+(?P<channel>[0-9])\s+.+\s+(?P<can_id>[0-9A-F]+)\s+(?P<dlc>[0-9])\s+(?P<can_data>[0-9A-F ]*)$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         """
         >>> PCANTracePatternV12().match("  1)      6357.213 1  Rx        0401  8    00 00 00 00 00 00 00 00") #doctest: +ELLIPSIS
         <logreader.DataFrame object at ...>
@@ -211,7 +599,10 @@ class PCANTracePatternV12(BasePattern):
         data = binascii.unhexlify(data)
         millis = float(match_object.group('timestamp'))
         # timestamp = datetime.datetime.strptime(match_object.group('timestamp'), "%Y-%m-%d %H:%M:%S.%f")
-        timestamp = datetime.timedelta(milliseconds=millis)
+        if float_timestamps:
+            timestamp = millis / 1000
+        else:
+            timestamp = datetime.timedelta(milliseconds=millis)
         timestamp_format = TimestampFormat.RELATIVE
 
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
@@ -226,7 +617,7 @@ class PCANTracePatternV13(BasePattern):
         r'^\s*?\d+\)\s*?(?P<timestamp>\d+.\d+)\s+(?P<channel>[0-9])\s+.+\s+(?P<can_id>[0-9A-F]+)\s+-\s+(?P<dlc>[0-9])\s+(?P<can_data>[0-9A-F ]*)$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         """
         >>> PCANTracePatternV13().match("  1)      6357.213 1  Rx        0401 -  8    00 00 00 00 00 00 00 00") #doctest: +ELLIPSIS
         <logreader.DataFrame object at ...>
@@ -238,7 +629,10 @@ class PCANTracePatternV13(BasePattern):
         data = binascii.unhexlify(data)
         millis = float(match_object.group('timestamp'))
         # timestamp = datetime.datetime.strptime(match_object.group('timestamp'), "%Y-%m-%d %H:%M:%S.%f")
-        timestamp = datetime.timedelta(milliseconds=millis)
+        if float_timestamps:
+            timestamp = millis / 1000
+        else:
+            timestamp = datetime.timedelta(milliseconds=millis)
         timestamp_format = TimestampFormat.RELATIVE
 
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
@@ -252,7 +646,7 @@ class PCANTracePatternV20(BasePattern):
         r'^\s*?\d+?\s*?(?P<timestamp>\d+.\d+)\s+(?P<type>\w+)\s+(?P<can_id>[0-9A-F]+)\s+(?P<rxtx>\w+)\s+(?P<dlc>[0-9]+)\s+(?P<can_data>[0-9A-F ]*)$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         """
         >>> PCANTracePatternV20().match(" 1      1059.900 DT 0300 Rx 7 00 00 00 00 04 00 00") #doctest: +ELLIPSIS
         <logreader.DataFrame object at ...>
@@ -264,7 +658,10 @@ class PCANTracePatternV20(BasePattern):
         data = binascii.unhexlify(data)
         millis = float(match_object.group('timestamp'))
         # timestamp = datetime.datetime.strptime(match_object.group('timestamp'), "%Y-%m-%d %H:%M:%S.%f")
-        timestamp = datetime.timedelta(milliseconds=millis)
+        if float_timestamps:
+            timestamp = millis / 1000
+        else:
+            timestamp = datetime.timedelta(milliseconds=millis)
         timestamp_format = TimestampFormat.RELATIVE
 
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
@@ -279,7 +676,7 @@ class PCANTracePatternV21(BasePattern):
         r'^\s*?\d+?\s*?(?P<timestamp>\d+.\d+)\s+(?P<type>.+)\s+(?P<channel>[0-9])\s+(?P<can_id>[0-9A-F]+)\s+(?P<rxtx>.+)\s+-\s+(?P<dlc>[0-9]+)\s+(?P<can_data>[0-9A-F ]*)$')
 
     @staticmethod
-    def unpack(match_object):
+    def unpack(match_object, float_timestamps=False):
         """
         >>> PCANTracePatternV21().match(" 1      1059.900 DT 1 0300 Rx - 7 00 00 00 00 04 00 00") #doctest: +ELLIPSIS
         <logreader.DataFrame object at ...>
@@ -291,7 +688,10 @@ class PCANTracePatternV21(BasePattern):
         data = binascii.unhexlify(data)
         millis = float(match_object.group('timestamp'))
         # timestamp = datetime.datetime.strptime(match_object.group('timestamp'), "%Y-%m-%d %H:%M:%S.%f")
-        timestamp = datetime.timedelta(milliseconds=millis)
+        if float_timestamps:
+            timestamp = millis / 1000
+        else:
+            timestamp = datetime.timedelta(milliseconds=millis)
         timestamp_format = TimestampFormat.RELATIVE
 
         return DataFrame(channel=channel, frame_id=frame_id, data=data, timestamp=timestamp, timestamp_format=timestamp_format)
@@ -303,14 +703,27 @@ class Parser:
     Automatically detects the format of the logfile by trying parser patterns
     until the first successful match.
 
+    Timestamps are datetime.datetime and datetime.timedelta objects if
+    `timestamps` is ``'datetime'``. If ``'float'``, they are instead kept
+    as float seconds since the epoch or the start of the log, which is
+    considerably faster. Absolute candump timestamps are in local time.
+
+    If `frame_ids` is given, only frames with these ids are parsed and
+    all other lines are discarded after extracting just their frame
+    id. It is either a set of frame ids, or a
+    :class:`~cantools.database.can.Database`, in which case only
+    frames of messages in the database are parsed.
+
     >>> with open('candump.log') as fd: #doctest: +SKIP
             for frame in cantools.logreader.Parser(fd):
                 print(f'{frame.timestamp}: {frame.frame_id}')
     """
 
-    def __init__(self, stream=None):
+    def __init__(self, stream=None, timestamps='datetime', frame_ids=None):
         self.stream = stream
         self.pattern = None
+        self.float_timestamps = _is_float_timestamps(timestamps)
+        self.frame_ids = _frame_ids(frame_ids)
 
     @staticmethod
     def detect_pattern(line):
@@ -320,24 +733,70 @@ class Parser:
                 return p
 
     def parse(self, line):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', 'replace')
+
         if self.pattern is None:
             self.pattern = self.detect_pattern(line)
         if self.pattern is None:
             return None
-        return self.pattern.match(line)
+        if self.frame_ids is None:
+            return self.pattern.match(line, self.float_timestamps)
+
+        frame_id = self.pattern.frame_id(line)
+        if frame_id is not None and frame_id not in self.frame_ids:
+            return None
+        frame = self.pattern.match(line, self.float_timestamps)
+        if frame is not None and frame.frame_id not in self.frame_ids:
+            return None
+        return frame
+
+    def read_columns(self, columns):
+        """Replace the frames in given :class:`FrameColumns` with the next
+        frames read from the stream, until the columns are full or the
+        stream ends. Non-parseable log entries are discarded. Returns
+        the number of frames read, which is zero at the end of the
+        stream.
+
+        >>> columns = cantools.logreader.FrameColumns() #doctest: +SKIP
+        >>> with open('candump.log') as fd: #doctest: +SKIP
+                parser = cantools.logreader.Parser(fd, timestamps='float')
+                while parser.read_columns(columns):
+                    print(columns.frame_ids[:columns.size])
+        """
+        columns.clear()
+        if self.stream is None:
+            return 0
+        readline = self.stream.readline
+        append = columns.append
+        capacity = columns.capacity
+        while columns.size < capacity:
+            nl = readline()
+            if not nl:
+                break
+            if isinstance(nl, bytes):
+                nl = nl.decode('utf-8', 'replace')
+            frame = self.parse(nl.strip('\r\n'))
+            if frame is not None:
+                append(frame)
+        return columns.size
 
     def iterlines(self, keep_unknowns=False):
         """Returns an generator that yields (str, DataFrame) tuples with the
         raw log entry and a parsed log entry. If keep_unknowns=True, (str,
         None) tuples will be returned for log entries that couldn't be decoded.
         If keep_unknowns=False, non-parseable log entries is discarded.
+
+        The stream may be opened in text or binary mode.
         """
         if self.stream is None:
             return
         while True:
             nl = self.stream.readline()
-            if nl == '':
+            if not nl:
                 return
+            if isinstance(nl, bytes):
+                nl = nl.decode('utf-8', 'replace')
             nl = nl.strip('\r\n')
             frame = self.parse(nl)
             if frame:
@@ -352,3 +811,942 @@ class Parser:
         discarded."""
         for _, frame in self.iterlines():
             yield frame
+
+
+class AscReader:
+    """A Vector ASC log file reader.
+
+    Yields DataFrames of the classic CAN and CAN FD frames of given
+    stream, which may be opened in text or binary mode. Remote frames,
+    error frames and all other events are discarded. Channels are the
+    channel numbers as found in the log, and timestamps are relative to
+    the start of the measurement. `timestamps` is the same as for
+    :class:`Parser`.
+
+    >>> with open('trace.asc') as fd: #doctest: +SKIP
+            for frame in cantools.logreader.AscReader(fd):
+                print(f'{frame.timestamp}: {frame.frame_id}')
+    """
+
+    def __init__(self, stream, timestamps='datetime'):
+        self.stream = stream
+        self.float_timestamps = _is_float_timestamps(timestamps)
+        self.base = 16
+        self.relative_timestamps = False
+
+    def _parse_header(self, fields):
+        """Handles the ``base hex|dec timestamps absolute|relative`` header
+        line.
+
+        """
+
+        self.base = 10 if fields[1].lower() == 'dec' else 16
+        self.relative_timestamps = (len(fields) >= 4
+                                    and fields[3].lower() == 'relative')
+
+    def _unpack(self, fields):
+        """Returns the channel, frame id and data of given frame fields, or
+        None if not a frame with data.
+
+        """
+
+        base = self.base
+
+        if fields[1] == 'CANFD':
+            # ts CANFD channel dir id [name] brs esi dlc length data...
+            if fields[5].isdigit():
+                data_start = 9
+            else:
+                data_start = 10
+
+            size = int(fields[data_start - 1])
+
+            if size == 0:
+                return None
+
+            channel = fields[2]
+            frame_id = fields[4]
+        else:
+            # ts channel id dir d dlc data...
+            if fields[4] != 'd':
+                return None
+
+            data_start = 6
+            size = min(int(fields[5], base), 8)
+            channel = fields[1]
+            frame_id = fields[2]
+
+        data = fields[data_start:data_start + size]
+
+        if len(data) != size:
+            return None
+
+        return (channel,
+                int(frame_id.rstrip('xX'), base),
+                bytes([int(byte, base) for byte in data]))
+
+    def __iter__(self):
+        float_timestamps = self.float_timestamps
+        timedelta = datetime.timedelta
+        previous_timestamp = 0.0
+
+        for line in self.stream:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', 'replace')
+
+            fields = line.split()
+
+            if len(fields) < 5:
+                if len(fields) >= 2 and fields[0].lower() == 'base':
+                    self._parse_header(fields)
+
+                continue
+
+            try:
+                timestamp = float(fields[0])
+            except ValueError:
+                if fields[0].lower() == 'base':
+                    self._parse_header(fields)
+
+                continue
+
+            if self.relative_timestamps:
+                timestamp += previous_timestamp
+                previous_timestamp = timestamp
+
+            if not (fields[1].isdigit() or fields[1] == 'CANFD'):
+                continue
+
+            try:
+                frame = self._unpack(fields)
+            except (ValueError, IndexError):
+                continue
+
+            if frame is None:
+                continue
+
+            if not float_timestamps:
+                timestamp = timedelta(seconds=timestamp)
+
+            yield DataFrame(*frame, timestamp, TimestampFormat.RELATIVE)
+
+
+class BlfReader:
+    """A Vector BLF log file reader.
+
+    Yields DataFrames of the classic CAN and CAN FD frames of given
+    stream, which must be opened in binary mode. Log containers are
+    read and decompressed one at a time. Remote frames, error frames
+    and all other objects are discarded. Channels are the channel
+    numbers as found in the log, and timestamps are absolute, with the
+    measurement start time of the file header taken as local time if
+    `timestamps` is ``'float'``, like absolute candump timestamps.
+    `timestamps` is the same as for :class:`Parser`.
+
+    >>> with open('trace.blf', 'rb') as fd: #doctest: +SKIP
+            for frame in cantools.logreader.BlfReader(fd):
+                print(f'{frame.timestamp}: {frame.frame_id}')
+    """
+
+    def __init__(self, stream, timestamps='datetime'):
+        self.stream = stream
+        self.float_timestamps = _is_float_timestamps(timestamps)
+        data = stream.read(_BLF_FILE_HEADER.size)
+
+        if len(data) != _BLF_FILE_HEADER.size or data[:4] != b'LOGG':
+            raise ValueError('Expected a BLF file header.')
+
+        header = _BLF_FILE_HEADER.unpack(data)
+        year, month, _, day, hour, minute, second, millis = header[14:22]
+
+        try:
+            self.start_time = datetime.datetime(year,
+                                                month,
+                                                day,
+                                                hour,
+                                                minute,
+                                                second,
+                                                1000 * millis)
+        except ValueError:
+            self.start_time = datetime.datetime(1970, 1, 1)
+
+        stream.read(header[1] - _BLF_FILE_HEADER.size)
+
+    def _read_containers(self):
+        """Yields the uncompressed data of the log containers of the file.
+
+        """
+
+        header_size = _BLF_OBJECT_HEADER_BASE.size
+
+        while True:
+            header = self.stream.read(header_size)
+
+            if len(header) < header_size:
+                return
+
+            signature, _, _, size, object_type = (
+                _BLF_OBJECT_HEADER_BASE.unpack(header))
+
+            if signature != b'LOBJ' or size < header_size:
+                raise ValueError('Expected a BLF object header.')
+
+            data = self.stream.read(size - header_size + size % 4)
+
+            if object_type != _BLF_LOG_CONTAINER_TYPE:
+                continue
+
+            if len(data) < _BLF_LOG_CONTAINER.size:
+                raise ValueError('Expected a BLF log container.')
+
+            method, _ = _BLF_LOG_CONTAINER.unpack_from(data)
+            data = data[_BLF_LOG_CONTAINER.size:size - header_size]
+
+            if method == 2:
+                yield zlib.decompress(data)
+            elif method == 0:
+                yield data
+
+    def _parse_container(self, data, rows):
+        """Appends the frames of the objects in given container data to
+        `rows`. Returns the offset of the first object not entirely in
+        the data, which continues in the next container.
+
+        """
+
+        unpack_header = _BLF_OBJECT_HEADER_BASE.unpack_from
+        unpack_can = _BLF_CAN_MESSAGE.unpack_from
+        unpack_can_fd = _BLF_CAN_FD_MESSAGE.unpack_from
+        unpack_can_fd_64 = _BLF_CAN_FD_MESSAGE_64.unpack_from
+        can_fd_64_size = _BLF_CAN_FD_MESSAGE_64.size
+        size = len(data)
+        pos = 0
+
+        while True:
+            # Objects are padded to a multiple of four bytes.
+            start = data.find(b'LOBJ', pos, pos + 8)
+
+            if start == -1:
+                if pos + 8 > size:
+                    return pos
+
+                raise ValueError('Expected a BLF object header.')
+
+            pos = start
+
+            if pos + _BLF_OBJECT_HEADER_BASE.size > size:
+                return pos
+
+            _, header_size, header_version, object_size, object_type = (
+                unpack_header(data, pos))
+
+            if (header_size < _BLF_OBJECT_HEADER_BASE.size
+                or object_size < header_size):
+                raise ValueError('Expected a BLF object header.')
+
+            next_pos = pos + object_size
+
+            if next_pos > size:
+                return pos
+
+            if header_size < _BLF_HEADER_SIZES.get(header_version, 0):
+                raise ValueError('Expected a BLF object header.')
+
+            if object_size - header_size < _BLF_OBJECT_SIZES.get(object_type, 0):
+                raise ValueError('Expected a BLF CAN message object.')
+
+            if header_version == 1:
+                flags, _, _, timestamp = _BLF_OBJECT_HEADER_V1.unpack_from(
+                    data,
+                    pos + 16)
+            elif header_version == 2:
+                flags, _, timestamp = _BLF_OBJECT_HEADER_V2.unpack_from(
+                    data,
+                    pos + 16)
+            else:
+                pos = next_pos
+                continue
+
+            # Timestamps are in units of 10 us or 1 ns.
+            if flags == 1:
+                timestamp *= 10000
+
+            pos += header_size
+
+            if object_type in _BLF_CAN_MESSAGE_TYPES:
+                channel, flags, dlc, frame_id, frame_data = unpack_can(data, pos)
+
+                if not flags & _BLF_REMOTE_FLAG:
+                    rows.append((channel,
+                                 frame_id & 0x1fffffff,
+                                 frame_data[:min(dlc, 8)],
+                                 timestamp))
+            elif object_type == _BLF_CAN_FD_MESSAGE_TYPE:
+                (channel,
+                 flags,
+                 _,
+                 frame_id,
+                 _,
+                 _,
+                 _,
+                 valid_bytes,
+                 frame_data) = unpack_can_fd(data, pos)
+
+                if not flags & _BLF_REMOTE_FLAG:
+                    rows.append((channel,
+                                 frame_id & 0x1fffffff,
+                                 frame_data[:valid_bytes],
+                                 timestamp))
+            elif object_type == _BLF_CAN_FD_MESSAGE_64_TYPE:
+                fields = unpack_can_fd_64(data, pos)
+                valid_bytes = fields[2]
+                ext_data_offset = fields[13]
+
+                if not fields[6] & _BLF_CAN_FD_64_REMOTE_FLAG:
+                    # Data missing in the object reads as zeros.
+                    data_size = min(
+                        valid_bytes,
+                        ((ext_data_offset or object_size)
+                         - header_size
+                         - can_fd_64_size))
+                    data_start = pos + can_fd_64_size
+                    frame_data = data[data_start:data_start + data_size]
+                    rows.append((fields[0],
+                                 fields[4] & 0x1fffffff,
+                                 frame_data.ljust(valid_bytes, b'\x00'),
+                                 timestamp))
+
+            pos = next_pos
+
+    def __iter__(self):
+        if self.float_timestamps:
+            start = self.start_time.timestamp()
+        else:
+            start = self.start_time
+
+        timedelta = datetime.timedelta
+        channels = {}
+        tail = b''
+
+        for data in self._read_containers():
+            if tail:
+                data = tail + data
+
+            rows = []
+            tail = data[self._parse_container(data, rows):]
+
+            for channel, frame_id, frame_data, nanoseconds in rows:
+                try:
+                    channel_name = channels[channel]
+                except KeyError:
+                    channel_name = str(channel)
+                    channels[channel] = channel_name
+
+                if self.float_timestamps:
+                    timestamp = start + nanoseconds / 1e9
+                else:
+                    timestamp = start + timedelta(microseconds=nanoseconds / 1000)
+
+                yield DataFrame(channel_name,
+                                frame_id,
+                                frame_data,
+                                timestamp,
+                                TimestampFormat.ABSOLUTE)
+
+
+class DatabaseFrameIds:
+    """The frame ids of the messages in given database, as found by
+    :meth:`~cantools.database.can.Database.get_message_by_frame_id()`,
+    for membership tests with ``in``. If `signals` is given, only the
+    frame ids of messages with any of these signal names are members.
+    The result of each lookup is cached.
+
+    """
+
+    def __init__(self, database, signals=None):
+        self._database = database
+        self._signals = None if signals is None else frozenset(signals)
+        self._known = {}
+
+    def __contains__(self, frame_id):
+        try:
+            return self._known[frame_id]
+        except KeyError:
+            pass
+
+        try:
+            message = self._database.get_message_by_frame_id(frame_id)
+        except KeyError:
+            known = False
+        else:
+            known = (self._signals is None
+                     or any(signal.name in self._signals
+                            for signal in message.signals))
+
+        self._known[frame_id] = known
+
+        return known
+
+
+def _frame_ids(frame_ids):
+    if frame_ids is None or isinstance(frame_ids, (frozenset, DatabaseFrameIds)):
+        return frame_ids
+    elif hasattr(frame_ids, 'get_message_by_frame_id'):
+        return DatabaseFrameIds(frame_ids)
+    else:
+        return frozenset(frame_ids)
+
+
+def _is_float_timestamps(timestamps):
+    if timestamps not in ['datetime', 'float']:
+        raise ValueError(
+            f"Expected timestamps 'datetime' or 'float', but got "
+            f"'{timestamps}'.")
+
+    return timestamps == 'float'
+
+
+def _parse_chunk(filename, pattern, start, end, float_timestamps):
+    """Parse the lines between given byte offsets of given file in a
+    worker process. Returns the frames as tuples of the DataFrame
+    constructor arguments, which are much cheaper to pass back to the
+    parent process than DataFrame objects.
+
+    """
+
+    with open(filename, 'rb') as fin:
+        fin.seek(start)
+        lines = fin.read(end - start).decode('utf-8', 'replace').split('\n')
+
+    match = pattern.match
+    frames = []
+
+    for line in lines:
+        if not line:
+            continue
+
+        frame = match(line.strip('\r'), float_timestamps)
+
+        if frame is not None:
+            frames.append((frame.channel,
+                           frame.frame_id,
+                           frame.data,
+                           frame.timestamp,
+                           frame.timestamp_format))
+
+    return frames
+
+
+def _iter_chunks(mm, chunk_size):
+    start = 0
+    size = len(mm)
+
+    while start < size:
+        end = mm.find(b'\n', start + chunk_size - 1)
+        end = size if end == -1 else end + 1
+
+        yield start, end
+
+        start = end
+
+
+def parse_file(filename,
+               processes=None,
+               chunk_size=CHUNK_SIZE,
+               timestamps='datetime'):
+    """Returns a generator that yields the DataFrames of given log file in
+    order, parsed in parallel by `processes` worker processes, which
+    defaults to the number of CPUs.
+
+    The file is memory mapped and split into chunks of about
+    `chunk_size` bytes at line boundaries. The format of the log file
+    is detected once, from the first line that matches any
+    pattern. Non-parseable log entries are discarded. `timestamps` is
+    the same as for :class:`Parser`.
+
+    >>> for frame in cantools.logreader.parse_file('candump.log'): #doctest: +SKIP
+            print(f'{frame.timestamp}: {frame.frame_id}')
+    """
+
+    float_timestamps = _is_float_timestamps(timestamps)
+
+    with open(filename, 'rb') as fin:
+        if os.fstat(fin.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pattern = None
+
+            for line in iter(mm.readline, b''):
+                pattern = Parser.detect_pattern(
+                    line.decode('utf-8', 'replace').strip('\r\n'))
+
+                if pattern is not None:
+                    break
+            else:
+                return
+
+            chunks = list(_iter_chunks(mm, chunk_size))
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes == 1 or len(chunks) == 1:
+        for start, end in chunks:
+            for row in _parse_chunk(filename,
+                                    pattern,
+                                    start,
+                                    end,
+                                    float_timestamps):
+                yield DataFrame(*row)
+
+        return
+
+    with ProcessPoolExecutor(processes) as executor:
+        # Only keep a few chunks per process in flight to bound the
+        # memory usage if the frames are consumed slowly.
+        max_pending = 2 * processes
+        pending = collections.deque()
+
+        try:
+            for start, end in chunks:
+                pending.append(executor.submit(_parse_chunk,
+                                               filename,
+                                               pattern,
+                                               start,
+                                               end,
+                                               float_timestamps))
+
+                if len(pending) >= max_pending:
+                    for row in pending.popleft().result():
+                        yield DataFrame(*row)
+
+            while pending:
+                for row in pending.popleft().result():
+                    yield DataFrame(*row)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class _ThreadedReader(io.RawIOBase):
+    """Reads blocks from given stream in a thread, overlapping for
+    example decompression with the processing of the previous blocks.
+
+    """
+
+    def __init__(self, stream, block_size, blocks=4):
+        super().__init__()
+        self._stream = stream
+        self._block_size = block_size
+        self._blocks = queue.Queue(blocks)
+        self._block = memoryview(b'')
+        self._eof = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read_blocks,
+                                        daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._blocks.put(item, timeout=0.1)
+
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def _read_blocks(self):
+        try:
+            while True:
+                block = self._stream.read(self._block_size)
+
+                if not self._put(block) or not block:
+                    break
+        except Exception as e:
+            self._put(e)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._block:
+            if self._eof:
+                return 0
+
+            block = self._blocks.get()
+
+            if isinstance(block, Exception):
+                self._eof = True
+
+                raise block
+
+            if not block:
+                self._eof = True
+
+                return 0
+
+            self._block = memoryview(block)
+
+        size = min(len(buffer), len(self._block))
+        buffer[:size] = self._block[:size]
+        self._block = self._block[size:]
+
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._stream.close()
+
+        super().close()
+
+
+def open_log(filename,
+             mode='r',
+             threaded=False,
+             block_size=BLOCK_SIZE):
+    """Open given log file for reading, in text mode if `mode` is ``'r'``,
+    or in binary mode if ``'rb'``. The returned stream can be given to
+    :class:`Parser`.
+
+    gzip, xz and bzip2 compressed files are decompressed transparently,
+    reading `block_size` bytes at a time. If `threaded` is ``True``, the
+    decompression runs in a separate thread, overlapped with the
+    parsing of previously decompressed blocks.
+
+    >>> with cantools.logreader.open_log('candump.log.gz') as fd: #doctest: +SKIP
+            for frame in cantools.logreader.Parser(fd):
+                print(f'{frame.timestamp}: {frame.frame_id}')
+    """
+
+    if mode not in ['r', 'rb']:
+        raise ValueError(f"Expected mode 'r' or 'rb', but got '{mode}'.")
+
+    with open(filename, 'rb') as fin:
+        magic = fin.read(6)
+
+    for prefix, decompressor in _DECOMPRESSORS:
+        if magic.startswith(prefix):
+            stream = io.BufferedReader(decompressor(filename, 'rb'), block_size)
+            break
+    else:
+        stream = open(filename, 'rb', buffering=block_size)
+
+    if threaded:
+        stream = io.BufferedReader(_ThreadedReader(stream, block_size),
+                                   block_size)
+
+    if mode == 'r':
+        stream = io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+
+    return stream
+
+
+class _RangesReader(io.RawIOBase):
+    """Reads given byte ranges of given seekable stream, as if they were
+    one contiguous stream.
+
+    """
+
+    def __init__(self, stream, ranges):
+        super().__init__()
+        self._stream = stream
+        self._ranges = iter(ranges)
+        self._remaining = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self._remaining == 0:
+            try:
+                start, end = next(self._ranges)
+            except StopIteration:
+                return 0
+
+            self._stream.seek(start)
+            self._remaining = end - start
+
+        size = self._stream.readinto(
+            memoryview(buffer)[:min(len(buffer), self._remaining)])
+        self._remaining -= size
+
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stream.close()
+
+        super().close()
+
+
+def _timestamp_seconds(timestamp):
+    if isinstance(timestamp, datetime.datetime):
+        return timestamp.timestamp()
+    elif isinstance(timestamp, datetime.timedelta):
+        return timestamp.total_seconds()
+    else:
+        return timestamp
+
+
+class LogIndex:
+    """The index of a log file, as written by :func:`build_index` and read
+    by :func:`load_index`.
+
+    The log file is divided into blocks of a fixed number of
+    frames. For each block the index holds its byte offset, its
+    minimum and maximum timestamp and the set of frame ids in it, which
+    lets a reader skip all blocks outside a time range or without
+    wanted frames. Timestamps are float seconds, as parsed by
+    :class:`Parser` with ``timestamps='float'``.
+
+    """
+
+    def __init__(self,
+                 filename,
+                 size,
+                 mtime_ns,
+                 block_frames,
+                 first_timestamp,
+                 frame_ids,
+                 blocks):
+        self.filename = filename
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.block_frames = block_frames
+
+        #: Timestamp of the first frame in the log, or ``None`` if
+        #: the log has no timestamps.
+        self.first_timestamp = first_timestamp
+
+        #: All frame ids in the log, in order of first occurrence.
+        self.frame_ids = frame_ids
+
+        # (offset, minimum timestamp, maximum timestamp, frame ids
+        # mask) tuples, where bit n of the mask is set if the block
+        # contains frame_ids[n].
+        self.blocks = blocks
+
+    def select(self, start=None, stop=None, frame_ids=None):
+        """Returns a list of (start, end) byte ranges of the blocks that may
+        contain frames with timestamps from `start` to `stop` seconds and
+        any of given frame ids. `frame_ids` is the same as for
+        :class:`Parser`. Adjacent blocks are merged.
+
+        """
+
+        frame_ids = _frame_ids(frame_ids)
+
+        if frame_ids is None:
+            mask = -1
+        else:
+            mask = 0
+
+            for i, frame_id in enumerate(self.frame_ids):
+                if frame_id in frame_ids:
+                    mask |= 1 << i
+
+        ranges = []
+        ends = [block[0] for block in self.blocks[1:]] + [self.size]
+
+        for (offset, minimum, maximum, block_mask), end in zip(self.blocks, ends):
+            if not block_mask & mask:
+                continue
+
+            if minimum is not None:
+                if start is not None and maximum < start:
+                    continue
+
+                if stop is not None and minimum > stop:
+                    continue
+
+            if ranges and ranges[-1][1] == offset:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((offset, end))
+
+        return ranges
+
+    def open(self,
+             start=None,
+             stop=None,
+             frame_ids=None,
+             mode='r',
+             block_size=BLOCK_SIZE):
+        """Open the log file for reading the lines of the blocks selected by
+        :meth:`select()`. The blocks may contain other lines and frames
+        as well, which must be filtered by the caller. `mode` and
+        `block_size` are the same as for :func:`open_log`.
+
+        """
+
+        if mode not in ['r', 'rb']:
+            raise ValueError(f"Expected mode 'r' or 'rb', but got '{mode}'.")
+
+        stream = io.BufferedReader(
+            _RangesReader(open(self.filename, 'rb', buffering=0),
+                          self.select(start, stop, frame_ids)),
+            block_size)
+
+        if mode == 'r':
+            stream = io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+
+        return stream
+
+    def frames(self, start=None, stop=None, frame_ids=None, timestamps='datetime'):
+        """Returns a generator that yields the DataFrames with timestamps from
+        `start` to `stop` seconds and any of given frame ids, reading
+        only the blocks that may contain them. Frames without
+        timestamps are only filtered by frame id. `frame_ids` and
+        `timestamps` are the same as for :class:`Parser`.
+
+        >>> index = cantools.logreader.load_index('candump.log') #doctest: +SKIP
+        >>> for frame in index.frames(1600000030, 1600000060, {0x123}): #doctest: +SKIP
+                print(f'{frame.timestamp}: {frame.frame_id}')
+        """
+
+        frame_ids = _frame_ids(frame_ids)
+
+        with self.open(start, stop, frame_ids, mode='rb') as stream:
+            for frame in Parser(stream, timestamps, frame_ids):
+                if frame.timestamp is not None:
+                    seconds = _timestamp_seconds(frame.timestamp)
+
+                    if start is not None and seconds < start:
+                        continue
+
+                    if stop is not None and seconds > stop:
+                        continue
+
+                yield frame
+
+
+def _index_filename(filename):
+    return os.fspath(filename) + INDEX_SUFFIX
+
+
+def build_index(filename, block_frames=INDEX_BLOCK_FRAMES):
+    """Index given log file in a single pass and write the index next to
+    it, in a file with :data:`INDEX_SUFFIX` appended to the log file
+    name. Each block of the index holds `block_frames`
+    frames. Returns the :class:`LogIndex`.
+
+    Compressed log files cannot be indexed, as they cannot be read
+    from an arbitrary offset.
+
+    """
+
+    if block_frames < 1:
+        raise ValueError(
+            f'Expected at least one frame per block, but got {block_frames}.')
+
+    parser = Parser(timestamps='float')
+    bits = {}
+    blocks = []
+    first_timestamp = None
+    offset = 0
+    frames = 0
+
+    with open(filename, 'rb') as fin:
+        magic = fin.read(6)
+
+        if any(magic.startswith(prefix) for prefix, _ in _DECOMPRESSORS):
+            raise ValueError('Compressed log files cannot be indexed.')
+
+        fin.seek(0)
+        stat = os.fstat(fin.fileno())
+
+        for line in fin:
+            frame = parser.parse(line.rstrip(b'\r\n'))
+
+            if frame is not None:
+                if frames % block_frames == 0:
+                    # Lines before the first frame belong to the first
+                    # block.
+                    blocks.append([offset if blocks else 0, None, None, 0])
+
+                block = blocks[-1]
+                timestamp = frame.timestamp
+
+                if timestamp is not None:
+                    if first_timestamp is None:
+                        first_timestamp = timestamp
+
+                    if block[1] is None or timestamp < block[1]:
+                        block[1] = timestamp
+
+                    if block[2] is None or timestamp > block[2]:
+                        block[2] = timestamp
+
+                try:
+                    bit = bits[frame.frame_id]
+                except KeyError:
+                    bit = 1 << len(bits)
+                    bits[frame.frame_id] = bit
+
+                block[3] |= bit
+                frames += 1
+
+            offset += len(line)
+
+    index = LogIndex(os.fspath(filename),
+                     stat.st_size,
+                     stat.st_mtime_ns,
+                     block_frames,
+                     first_timestamp,
+                     list(bits),
+                     [tuple(block) for block in blocks])
+
+    with open(_index_filename(filename), 'w') as fout:
+        json.dump({
+            'version': _INDEX_VERSION,
+            'size': index.size,
+            'mtime_ns': index.mtime_ns,
+            'block_frames': block_frames,
+            'first_timestamp': first_timestamp,
+            'frame_ids': index.frame_ids,
+            'blocks': [[offset, minimum, maximum, f'{mask:x}']
+                       for offset, minimum, maximum, mask in index.blocks]
+        }, fout)
+
+    return index
+
+
+def load_index(filename):
+    """Returns the :class:`LogIndex` of given log file, or ``None`` if it
+    has no index, or if the log file was modified after it was
+    indexed.
+
+    """
+
+    try:
+        with open(_index_filename(filename)) as fin:
+            data = json.load(fin)
+
+        stat = os.stat(filename)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get('version') != _INDEX_VERSION:
+        return None
+
+    # A malformed index is treated as missing.
+    try:
+        if ((data['size'], data['mtime_ns'])
+            != (stat.st_size, stat.st_mtime_ns)):
+            return None
+
+        return LogIndex(os.fspath(filename),
+                        data['size'],
+                        data['mtime_ns'],
+                        data['block_frames'],
+                        data['first_timestamp'],
+                        data['frame_ids'],
+                        [(offset, minimum, maximum, int(mask, 16))
+                         for offset, minimum, maximum, mask in data['blocks']])
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -1,9 +1,13 @@
+import contextlib
+import io
 import re
+import sys
 from collections.abc import Iterable, Sequence
 from typing import Union
 
 from cantools.database.errors import DecodeError
 
+from .. import logreader
 from ..database.can.database import Database
 from ..database.can.message import Message
 from ..database.namedsignalvalue import NamedSignalValue
@@ -14,6 +18,9 @@ from ..typechecking import (
     TAdditionalCliArgs,
 )
 
+RE_ASC_SUFFIX = re.compile(r'\.asc(\.(gz|xz|bz2))?$', re.IGNORECASE)
+RE_BLF_SUFFIX = re.compile(r'\.blf(\.(gz|xz|bz2))?$', re.IGNORECASE)
+
 MULTI_LINE_FMT = '''
 {message}(
 {signals}
@@ -248,3 +255,87 @@ def parse_additional_config(unknown_args: Sequence[str]) -> TAdditionalCliArgs:
     for key, string_val in map(_split_arg, unknown_args):
         args[key] = cast_from_string(string_val)
     return args
+
+
+class _FrameLinesReader(io.TextIOBase):
+    """The frames of given Vector ASC or BLF log reader as a text stream
+    of candump log lines.
+
+    """
+
+    def __init__(self, stream, reader):
+        self._stream = stream
+        self._lines = (
+            f'({frame.timestamp:.6f}) {frame.channel} '
+            f'{frame.frame_id:0{8 if frame.frame_id > 0x7ff else 3}X}#'
+            f'{frame.data.hex().upper()}\n'
+            for frame in reader
+        )
+
+    def readable(self):
+        return True
+
+    def readline(self, size=-1):
+        return next(self._lines, '')
+
+    def close(self):
+        if not self.closed:
+            self._stream.close()
+
+        super().close()
+
+
+def _open_vector_log(filename):
+    """Open given Vector log file as a text stream of candump log lines,
+    or return ``None`` if it is not a Vector log file. BLF files are
+    detected by their magic or suffix, and ASC files by their suffix.
+
+    """
+
+    with open(filename, 'rb') as fin:
+        magic = fin.read(4)
+
+    if magic == b'LOGG' or re.search(RE_BLF_SUFFIX, filename):
+        stream = logreader.open_log(filename, 'rb', threaded=True)
+        reader_class = logreader.BlfReader
+    elif re.search(RE_ASC_SUFFIX, filename):
+        stream = logreader.open_log(filename, threaded=True)
+        reader_class = logreader.AscReader
+    else:
+        return None
+
+    try:
+        reader = reader_class(stream, timestamps='float')
+    except BaseException:
+        stream.close()
+        raise
+
+    return _FrameLinesReader(stream, reader)
+
+
+def open_input(filename, start=None, stop=None, frame_ids=None):
+    """Open given log file, or standard input if ``None``. Compressed
+    files are decompressed in a separate thread. Vector ASC and BLF log
+    files are read as candump log lines.
+
+    If the log file has an index, only the blocks that may contain
+    frames from `start` to `stop` seconds with any of given frame ids
+    are read.
+
+    """
+
+    if filename is None:
+        return contextlib.nullcontext(sys.stdin)
+
+    stream = _open_vector_log(filename)
+
+    if stream is not None:
+        return stream
+
+    if start is not None or stop is not None or frame_ids is not None:
+        index = logreader.load_index(filename)
+
+        if index is not None:
+            return index.open(start, stop, frame_ids)
+
+    return logreader.open_log(filename, threaded=True)
@@ -0,0 +1,75 @@
+import argparse
+import os
+
+from ..database import cache
+from ..database.errors import Error
+
+
+def _cache_dir(args):
+    cache_dir = args.cache_dir or os.getenv('CANTOOLS_CACHE_DIR')
+
+    if not cache_dir:
+        raise Error(
+            'No cache directory given. Use --cache-dir or the environment '
+            'variable CANTOOLS_CACHE_DIR.')
+
+    return cache_dir
+
+
+def _do_stats(args):
+    stats = cache.get_stats(_cache_dir(args))
+
+    print(f'Databases:  {stats.databases}')
+    print(f'Size:       {stats.size} bytes')
+    print(f'Size limit: {stats.size_limit} bytes')
+    print(f'Hits:       {stats.hits}')
+    print(f'Misses:     {stats.misses}')
+    print(f'Hit rate:   {100 * stats.hit_rate:.1f}%')
+    print(f'Load time:  {stats.load_time:.3f} s')
+
+
+def _do_prune(args):
+    count = cache.prune(_cache_dir(args), args.size_limit)
+
+    print(f'Evicted {count} database(s).')
+
+
+def _do_clear(args):
+    count = cache.clear(_cache_dir(args))
+
+    print(f'Removed {count} database(s).')
+
+
+def add_subparser(subparsers):
+    cache_parser = subparsers.add_parser(
+        'cache',
+        description='Inspect and maintain the database cache.',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    cache_parser.add_argument(
+        '--cache-dir',
+        help=('Cache directory. Defaults to the environment variable '
+              'CANTOOLS_CACHE_DIR.'))
+
+    cache_subparsers = cache_parser.add_subparsers(title='commands',
+                                                   dest='command')
+    cache_subparsers.required = True
+
+    stats_parser = cache_subparsers.add_parser(
+        'stats',
+        description='Print cache size and hit/miss statistics.')
+    stats_parser.set_defaults(func=_do_stats)
+
+    prune_parser = cache_subparsers.add_parser(
+        'prune',
+        description=('Evict the least recently used databases until the '
+                     'cache is within its size limit.'))
+    prune_parser.add_argument(
+        '--size-limit',
+        type=int,
+        help='New size limit of the cache in bytes.')
+    prune_parser.set_defaults(func=_do_prune)
+
+    clear_parser = cache_subparsers.add_parser(
+        'clear',
+        description='Remove all databases and statistics from the cache.')
+    clear_parser.set_defaults(func=_do_clear)
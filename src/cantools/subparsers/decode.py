@@ -1,14 +1,197 @@
 import argparse
+import csv
+import io
+import json
 import logging
+import math
 import sys
 
 from argparse_addons import Integer
 
 from .. import database, logreader
-from .__utils__ import format_message_by_frame_id
+from ..database.errors import DecodeError, Error
+from ..database.namedsignalvalue import NamedSignalValue
+from .__utils__ import format_message_by_frame_id, open_input
 
 logging.basicConfig(level=logging.WARNING)
 
+#: Number of rows written to standard output at once in the jsonl, csv
+#: and tsv formats.
+OUTPUT_BATCH_SIZE = 1000
+
+ROW_COLUMNS = ['timestamp', 'channel', 'frame_id', 'message']
+
+
+def _signal_columns(dbase, signals):
+    names = {}
+
+    for message in dbase.messages:
+        for signal in message.signals:
+            names[signal.name] = None
+
+    if signals is None:
+        return list(names)
+
+    for name in signals:
+        if name not in names:
+            raise Error(f"Signal '{name}' not found in the database.")
+
+    return signals
+
+
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def _json_number(value):
+    if math.isfinite(value):
+        return repr(value)
+
+    return _JSON_ENCODER.encode(value)
+
+
+def _json_choice(value):
+    if isinstance(value, NamedSignalValue):
+        return _JSON_ENCODER.encode(str(value))
+
+    return _json_number(value)
+
+
+def _compile_row_formatter(message, columns, output_format):
+    """Returns a function that formats a frame of given message and its
+    decoded signals as a row, or ``None`` if the message has none of
+    given signal columns.
+
+    """
+
+    names = {signal.name for signal in message.signals}
+    layout = [column if column in names else None for column in columns]
+    selected = [column for column in layout if column is not None]
+
+    if not selected:
+        return None
+
+    if output_format == 'jsonl':
+        encode = _JSON_ENCODER.encode
+        template = ('{"timestamp": %s, "channel": %s, "frame_id": %d, '
+                    '"message": ' + encode(message.name).replace('%', '%%') +
+                    ', "signals": {%s}}\n')
+        keys = {}
+        converters = {}
+
+        for signal in message.signals:
+            if signal.name in selected:
+                keys[signal.name] = encode(signal.name) + ': '
+                converters[signal.name] = (_json_choice if signal.choices
+                                           else _json_number)
+
+        channels = {}
+
+        def format_row(frame, signals):
+            try:
+                channel = channels[frame.channel]
+            except KeyError:
+                channel = encode(frame.channel)
+                channels[frame.channel] = channel
+
+            timestamp = frame.timestamp
+            values = ', '.join([
+                keys[name] + converters[name](value)
+                for name, value in signals.items()
+                if name in keys
+            ])
+
+            return template % ('null' if timestamp is None else repr(timestamp),
+                               channel,
+                               frame.frame_id,
+                               values)
+    else:
+        name = message.name
+
+        def format_row(frame, signals):
+            get = signals.get
+            row = [
+                '' if frame.timestamp is None else frame.timestamp,
+                frame.channel,
+                frame.frame_id,
+                name
+            ]
+            row += [get(column, '') for column in layout]
+
+            return row
+
+    return format_row
+
+
+def _write_rows(frames, dbase, args):
+    """Decode given frames and write them to standard output as JSON
+    lines or CSV/TSV rows, one batch of rows at a time.
+
+    Frames that are not in the database, container frames and frames
+    that fail to decode are discarded.
+
+    """
+
+    decode_choices = not args.no_decode_choices
+    allow_truncated = args.no_strict
+    allow_excess = args.no_strict
+    columns = _signal_columns(dbase, args.signals)
+    formatters = {}
+    rows = []
+    buffer = io.StringIO()
+
+    if args.format == 'jsonl':
+        def write(rows):
+            sys.stdout.write(''.join(rows))
+    else:
+        delimiter = ',' if args.format == 'csv' else '\t'
+        writer = csv.writer(buffer, delimiter=delimiter, lineterminator='\n')
+        writer.writerow([*ROW_COLUMNS, *columns])
+
+        def write(rows):
+            writer.writerows(rows)
+            sys.stdout.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+
+    for frame in frames:
+        try:
+            message, format_row = formatters[frame.frame_id]
+        except KeyError:
+            try:
+                message = dbase.get_message_by_frame_id(frame.frame_id)
+            except KeyError:
+                message = None
+                format_row = None
+            else:
+                if message.is_container:
+                    format_row = None
+                else:
+                    format_row = _compile_row_formatter(message,
+                                                        columns,
+                                                        args.format)
+
+            formatters[frame.frame_id] = (message, format_row)
+
+        if format_row is None:
+            continue
+
+        try:
+            signals = message.decode_simple(frame.data,
+                                            decode_choices,
+                                            allow_truncated=allow_truncated,
+                                            allow_excess=allow_excess)
+        except DecodeError:
+            continue
+
+        rows.append(format_row(frame, signals))
+
+        if len(rows) == OUTPUT_BATCH_SIZE:
+            write(rows)
+            rows.clear()
+
+    write(rows)
+
+
 def _do_decode(args):
     dbase = database.load_file(args.database,
                                encoding=args.encoding,
@@ -19,27 +202,57 @@ def _do_decode(args):
     decode_containers = not args.no_decode_containers
     allow_truncated = args.no_strict
     allow_excess = args.no_strict
-    parser = logreader.Parser(sys.stdin)
-    for line, frame in parser.iterlines(keep_unknowns=True):
-        if frame is not None:
-            line += ' ::'
-            line += format_message_by_frame_id(dbase,
-                                               frame.frame_id,
-                                               frame.data,
-                                               decode_choices,
-                                               args.single_line,
-                                               decode_containers,
-                                               allow_truncated=allow_truncated,
-                                               allow_excess=allow_excess)
-
-        print(line)
+    select = args.start is not None or args.stop is not None
+    rows = args.format != 'text'
+    if rows:
+        frame_ids = logreader.DatabaseFrameIds(dbase, args.signals)
+    elif args.known_only:
+        frame_ids = dbase
+    else:
+        frame_ids = None
+    with open_input(args.input, args.start, args.stop, frame_ids) as stream:
+        parser = logreader.Parser(stream, timestamps='float', frame_ids=frame_ids)
+        if rows:
+            frames = parser
+            if select:
+                frames = (
+                    frame for frame in parser
+                    if frame.timestamp is not None
+                    and (args.start is None or frame.timestamp >= args.start)
+                    and (args.stop is None or frame.timestamp <= args.stop)
+                )
+            _write_rows(frames, dbase, args)
+            return
+        keep_unknowns = not (select or args.known_only)
+        for line, frame in parser.iterlines(keep_unknowns=keep_unknowns):
+            if select:
+                if frame.timestamp is None:
+                    continue
+                if args.start is not None and frame.timestamp < args.start:
+                    continue
+                if args.stop is not None and frame.timestamp > args.stop:
+                    continue
+
+            if frame is not None:
+                line += ' ::'
+                line += format_message_by_frame_id(dbase,
+                                                   frame.frame_id,
+                                                   frame.data,
+                                                   decode_choices,
+                                                   args.single_line,
+                                                   decode_containers,
+                                                   allow_truncated=allow_truncated,
+                                                   allow_excess=allow_excess)
+
+            print(line)
 
 
 def add_subparser(subparsers):
     decode_parser = subparsers.add_parser(
         'decode',
-        description=('Decode "candump" CAN frames read from standard input '
-                     'and print them in a human readable format.'),
+        description=('Decode "candump" CAN frames read from standard input, '
+                     'or a log file, and print them in a human readable '
+                     'format.'),
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     decode_parser.add_argument(
         '-c', '--no-decode-choices',
@@ -53,6 +266,23 @@ def add_subparser(subparsers):
         '-s', '--single-line',
         action='store_true',
         help='Print the decoded message on a single line.')
+    decode_parser.add_argument(
+        '-f', '--format',
+        choices=('text', 'jsonl', 'csv', 'tsv'),
+        default='text',
+        help=('Output format. text prints each line followed by its decoded '
+              'message. jsonl prints one JSON object per frame, and csv and '
+              'tsv print a header followed by one row per frame, with one '
+              'column per signal. Frames that are not in the database, '
+              'container frames and frames that fail to decode are not '
+              'printed in the jsonl, csv and tsv formats.'))
+    decode_parser.add_argument(
+        '--signals',
+        type=lambda value: value.split(','),
+        help=('Comma separated names of the signals to print in the jsonl, '
+              'csv and tsv formats, in column order. Frames of messages with '
+              'none of these signals are not printed. All signals in the '
+              'database by default.'))
     decode_parser.add_argument(
         '-e', '--encoding',
         help='File encoding.')
@@ -70,6 +300,29 @@ def add_subparser(subparsers):
         help=('Only compare selected frame id bits to find the message in the '
               'database. By default the candump and database frame ids must '
               'be equal for a match.'))
+    decode_parser.add_argument(
+        '-k', '--known-only',
+        action='store_true',
+        help=('Only print frames of messages in the database. Other lines are '
+              'discarded without fully parsing them.'))
+    decode_parser.add_argument(
+        '--input',
+        help=('Log file to read instead of standard input. gzip, xz and '
+              'bzip2 compressed files are decompressed transparently. Vector '
+              'BLF files and ASC files with the .asc suffix are read as '
+              'candump log lines.'))
+    decode_parser.add_argument(
+        '--start',
+        type=float,
+        help=('Only print frames with timestamps from this time in seconds, '
+              'as found in the log. Uses the index of the --input log file, '
+              'if any.'))
+    decode_parser.add_argument(
+        '--stop',
+        type=float,
+        help=('Only print frames with timestamps up to this time in seconds, '
+              'as found in the log. Uses the index of the --input log file, '
+              'if any.'))
     decode_parser.add_argument(
         'database',
         help='Database file.')
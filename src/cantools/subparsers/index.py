@@ -0,0 +1,30 @@
+import argparse
+
+from argparse_addons import Integer
+
+from .. import logreader
+
+
+def _do_index(args):
+    index = logreader.build_index(args.logfile, args.block_frames)
+
+    print(f'Indexed {len(index.blocks)} block(s) with {len(index.frame_ids)} '
+          f'frame id(s) to {args.logfile}{logreader.INDEX_SUFFIX}.')
+
+
+def add_subparser(subparsers):
+    index_parser = subparsers.add_parser(
+        'index',
+        description=('Index given log file for fast access to time ranges and '
+                     'frame ids. "decode" and "plot" use the index '
+                     'automatically when given the log file with --input.'),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    index_parser.add_argument(
+        '-n', '--block-frames',
+        type=Integer(1),
+        default=logreader.INDEX_BLOCK_FRAMES,
+        help='Number of frames per index block.')
+    index_parser.add_argument(
+        'logfile',
+        help='Log file to index.')
+    index_parser.set_defaults(func=_do_index)
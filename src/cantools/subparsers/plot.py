@@ -54,7 +54,6 @@ import binascii
 import datetime
 import re
 import struct
-import sys
 
 from argparse_addons import Integer
 
@@ -63,8 +62,9 @@ try:
 except ImportError:
     plt = None  # type: ignore[assignment,unused-ignore]
 
-from .. import database, errors
+from .. import database, errors, logreader
 from ..database.namedsignalvalue import NamedSignalValue
+from .__utils__ import open_input
 
 PYPLOT_BASE_COLORS = "bgrcmykwC"
 
@@ -143,13 +143,34 @@ class TimestampParser:
             def parse(s, _x0):
                 return int(s)
 
+        self._init_start_stop(parse, x0)
+
+    def _init_start_stop(self, parse, x0):
+        # start and stop are already parsed if taken from an index.
         if self.args.start is not None:
-            self.args.start = parse(self.args.start, x0)
+            if isinstance(self.args.start, str):
+                self.args.start = parse(self.args.start, x0)
             x0 = self.args.start
             self.first_timestamp = x0
-        if self.args.stop is not None:
+        if isinstance(self.args.stop, str):
             self.args.stop = parse(self.args.stop, x0)
 
+    def init_start_stop_from_index(self, first_timestamp):
+        '''
+        Parse start and stop before reading the log, based on the
+        first timestamp in its index.
+        Return value: start and stop in seconds, as in the index.
+        '''
+        if first_timestamp > self.THRESHOLD_ABSOLUTE_SECONDS:
+            self._init_start_stop(self.parse_user_input_absolute_time,
+                                  self.parse_absolute_seconds(first_timestamp))
+        else:
+            self._init_start_stop(self.parse_user_input_relative_time,
+                                  first_timestamp)
+
+        return [x.timestamp() if isinstance(x, datetime.datetime) else x
+                for x in (self.args.start, self.args.stop)]
+
     def parse_user_input_relative_time(self, user_input, first_timestamp):
         try:
             return float(user_input)
@@ -348,47 +369,71 @@ def _do_decode(args):
 
     plotter = Plotter(dbase, args)
 
-    line_number = 1
-    while True:
-        line = sys.stdin.readline()
+    # Frames not in the database are dropped early if they are neither
+    # reported nor shown.
+    known_only = args.ignore_unknown_frames and not args.show_unknown_frames
 
-        # Break at EOF.
-        if not line:
-            break
+    # Only read the blocks of an indexed log file from start to stop
+    # with known frames.
+    index = None
+    if args.input is not None and timestamp_parser.use_timestamp is None \
+       and (args.start is not None or args.stop is not None or known_only):
+        index = logreader.load_index(args.input)
 
-        line = line.strip('\r\n')
-        if not line:
-            continue
+    if index is not None and index.first_timestamp is not None:
+        start, stop = timestamp_parser.init_start_stop_from_index(index.first_timestamp)
+        log = index.open(start, stop, dbase if known_only else None)
+    else:
+        log = open_input(args.input)
 
-        # Auto-detect on first valid line.
-        if re_format is None:
-            mo = RE_CANDUMP.match(line)
+    known_frame_ids = logreader.DatabaseFrameIds(dbase)
 
-            if mo:
-                re_format = RE_CANDUMP
-            else:
-                mo = RE_CANDUMP_LOG.match(line)
+    with log as stream:
+        line_number = 1
+        while True:
+            line = stream.readline()
+
+            # Break at EOF.
+            if not line:
+                break
+
+            line = line.strip('\r\n')
+            if not line:
+                continue
+
+            # Auto-detect on first valid line.
+            if re_format is None:
+                mo = RE_CANDUMP.match(line)
 
                 if mo:
-                    re_format = RE_CANDUMP_LOG
-        else:
-            mo = re_format.match(line)
+                    re_format = RE_CANDUMP
+                else:
+                    mo = RE_CANDUMP_LOG.match(line)
 
-        if mo:
-            timestamp, frame_id, data = _mo_unpack(mo)
-            timestamp = timestamp_parser.parse_timestamp(timestamp, line_number)
-            if args.start is not None and timestamp < args.start:
-                line_number += 1
+                    if mo:
+                        re_format = RE_CANDUMP_LOG
+            else:
+                mo = re_format.match(line)
+
+            if mo:
+                if known_only and timestamp_parser.use_timestamp is not None \
+                   and int(mo.group('frameid'), 16) not in known_frame_ids:
+                    line_number += 1
+                    continue
+                timestamp, frame_id, data = _mo_unpack(mo)
+                timestamp = timestamp_parser.parse_timestamp(timestamp, line_number)
+                if args.start is not None and timestamp < args.start:
+                    line_number += 1
+                    continue
+                elif args.stop is not None and timestamp > args.stop:
+                    break
+                plotter.add_msg(timestamp, frame_id, data)
+            elif RE_DECODE.match(line):
                 continue
-            elif args.stop is not None and timestamp > args.stop:
-                break
-            plotter.add_msg(timestamp, frame_id, data)
-        elif RE_DECODE.match(line):
-            continue
-        else:
-            plotter.failed_to_parse_line(line_number, line)
+            else:
+                plotter.failed_to_parse_line(line_number, line)
 
-        line_number += 1
+            line_number += 1
 
     plotter.plot(timestamp_parser.get_label())
 
@@ -893,11 +938,13 @@ def add_subparser(subparsers):
     plot_parser.add_argument(
         '-ss', '--start',
         help='A start time or line number. Everything before is ignored. '
-             'This filters the lines/messages to be processed. It does *not* set the minimum value of the x-axis.')
+             'This filters the lines/messages to be processed. It does *not* set the minimum value of the x-axis. '
+             'Uses the index of the --input log file, if any.')
     plot_parser.add_argument(
         '-to', '--stop',
         help='An end time or line number. Everything after is ignored. '
-             'This filters the lines/messages to be processed. It does *not* set the maximum value of the x-axis.')
+             'This filters the lines/messages to be processed. It does *not* set the maximum value of the x-axis. '
+             'Uses the index of the --input log file, if any.')
 
     plot_parser.add_argument(
         '--style',
@@ -919,6 +966,13 @@ def add_subparser(subparsers):
         action='store_true',
         help='Skip database consistency checks.')
 
+    plot_parser.add_argument(
+        '--input',
+        help=('Log file to read instead of standard input. gzip, xz and '
+              'bzip2 compressed files are decompressed transparently. Vector '
+              'BLF files and ASC files with the .asc suffix are read as '
+              'candump log lines.'))
+
     plot_parser.add_argument(
         'database',
         help='Database file.')
@@ -0,0 +1,289 @@
+import asyncio
+import datetime
+import os
+import queue
+import statistics
+import threading
+import time
+import unittest
+
+import can
+
+import cantools
+
+DBC_FILE = 'tests/files/dbc/socialledge.dbc'
+
+
+# Benchmarks take long, so they only run if the environment variable
+# CANTOOLS_BENCHMARK is set.
+benchmark = unittest.skipUnless(os.environ.get('CANTOOLS_BENCHMARK'),
+                                'CANTOOLS_BENCHMARK is not set')
+
+
+async def _read(function, data, *args, block_size=7, **kwargs):
+    """Returns the batches yielded by given function reading given data
+    from a stream fed `block_size` bytes at a time.
+
+    """
+
+    stream = asyncio.StreamReader()
+
+    for offset in range(0, len(data), block_size):
+        stream.feed_data(data[offset:offset + block_size])
+
+    stream.feed_eof()
+
+    return [batch async for batch in function(stream, *args, **kwargs)]
+
+
+def _thread_pipeline(lines, loop, output, db):
+    """The thread plus queue baseline. Parses and decodes lines from given
+    queue in a thread and passes the decoded frames one by one to the
+    event loop.
+
+    """
+
+    parser = cantools.logreader.Parser(timestamps='float')
+
+    for line in iter(lines.get, None):
+        frame = parser.parse(line)
+
+        if frame is None:
+            continue
+
+        try:
+            message = db.get_message_by_frame_id(frame.frame_id)
+        except KeyError:
+            continue
+
+        decoded = cantools.aio.DecodedFrame(frame,
+                                            message,
+                                            message.decode(frame.data))
+        loop.call_soon_threadsafe(output.put_nowait, decoded)
+
+    loop.call_soon_threadsafe(output.put_nowait, None)
+
+
+class CanToolsAioTest(unittest.TestCase):
+
+    def test_read_frames_stream(self):
+        log = (b'(1.000000) vcan0 1F4#01020304\n'
+               b'invalid\r\n'
+               b'(2.000000) vcan0 1F3#010203\n'
+               b'(3.000000) vcan0 1F4#01020304')
+
+        batches = asyncio.run(_read(cantools.aio.read_frames,
+                                    log,
+                                    timestamps='float'))
+        frames = [frame for batch in batches for frame in batch]
+
+        self.assertGreater(len(batches), 1)
+        self.assertEqual([(frame.channel,
+                           frame.frame_id,
+                           frame.data,
+                           frame.timestamp) for frame in frames],
+                         [
+                             ('vcan0', 0x1f4, b'\x01\x02\x03\x04', 1.0),
+                             ('vcan0', 0x1f3, b'\x01\x02\x03', 2.0),
+                             ('vcan0', 0x1f4, b'\x01\x02\x03\x04', 3.0)
+                         ])
+
+        # Only wanted frame ids, all lines in a single batch.
+        batches = asyncio.run(_read(cantools.aio.read_frames,
+                                    log,
+                                    block_size=len(log),
+                                    frame_ids={0x1f3}))
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([frame.frame_id for frame in batches[0]], [0x1f3])
+        self.assertEqual(batches[0][0].timestamp,
+                         datetime.datetime(1970, 1, 1, 0, 0, 2,
+                                           tzinfo=datetime.timezone.utc))
+
+    def test_read_frames_bus(self):
+        async def read():
+            reader = can.AsyncBufferedReader()
+
+            for i in range(5):
+                reader.on_message_received(
+                    can.Message(timestamp=float(i),
+                                arbitration_id=i,
+                                data=bytes([i]),
+                                channel='vcan0',
+                                is_remote_frame=(i == 3)))
+
+            batches = cantools.aio.read_frames(reader,
+                                               timestamps='float',
+                                               batch_size=3)
+            first = await batches.__anext__()
+            second = await batches.__anext__()
+
+            # No more messages.
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(batches.__anext__(), 0.01)
+
+            return first, second
+
+        first, second = asyncio.run(read())
+
+        self.assertEqual([(frame.channel,
+                           frame.frame_id,
+                           frame.data,
+                           frame.timestamp) for frame in first],
+                         [
+                             ('vcan0', 0, b'\x00', 0.0),
+                             ('vcan0', 1, b'\x01', 1.0),
+                             ('vcan0', 2, b'\x02', 2.0)
+                         ])
+        self.assertEqual([frame.frame_id for frame in second], [4])
+
+    def test_decode_frames(self):
+        db = cantools.database.load_file(DBC_FILE)
+        log = (b'(1.000000) vcan0 1F4#01020304\n'
+               b'(2.000000) vcan0 1F3#010203\n'
+               b'(3.000000) vcan0 1F4#0102\n')
+
+        batches = asyncio.run(_read(cantools.aio.decode_frames,
+                                    log,
+                                    db,
+                                    decode_choices=False))
+        decoded = [frame for batch in batches for frame in batch]
+
+        self.assertEqual(len(decoded), 1)
+        frame, message, signals = decoded[0]
+        self.assertEqual(frame.frame_id, 0x1f4)
+        self.assertEqual(message.name, 'IO_DEBUG')
+        self.assertEqual(signals,
+                         {
+                             'IO_DEBUG_test_unsigned': 1,
+                             'IO_DEBUG_test_enum': 2,
+                             'IO_DEBUG_test_signed': 3,
+                             'IO_DEBUG_test_float': 2.0
+                         })
+
+    @benchmark
+    def test_performance_decode_frames(self):
+        """Test the throughput and latency of decode_frames(), compared to
+        parsing and decoding in a thread passing the decoded frames to
+        the event loop through a queue.
+
+        """
+
+        db = cantools.database.load_file(DBC_FILE)
+        frames = 100000
+        log = b''.join(f'({i / 1000:.6f}) vcan0 1F4#0102030{i % 10}\n'.encode()
+                       for i in range(frames))
+        lines = log.decode().splitlines()
+
+        async def aio_throughput():
+            stream = asyncio.StreamReader()
+            count = 0
+
+            async def produce():
+                for offset in range(0, len(log), 4096):
+                    stream.feed_data(log[offset:offset + 4096])
+                    await asyncio.sleep(0)
+
+                stream.feed_eof()
+
+            producer = asyncio.create_task(produce())
+
+            async for batch in cantools.aio.decode_frames(stream,
+                                                          db,
+                                                          timestamps='float'):
+                count += len(batch)
+
+            await producer
+
+            return count
+
+        async def thread_throughput():
+            loop = asyncio.get_running_loop()
+            source = queue.Queue()
+            output = asyncio.Queue()
+            thread = threading.Thread(target=_thread_pipeline,
+                                      args=(source, loop, output, db))
+            thread.start()
+
+            for line in lines:
+                source.put(line)
+
+            source.put(None)
+            count = 0
+
+            while await output.get() is not None:
+                count += 1
+
+            thread.join()
+
+            return count
+
+        async def aio_latency(count):
+            stream = asyncio.StreamReader()
+            latencies = []
+            sent = []
+
+            async def produce():
+                for line in lines[:count]:
+                    sent.append(time.perf_counter())
+                    stream.feed_data(line.encode() + b'\n')
+                    await asyncio.sleep(0.001)
+
+                stream.feed_eof()
+
+            producer = asyncio.create_task(produce())
+
+            async for batch in cantools.aio.decode_frames(stream, db):
+                now = time.perf_counter()
+                latencies += [now - sent[len(latencies)] for _ in batch]
+
+            await producer
+
+            return latencies
+
+        async def thread_latency(count):
+            loop = asyncio.get_running_loop()
+            source = queue.Queue()
+            output = asyncio.Queue()
+            thread = threading.Thread(target=_thread_pipeline,
+                                      args=(source, loop, output, db))
+            thread.start()
+            latencies = []
+            sent = []
+
+            async def produce():
+                for line in lines[:count]:
+                    sent.append(time.perf_counter())
+                    source.put(line)
+                    await asyncio.sleep(0.001)
+
+                source.put(None)
+
+            producer = asyncio.create_task(produce())
+
+            while await output.get() is not None:
+                latencies.append(time.perf_counter() - sent[len(latencies)])
+
+            await producer
+            thread.join()
+
+            return latencies
+
+        print()
+
+        for name, throughput, latency in [
+                ('decode_frames()', aio_throughput, aio_latency),
+                ('Thread and queue', thread_throughput, thread_latency)
+        ]:
+            start = time.perf_counter()
+            self.assertEqual(asyncio.run(throughput()), frames)
+            elapsed = time.perf_counter() - start
+            latencies = asyncio.run(latency(500))
+            self.assertEqual(len(latencies), 500)
+            print(f'{name}: {frames / elapsed:.0f} frames/s, '
+                  f'latency median {1e6 * statistics.median(latencies):.0f} us, '
+                  f'max {1e6 * max(latencies):.0f} us')
+
+
+if __name__ == '__main__':
+    unittest.main()
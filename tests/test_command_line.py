@@ -1,14 +1,22 @@
+import bz2
+import datetime
 import functools
+import gzip
+import lzma
 import os
 import re
+import subprocess
 import sys
 import tempfile
+import time
 import types
 import unittest
 import warnings
 from pathlib import Path
 from unittest.mock import patch
 
+import can
+
 try:
     from StringIO import StringIO
 except ImportError:
@@ -16,6 +24,13 @@ except ImportError:
 
 import cantools
 import cantools.database
+from cantools.subparsers.decode import ROW_COLUMNS
+
+
+# Benchmarks take long, so they only run if the environment variable
+# CANTOOLS_BENCHMARK is set.
+benchmark = unittest.skipUnless(os.environ.get('CANTOOLS_BENCHMARK'),
+                                'CANTOOLS_BENCHMARK is not set')
 
 
 def with_fake_screen_width(screen_width):
@@ -51,6 +66,50 @@ def remove_date_time(string):
     return re.sub(r'.*This.* file was generated.*', '', string)
 
 
+def imported_modules(code):
+    """Returns the modules imported by given Python code and their
+    cumulative import times in microseconds, as reported by ``-X
+    importtime``.
+
+    """
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True,
+                            text=True,
+                            check=True)
+    modules = {}
+
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:'):
+            _, cumulative, name = line.split('|')
+
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+
+    return modules
+
+
+def loaded_modules(argv):
+    """Returns the modules in ``sys.modules`` after running the command
+    line with given arguments. Subparsers are imported with
+    importlib.import_module(), which ``-X importtime`` does not report.
+
+    """
+
+    code = (
+        'import sys, cantools\n'
+        f'sys.argv = {["cantools", *argv]!r}\n'
+        'cantools._main()\n'
+        'print("\\n".join(sys.modules), file=sys.stderr)\n'
+    )
+    result = subprocess.run([sys.executable, '-c', code],
+                            capture_output=True,
+                            text=True,
+                            check=True)
+
+    return set(result.stderr.splitlines())
+
+
 def read_file(filename):
     with open(filename) as fin:
         return remove_date_time(fin.read())
@@ -159,6 +218,335 @@ IO_DEBUG(
                     actual_output = stdout.getvalue()
                     self.assertEqual(actual_output, expected_output)
 
+    def test_decode_input_file(self):
+        input_data = """\
+ (2020-12-19 12:04:56.805087)  vcan0  1F4   [4]  01 02 03 04
+ (2020-12-19 12:04:59.085517)  vcan0  1F3   [3]  01 02 03
+"""
+
+        expected_output = """\
+ (2020-12-19 12:04:56.805087)  vcan0  1F4   [4]  01 02 03 04 ::
+IO_DEBUG(
+    IO_DEBUG_test_unsigned: 1,
+    IO_DEBUG_test_enum: two,
+    IO_DEBUG_test_signed: 3,
+    IO_DEBUG_test_float: 2.0
+)
+ (2020-12-19 12:04:59.085517)  vcan0  1F3   [3]  01 02 03 :: Unknown frame id 499 (0x1f3)
+"""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for suffix, compress in [('', bytes),
+                                     ('.gz', gzip.compress),
+                                     ('.xz', lzma.compress),
+                                     ('.bz2', bz2.compress)]:
+                filename = os.path.join(tmp, 'candump.log' + suffix)
+
+                with open(filename, 'wb') as fout:
+                    fout.write(compress(input_data.encode('ascii')))
+
+                argv = [
+                    'cantools',
+                    'decode',
+                    '--prune',
+                    '--input', filename,
+                    'tests/files/dbc/socialledge.dbc'
+                ]
+
+                stdout = StringIO()
+
+                with patch('sys.stdout', stdout):
+                    with patch('sys.argv', argv):
+                        cantools._main()
+                        actual_output = stdout.getvalue()
+                        self.assertEqual(actual_output, expected_output)
+
+    def test_decode_vector_input_file(self):
+        messages = [
+            can.Message(timestamp=1600000000.5,
+                        arbitration_id=0x1f4,
+                        is_extended_id=False,
+                        data=b'\x01\x02\x03\x04',
+                        channel=0),
+            can.Message(timestamp=1600000001.25,
+                        arbitration_id=0x1f3,
+                        is_extended_id=False,
+                        data=b'\x01\x02\x03',
+                        channel=0)
+        ]
+
+        # python-can writes the BLF start time in UTC, while it is read
+        # as local time.
+        start = datetime.datetime(2020, 9, 13, 12, 26, 40, 500000).timestamp()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for filename, writer_class, expected_output in [
+                    (
+                        'trace.blf',
+                        can.BLFWriter,
+                        """\
+({start:.6f}) 1 1F4#01020304 :: IO_DEBUG(IO_DEBUG_test_unsigned: 1, IO_DEBUG_test_enum: two, IO_DEBUG_test_signed: 3, IO_DEBUG_test_float: 2.0)
+({end:.6f}) 1 1F3#010203 :: Unknown frame id 499 (0x1f3)
+""".format(start=start, end=start + 0.75)
+                    ),
+                    (
+                        'trace.asc',
+                        can.ASCWriter,
+                        """\
+(0.000000) 1 1F4#01020304 :: IO_DEBUG(IO_DEBUG_test_unsigned: 1, IO_DEBUG_test_enum: two, IO_DEBUG_test_signed: 3, IO_DEBUG_test_float: 2.0)
+(0.750000) 1 1F3#010203 :: Unknown frame id 499 (0x1f3)
+"""
+                    )
+            ]:
+                filename = os.path.join(tmp, filename)
+
+                with writer_class(filename) as writer:
+                    for message in messages:
+                        writer.on_message_received(message)
+
+                argv = [
+                    'cantools',
+                    'decode',
+                    '--prune',
+                    '--single-line',
+                    '--input', filename,
+                    'tests/files/dbc/socialledge.dbc'
+                ]
+                stdout = StringIO()
+
+                with patch('sys.stdout', stdout):
+                    with patch('sys.argv', argv):
+                        cantools._main()
+
+                self.assertEqual(stdout.getvalue(), expected_output)
+
+    def test_decode_start_stop_index(self):
+        input_data = """\
+(1.000000) vcan0 1F4#01020304
+(2.000000) vcan0 1F3#010203
+(3.000000) vcan0 1F4#01020304
+(4.000000) vcan0 1F3#010203
+"""
+
+        expected_output = """\
+(2.000000) vcan0 1F3#010203 :: Unknown frame id 499 (0x1f3)
+(3.000000) vcan0 1F4#01020304 :: IO_DEBUG(IO_DEBUG_test_unsigned: 1, IO_DEBUG_test_enum: two, IO_DEBUG_test_signed: 3, IO_DEBUG_test_float: 2.0)
+"""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'candump.log')
+
+            with open(filename, 'w') as fout:
+                fout.write(input_data)
+
+            argv = ['cantools', 'index', '--block-frames', '1', filename]
+            stdout = StringIO()
+
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            self.assertEqual(stdout.getvalue(),
+                             f'Indexed 4 block(s) with 2 frame id(s) to '
+                             f'{filename}.idx.\n')
+
+            # Same output with and without the index.
+            for indexed in [True, False]:
+                if not indexed:
+                    os.remove(filename + '.idx')
+
+                argv = [
+                    'cantools',
+                    'decode',
+                    '--prune',
+                    '--single-line',
+                    '--start', '1.5',
+                    '--stop', '3',
+                    '--input', filename,
+                    'tests/files/dbc/socialledge.dbc'
+                ]
+                stdout = StringIO()
+
+                with patch('sys.stdout', stdout):
+                    with patch('sys.argv', argv):
+                        cantools._main()
+
+                self.assertEqual(stdout.getvalue(), expected_output)
+
+    def test_decode_known_only(self):
+        argv = [
+            'cantools',
+            'decode',
+            '--prune',
+            '--single-line',
+            '--known-only',
+            'tests/files/dbc/socialledge.dbc'
+        ]
+        input_data = """\
+ (2020-12-19 12:04:56.805087)  vcan0  1F4   [4]  01 02 03 04
+ (2020-12-19 12:04:59.085517)  vcan0  1F3   [3]  01 02 03
+ (2020-12-19 12:05:01.125519)  vcan0  1F4   [4]  01 02 03 04
+"""
+
+        expected_output = """\
+ (2020-12-19 12:04:56.805087)  vcan0  1F4   [4]  01 02 03 04 :: IO_DEBUG(IO_DEBUG_test_unsigned: 1, IO_DEBUG_test_enum: two, IO_DEBUG_test_signed: 3, IO_DEBUG_test_float: 2.0)
+ (2020-12-19 12:05:01.125519)  vcan0  1F4   [4]  01 02 03 04 :: IO_DEBUG(IO_DEBUG_test_unsigned: 1, IO_DEBUG_test_enum: two, IO_DEBUG_test_signed: 3, IO_DEBUG_test_float: 2.0)
+"""
+
+        stdin = StringIO(input_data)
+        stdout = StringIO()
+
+        with patch('sys.stdin', stdin):
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+                    self.assertEqual(stdout.getvalue(), expected_output)
+
+    def test_decode_format(self):
+        input_data = """\
+ (2020-12-19 12:04:56.805087)  vcan0  1F4   [4]  01 02 03 04
+ (2020-12-19 12:04:59.085517)  vcan0  1F3   [3]  01 02 03
+ (2020-12-19 12:05:00.000000)  vcan0  064   [8]  F0 01 FF FF FF FF FF FF
+ (2020-12-19 12:05:01.125519)  vcan1  0C8   [8]  F0 00 00 00 00 00 00 00
+"""
+        columns = [
+            'DRIVER_HEARTBEAT_cmd',
+            'IO_DEBUG_test_unsigned',
+            'IO_DEBUG_test_enum',
+            'IO_DEBUG_test_signed',
+            'IO_DEBUG_test_float',
+            'MOTOR_CMD_steer',
+            'MOTOR_CMD_drive',
+            'MOTOR_STATUS_wheel_error',
+            'MOTOR_STATUS_speed_kph',
+            'SENSOR_SONARS_mux',
+            'SENSOR_SONARS_err_count',
+            'SENSOR_SONARS_left',
+            'SENSOR_SONARS_no_filt_left',
+            'SENSOR_SONARS_middle',
+            'SENSOR_SONARS_no_filt_middle',
+            'SENSOR_SONARS_right',
+            'SENSOR_SONARS_no_filt_right',
+            'SENSOR_SONARS_rear',
+            'SENSOR_SONARS_no_filt_rear'
+        ]
+        io_debug = ['', '1', 'two', '3', '2.0'] + 14 * ['']
+        sensor_sonars = (9 * [''] +
+                         ['0', '15', '0.0', '', '0.0', '', '0.0', '', '0.0', ''])
+        datas = [
+            (
+                'jsonl',
+                [],
+                """\
+{"timestamp": 1608379496.805087, "channel": "vcan0", "frame_id": 500, "message": "IO_DEBUG", "signals": {"IO_DEBUG_test_unsigned": 1, "IO_DEBUG_test_enum": "two", "IO_DEBUG_test_signed": 3, "IO_DEBUG_test_float": 2.0}}
+{"timestamp": 1608379501.125519, "channel": "vcan1", "frame_id": 200, "message": "SENSOR_SONARS", "signals": {"SENSOR_SONARS_mux": 0, "SENSOR_SONARS_err_count": 15, "SENSOR_SONARS_left": 0.0, "SENSOR_SONARS_middle": 0.0, "SENSOR_SONARS_right": 0.0, "SENSOR_SONARS_rear": 0.0}}
+"""
+            ),
+            (
+                'jsonl',
+                ['--signals', 'SENSOR_SONARS_left,IO_DEBUG_test_enum'],
+                """\
+{"timestamp": 1608379496.805087, "channel": "vcan0", "frame_id": 500, "message": "IO_DEBUG", "signals": {"IO_DEBUG_test_enum": "two"}}
+{"timestamp": 1608379501.125519, "channel": "vcan1", "frame_id": 200, "message": "SENSOR_SONARS", "signals": {"SENSOR_SONARS_left": 0.0}}
+"""
+            ),
+            (
+                'csv',
+                [],
+                '\n'.join([
+                    ','.join([*ROW_COLUMNS, *columns]),
+                    ','.join(['1608379496.805087', 'vcan0', '500', 'IO_DEBUG',
+                              *io_debug]),
+                    ','.join(['1608379501.125519', 'vcan1', '200', 'SENSOR_SONARS',
+                              *sensor_sonars]),
+                    ''
+                ])
+            ),
+            (
+                'tsv',
+                ['--signals', 'IO_DEBUG_test_enum'],
+                """\
+timestamp\tchannel\tframe_id\tmessage\tIO_DEBUG_test_enum
+1608379496.805087\tvcan0\t500\tIO_DEBUG\ttwo
+"""
+            )
+        ]
+
+        for output_format, options, expected_output in datas:
+            argv = [
+                'cantools',
+                'decode',
+                '--prune',
+                '--format', output_format,
+                *options,
+                'tests/files/dbc/socialledge.dbc'
+            ]
+            stdin = StringIO(input_data)
+            stdout = StringIO()
+
+            with patch('sys.stdin', stdin):
+                with patch('sys.stdout', stdout):
+                    with patch('sys.argv', argv):
+                        cantools._main()
+
+            self.assertEqual(stdout.getvalue(), expected_output)
+
+        # Unknown signal.
+        argv = [
+            'cantools',
+            'decode',
+            '--format', 'csv',
+            '--signals', 'IO_DEBUG_test_enum,Foo',
+            'tests/files/dbc/socialledge.dbc'
+        ]
+
+        with patch('sys.stdin', StringIO(input_data)):
+            with patch('sys.argv', argv):
+                with self.assertRaises(SystemExit) as cm:
+                    cantools._main()
+
+        self.assertEqual(str(cm.exception),
+                         "error: Signal 'Foo' not found in the database.")
+
+    @benchmark
+    def test_performance_decode_format(self):
+        """Test the throughput of cantools decode writing to a pipe in the
+        text, jsonl and csv formats.
+
+        """
+
+        frames = 100000
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'candump.log')
+
+            with open(filename, 'w') as fout:
+                fout.writelines(
+                    f' ({i / 1000:.6f})  vcan0  1F4   [4]  01 02 03 0{i % 10}\n'
+                    for i in range(frames))
+
+            print()
+
+            for options in [
+                    ['--single-line'],
+                    ['--format', 'jsonl'],
+                    ['--format', 'csv'],
+                    ['--format', 'csv', '--signals', 'IO_DEBUG_test_enum']
+            ]:
+                start = time.perf_counter()
+                output = subprocess.run([sys.executable,
+                                         '-m', 'cantools',
+                                         'decode',
+                                         *options,
+                                         '--input', filename,
+                                         'tests/files/dbc/socialledge.dbc'],
+                                        stdout=subprocess.PIPE,
+                                        check=True).stdout
+                elapsed = time.perf_counter() - start
+
+                self.assertGreaterEqual(output.count(b'\n'), frames)
+                print(f'{" ".join(options)}: {frames / elapsed:.0f} frames/s')
+
     def test_decode_timestamp_zero(self):
         argv = [
             'cantools',
@@ -1257,6 +1645,116 @@ BATTERY_VT(
                 str(cm.exception),
                 "error: Unsupported output database format 'foo'.")
 
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_dir = os.path.join(tmpdir, 'cache')
+            cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                        cache_dir=cache_dir)
+            cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                        cache_dir=cache_dir)
+
+            argv = ['cantools', 'cache', '--cache-dir', cache_dir, 'stats']
+            stdout = StringIO()
+
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            lines = stdout.getvalue().splitlines()
+            self.assertEqual(lines[0], 'Databases:  1')
+            self.assertEqual(lines[2], 'Size limit: 1073741824 bytes')
+            self.assertEqual(lines[3], 'Hits:       1')
+            self.assertEqual(lines[4], 'Misses:     1')
+            self.assertEqual(lines[5], 'Hit rate:   50.0%')
+
+            argv = [
+                'cantools', 'cache', '--cache-dir', cache_dir,
+                'prune', '--size-limit', '0'
+            ]
+            stdout = StringIO()
+
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            self.assertEqual(stdout.getvalue(), 'Evicted 1 database(s).\n')
+
+            stdout = StringIO()
+
+            with patch.dict(os.environ, {'CANTOOLS_CACHE_DIR': cache_dir}):
+                argv = ['cantools', 'cache', 'clear']
+
+                with patch('sys.stdout', stdout):
+                    with patch('sys.argv', argv):
+                        cantools._main()
+
+            self.assertEqual(stdout.getvalue(), 'Removed 0 database(s).\n')
+
+    def test_cache_no_cache_dir(self):
+        argv = ['cantools', 'cache', 'stats']
+
+        with patch.dict(os.environ, clear=True):
+            with patch('sys.argv', argv):
+                with self.assertRaises(SystemExit) as cm:
+                    cantools._main()
+
+        self.assertEqual(
+            str(cm.exception),
+            'error: No cache directory given. Use --cache-dir or the '
+            'environment variable CANTOOLS_CACHE_DIR.')
+
+    def test_import_time(self):
+        # importing the package must not load subpackages, database
+        # formats or heavy third party modules
+        modules = imported_modules('import cantools')
+
+        for module in ['can',
+                       'cantools.database',
+                       'cantools.tester',
+                       'cantools.logreader',
+                       'cantools.j1939',
+                       'argparse',
+                       'importlib.metadata']:
+            self.assertNotIn(module, modules)
+
+        print()
+        print(f"Import time of cantools: {modules['cantools'] / 1000:.1f} ms")
+
+        modules = imported_modules('import cantools.database')
+
+        for module in ['can',
+                       'cantools.database.can.formats.arxml',
+                       'cantools.database.can.formats.dbc',
+                       'cantools.database.can.formats.kcd',
+                       'cantools.database.can.formats.sym',
+                       'cantools.database.diagnostics.formats.cdd',
+                       'xml.etree.ElementTree',
+                       'diskcache',
+                       'multiprocessing']:
+            self.assertNotIn(module, modules)
+
+        print('Import time of cantools.database: '
+              f"{modules['cantools.database'] / 1000:.1f} ms")
+
+        # only the invoked subcommand and the used database format
+        # are loaded by the command line
+        modules = loaded_modules(['list', 'tests/files/dbc/motohawk.dbc'])
+
+        self.assertIn('cantools.subparsers.list', modules)
+        self.assertIn('cantools.database.can.formats.dbc', modules)
+
+        for module in ['cantools.subparsers.plot',
+                       'cantools.subparsers.monitor',
+                       'cantools.subparsers.generate_c_source',
+                       'cantools.database.can.formats.arxml',
+                       'cantools.database.can.formats.kcd',
+                       'cantools.database.can.formats.sym',
+                       'cantools.tester',
+                       'matplotlib',
+                       'curses',
+                       'can']:
+            self.assertNotIn(module, modules)
+
     def test_generate_c_source(self):
         databases = [
             'motohawk',
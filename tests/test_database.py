@@ -1,10 +1,14 @@
 
+import copy
 import logging
 import math
 import os
+import pickle
 import re
 import shutil
+import tempfile
 import timeit
+import tracemalloc
 import unittest.mock
 from collections import namedtuple
 from pathlib import Path
@@ -27,6 +31,12 @@ from cantools.database import Message, Signal, UnsupportedDatabaseFormatError
 from cantools.database.can.formats import dbc
 
 
+# Benchmarks take long, so they only run if the environment variable
+# CANTOOLS_BENCHMARK is set.
+benchmark = unittest.skipUnless(os.environ.get('CANTOOLS_BENCHMARK'),
+                                'CANTOOLS_BENCHMARK is not set')
+
+
 class CanToolsDatabaseTest(unittest.TestCase):
 
     maxDiff = None
@@ -2599,6 +2609,40 @@ class CanToolsDatabaseTest(unittest.TestCase):
         with self.assertRaises(cantools.db.UnsupportedDatabaseFormatError):
             cantools.db.load(StringIO(''))
 
+    def test_detect_format(self):
+        filenames = [
+            ('tests/files/arxml/system-4.2.arxml', 'arxml'),
+            ('tests/files/arxml/system-float-values.arxml', 'arxml'),
+            ('tests/files/dbc/foobar.dbc', 'dbc'),
+            ('tests/files/dbc/empty_ns.dbc', 'dbc'),
+            ('tests/files/kcd/the_homer.kcd', 'kcd'),
+            ('tests/files/kcd/empty.kcd', 'kcd'),
+            ('tests/files/sym/jopp-6.0.sym', 'sym'),
+            ('tests/files/sym/special-chars-6.0.sym', 'sym'),
+            ('tests/files/cdd/example.cdd', 'cdd'),
+            ('tests/files/arxml/system-bad-root-tag-4.2.arxml', None)
+        ]
+
+        for filename, database_format in filenames:
+            with open(filename, encoding='utf-8', errors='replace') as fin:
+                self.assertEqual(cantools.database.detect_format(fin.read()),
+                                 database_format,
+                                 filename)
+
+        self.assertIsNone(cantools.database.detect_format(''))
+        self.assertIsNone(cantools.database.detect_format('not a database'))
+
+        # only the detected format is parsed
+        with open('tests/files/sym/jopp-6.0.sym') as fin:
+            string = fin.read()
+
+        with unittest.mock.patch.object(cantools.database.can.Database,
+                                        'add_dbc_string') as add_dbc_string:
+            db = cantools.database.load_string(string)
+
+        add_dbc_string.assert_not_called()
+        self.assertEqual(len(db.messages), 7)
+
     def test_add_bad_kcd_string(self):
         db = cantools.db.Database()
 
@@ -3171,6 +3215,162 @@ class CanToolsDatabaseTest(unittest.TestCase):
 
         print(f"Decode time: {time} s ({time / iterations} s/decode)")
 
+    def test_performance_strict_loading(self):
+        """Test the load performance with and without checking the signal
+        layout.
+
+        """
+
+        iterations = 3
+
+        # A CAN-FD message with a multiplexer and many signals per
+        # multiplexer id, and a large container PDU-like message.
+        signals = [
+            cantools.db.Signal('Mux', 0, 8, is_multiplexer=True)
+        ]
+
+        for mux in range(32):
+            for i in range(63):
+                signals.append(
+                    cantools.db.Signal(f'S{mux}_{i}',
+                                       8 + 8 * i,
+                                       8,
+                                       multiplexer_ids=[mux],
+                                       multiplexer_signal='Mux'))
+
+        big_signals = [
+            cantools.db.Signal(f'B{i}', 32 * i, 32) for i in range(1024)
+        ]
+
+        def load(strict):
+            cantools.db.Message(frame_id=1,
+                                name='M0',
+                                length=64,
+                                signals=signals,
+                                is_fd=True,
+                                strict=strict)
+            cantools.db.Message(frame_id=2,
+                                name='M1',
+                                length=4096,
+                                signals=big_signals,
+                                strict=strict)
+            cantools.database.load_file('tests/files/dbc/vehicle.dbc',
+                                        strict=strict)
+
+        print()
+
+        for strict in [True, False]:
+            time = timeit.timeit(lambda strict=strict: load(strict),
+                                 number=iterations)
+            print(f"Load time with strict={strict}: {time} s "
+                  f"({time / iterations} s/load)")
+
+    def test_performance_memory_footprint(self):
+        """Test the memory footprint of loaded databases.
+
+        """
+
+        filenames = [
+            'tests/files/arxml/system-4.2.arxml',
+            'tests/files/dbc/vehicle.dbc',
+            'tests/files/kcd/vehicle.kcd',
+        ]
+
+        print()
+
+        for filename in filenames:
+            # import the database format before measuring
+            cantools.database.load_file(filename)
+            tracemalloc.start()
+
+            try:
+                db = cantools.database.load_file(filename)
+                size = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+            signals = sum(len(message.signals) for message in db.messages)
+            print(f"Memory footprint of {filename}: {size} bytes "
+                  f"({size // signals} bytes/signal)")
+
+    def test_performance_pickle(self):
+        """Test the size and round-trip time of pickled databases, with
+        and without the compiled codecs.
+
+        """
+
+        iterations = 10
+
+        filenames = [
+            'tests/files/arxml/system-4.2.arxml',
+            'tests/files/dbc/vehicle.dbc',
+        ]
+
+        print()
+
+        for filename in filenames:
+            db = cantools.database.load_file(filename)
+            db.precompile()
+
+            for codecs in [True, False]:
+                if codecs:
+                    obj = (db, [message._codecs for message in db.messages])
+                else:
+                    obj = db
+
+                size = len(pickle.dumps(obj))
+                time = timeit.timeit(
+                    lambda obj=obj: pickle.loads(pickle.dumps(obj)),
+                    number=iterations)
+                print(f"Pickled {filename} with codecs={codecs}: {size} "
+                      f"bytes, {time / iterations} s/round-trip")
+
+    @benchmark
+    def test_performance_ecu_extract_loading(self):
+        """Test the load performance of ECU extracts, scaled up by copying
+        all PDUs and signals of a small sample.
+
+        """
+
+        ns = '{http://autosar.org/schema/r4.0}'
+        ElementTree.register_namespace('', ns[1:-1])
+
+        def scale_up(copies):
+            root = ElementTree.parse(
+                'tests/files/arxml/ecu-extract-4.2.arxml').getroot()
+            sub_containers = root.iterfind(
+                f'.//{ns}ECUC-MODULE-CONFIGURATION-VALUES/{ns}CONTAINERS/'
+                f'{ns}ECUC-CONTAINER-VALUE/{ns}SUB-CONTAINERS')
+
+            for parent in sub_containers:
+                containers = list(parent)
+
+                for i in range(1, copies):
+                    for container in containers:
+                        container = copy.deepcopy(container)
+
+                        for elem in container.iter():
+                            if elem.tag in [f'{ns}SHORT-NAME',
+                                            f'{ns}VALUE-REF']:
+                                elem.text += f'_{i}'
+
+                        parent.append(container)
+
+            return ElementTree.tostring(root, encoding='unicode')
+
+        print()
+
+        for copies in [1, 10, 100, 1000]:
+            string = scale_up(copies)
+            db = cantools.database.load_string(string, 'arxml')
+            self.assertEqual(len(db.messages), 3 * copies)
+            time = timeit.timeit(
+                lambda string=string: cantools.database.load_string(string,
+                                                                    'arxml'),
+                number=1)
+            print(f"Load time of an ECU extract with {3 * copies} "
+                  f"messages: {time} s")
+
     def test_padding_one(self):
         """Test to encode a message with padding as one.
 
@@ -3552,6 +3752,121 @@ class CanToolsDatabaseTest(unittest.TestCase):
 
         self.assertEqual(cm.exception.args[0], 0x80000000 | 0x41)
 
+    def test_refresh_incremental(self):
+        db = cantools.database.load_file('tests/files/dbc/vehicle.dbc')
+        message = db.get_message_by_name('RT_SB_INS_Vel_Body_Axes')
+        other = db.get_message_by_name('RT_DL1MK3_Speed')
+
+        self.assertFalse(any(m.needs_refresh() for m in db.messages))
+
+        # Assigning attributes which do not influence the layout of the
+        # message does not require a refresh.
+        message.signals[0].unit = 'km/h'
+        message.signals[0].comment = 'Foo'
+        self.assertFalse(message.needs_refresh())
+
+        # Only the modified message is refreshed.
+        message.signals[1].start = 7
+        self.assertTrue(message.needs_refresh())
+
+        with unittest.mock.patch.object(Message,
+                                        'refresh',
+                                        autospec=True,
+                                        side_effect=Message.refresh) as refresh:
+            db.refresh(incremental=True)
+
+        refresh.assert_called_once_with(message, True)
+        self.assertFalse(message.needs_refresh())
+        self.assertEqual(
+            message.decode(b'\x80' + 7 * b'\x00')['Validity_INS_Vel_Sideways'],
+            1)
+
+        message.signals.append(Signal('Foo', 60, 4))
+        self.assertTrue(message.needs_refresh())
+        message.signals.pop()
+        self.assertFalse(message.needs_refresh())
+        message.length = 8
+        self.assertTrue(message.needs_refresh())
+        db.refresh(incremental=True)
+
+        # In-place modifications are not detected, but a full refresh
+        # recompiles all messages.
+        message = db.get_message_by_name('RT_SB_INS_Vel_Body_Axes')
+        message.signals[1].receivers.append('Foo')
+        self.assertFalse(message.needs_refresh())
+
+        with unittest.mock.patch.object(Message,
+                                        'refresh',
+                                        autospec=True,
+                                        side_effect=Message.refresh) as refresh:
+            db.refresh()
+
+        self.assertEqual(refresh.call_count, len(db.messages))
+
+        # Add, remove and replace messages.
+        new_message = Message(frame_id=0x123,
+                              name='RT_DL1MK3_Speed',
+                              length=1,
+                              signals=[Signal('Bar', 0, 8)])
+        db.add_message(new_message)
+        self.assertEqual(len(db.messages), 218)
+        self.assertIs(db.get_message_by_name('RT_DL1MK3_Speed'), new_message)
+        self.assertIs(db.get_message_by_frame_id(0x123), new_message)
+        self.assertIs(db.get_message_by_frame_id(other.frame_id), other)
+
+        db.remove_message(new_message)
+        self.assertEqual(len(db.messages), 217)
+        self.assertIs(db.get_message_by_name('RT_DL1MK3_Speed'), other)
+
+        with self.assertRaises(KeyError):
+            db.get_message_by_frame_id(0x123)
+
+        db.replace_message('RT_DL1MK3_Speed', new_message)
+        self.assertEqual(len(db.messages), 217)
+        self.assertIs(db.get_message_by_name('RT_DL1MK3_Speed'), new_message)
+        self.assertIs(db.get_message_by_frame_id(0x123), new_message)
+        self.assertNotIn(other, db.messages)
+
+        with self.assertRaises(KeyError):
+            db.get_message_by_frame_id(other.frame_id)
+
+        with self.assertRaises(KeyError):
+            db.remove_message(other)
+
+        # Messages can still be modified in the message list.
+        db.messages.remove(new_message)
+        db.refresh(incremental=True)
+
+        with self.assertRaises(KeyError):
+            db.get_message_by_name('RT_DL1MK3_Speed')
+
+    def test_add_dbc_file_refreshes_added_messages_only(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        old_message = db.get_message_by_name('ExampleMessage')
+
+        with unittest.mock.patch.object(Message,
+                                        'refresh',
+                                        autospec=True,
+                                        side_effect=Message.refresh) as refresh:
+            db.add_dbc_file('tests/files/dbc/foobar.dbc')
+
+        self.assertNotIn(old_message,
+                         [call.args[0] for call in refresh.call_args_list])
+        self.assertIs(db.get_message_by_name('ExampleMessage'), old_message)
+        self.assertIs(db.get_message_by_frame_id(old_message.frame_id),
+                      old_message)
+        self.assertEqual(db.get_message_by_name('Foo').frame_id, 0x12330)
+        self.assertEqual(db.messages[0], old_message)
+        self.assertEqual(len(db.messages), 6)
+
+        # Modifications of existing messages still require a refresh.
+        old_message.signals[0].is_signed = True
+        self.assertTrue(old_message.needs_refresh())
+        db.add_dbc_file('tests/files/dbc/abs.dbc')
+        self.assertTrue(old_message.needs_refresh())
+        db.refresh(incremental=True)
+        self.assertFalse(old_message.needs_refresh())
+
     def test_missing_dbc_specifics(self):
         db = cantools.db.Database()
 
@@ -3892,6 +4207,14 @@ class CanToolsDatabaseTest(unittest.TestCase):
             self.assertEqual(message_1.signals[0].start, 8)
             self.assertEqual(message_1.signals[0].length, 1)
 
+            # The layout may be checked separately.
+            with self.assertRaises(cantools.database.Error) as cm:
+                db.check_layout()
+
+            self.assertEqual(str(cm.exception),
+                             'The signal Signal1 does not fit in message '
+                             'Message1.')
+
     def test_database_signals_check_failure(self):
         signal = cantools.database.can.Signal('S',
                                               7,
@@ -3927,6 +4250,47 @@ class CanToolsDatabaseTest(unittest.TestCase):
         self.assertEqual(db.get_message_by_name('M1').frame_id, 2)
         self.assertEqual(db.get_message_by_frame_id(2).name, 'M1')
 
+    def test_load_files(self):
+        """Test loading a bundle of database files into one database.
+
+        """
+
+        filenames = [
+            'tests/files/dbc/add_two_dbc_files_1.dbc',
+            'tests/files/dbc/add_two_dbc_files_2.dbc',
+            'tests/files/dbc/motohawk.dbc'
+        ]
+
+        for jobs in [1, 2]:
+            with self.assertLogs('cantools.database', level='WARNING') as cm:
+                db = cantools.database.load_files(filenames, jobs=jobs)
+
+            self.assertEqual(len(db.messages), 4)
+            self.assertEqual(db.get_message_by_name('M1').frame_id, 2)
+            self.assertEqual(db.get_message_by_frame_id(2).name, 'M1')
+            self.assertEqual(db.get_message_by_name('ExampleMessage').frame_id,
+                             0x1f0)
+            self.assertEqual(
+                cm.output[0],
+                "WARNING:cantools.database:Message 'M1' from "
+                "'tests/files/dbc/add_two_dbc_files_2.dbc' is also defined in "
+                "'tests/files/dbc/add_two_dbc_files_1.dbc'.")
+            self.assertEqual(
+                cm.output[1],
+                "WARNING:cantools.database:Message 'M1' from "
+                "'tests/files/dbc/add_two_dbc_files_2.dbc' and message 'M2' "
+                "from 'tests/files/dbc/add_two_dbc_files_1.dbc' have identical "
+                "masked frame ids 0x2.")
+
+        with self.assertRaises(cantools.database.Error) as cm:
+            cantools.database.load_files(['tests/files/dbc/foobar.dbc',
+                                          'tests/files/cdd/example.cdd'],
+                                         jobs=1)
+
+        self.assertEqual(str(cm.exception),
+                         '"tests/files/cdd/example.cdd" is not a CAN database '
+                         'and cannot be merged with other databases.')
+
     def test_empty_ns_dbc(self):
         """Test loading a DBC-file with empty NS_.
 
@@ -6018,6 +6382,373 @@ class CanToolsDatabaseTest(unittest.TestCase):
         if cache_dir_path.exists():
             shutil.rmtree(cache_dir_path)
 
+    def test_cache_content_hash(self):
+        filename = 'tests/files/dbc/motohawk.dbc'
+        copy_filename = os.path.join(self.cache_dir + '_files', 'copy.dbc')
+        os.makedirs(os.path.dirname(copy_filename), exist_ok=True)
+        shutil.copyfile(filename, copy_filename)
+
+        try:
+            db = cantools.database.load_file(filename, cache_dir=self.cache_dir)
+            stats = cantools.database.cache.get_stats(self.cache_dir)
+            self.assertEqual(stats.hits, 0)
+            self.assertEqual(stats.misses, 1)
+            self.assertEqual(stats.databases, 1)
+            self.assertGreater(stats.load_time, 0)
+
+            # a copy of the file with a different path and
+            # modification time hits the cache
+            os.utime(copy_filename, (0, 0))
+            db_copy = cantools.database.load_file(copy_filename,
+                                                  cache_dir=self.cache_dir)
+            self.assertEqual(db_copy.messages[0].name, db.messages[0].name)
+            stats = cantools.database.cache.get_stats(self.cache_dir)
+            self.assertEqual(stats.hits, 1)
+            self.assertEqual(stats.misses, 1)
+            self.assertEqual(stats.databases, 1)
+            self.assertEqual(stats.hit_rate, 0.5)
+
+            # different options and contents are different entries
+            cantools.database.load_file(copy_filename,
+                                        strict=False,
+                                        cache_dir=self.cache_dir)
+
+            with open(copy_filename, 'a') as fout:
+                fout.write('\n')
+
+            cantools.database.load_file(copy_filename, cache_dir=self.cache_dir)
+            stats = cantools.database.cache.get_stats(self.cache_dir)
+            self.assertEqual(stats.hits, 1)
+            self.assertEqual(stats.misses, 3)
+            self.assertEqual(stats.databases, 3)
+        finally:
+            shutil.rmtree(os.path.dirname(copy_filename))
+
+    def test_cache_size_limit(self):
+        cantools.database.load_file('tests/files/dbc/vehicle.dbc',
+                                    cache_dir=self.cache_dir,
+                                    cache_size_limit=2 ** 20)
+        cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                    cache_dir=self.cache_dir)
+        stats = cantools.database.cache.get_stats(self.cache_dir)
+        self.assertEqual(stats.size_limit, 2 ** 20)
+        self.assertEqual(stats.databases, 2)
+
+        # shrinking the limit evicts the least recently used database
+        self.assertEqual(cantools.database.cache.prune(self.cache_dir, 0), 2)
+        stats = cantools.database.cache.get_stats(self.cache_dir)
+        self.assertEqual(stats.size_limit, 0)
+        self.assertEqual(stats.databases, 0)
+
+        cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                    cache_dir=self.cache_dir,
+                                    cache_size_limit=2 ** 20)
+        self.assertEqual(cantools.database.cache.clear(self.cache_dir), 1)
+        stats = cantools.database.cache.get_stats(self.cache_dir)
+        self.assertEqual(stats.databases, 0)
+        self.assertEqual(stats.hits, 0)
+        self.assertEqual(stats.misses, 0)
+
+    def test_load_file_memoize(self):
+        filename = 'tests/files/dbc/motohawk.dbc'
+        cantools.database.cache.clear_memoized()
+        self.addCleanup(cantools.database.cache.clear_memoized)
+
+        db = cantools.database.load_file(filename, memoize=True)
+        self.assertIs(cantools.database.load_file(filename, memoize=True), db)
+        self.assertIsNot(cantools.database.load_file(filename), db)
+
+        # other options are other entries
+        db_mask = cantools.database.load_file(filename,
+                                              frame_id_mask=0xff,
+                                              memoize=True)
+        db_prune = cantools.database.load_file(filename,
+                                               prune_choices=True,
+                                               memoize=True)
+        db_sort = cantools.database.load_file(filename,
+                                              sort_signals=None,
+                                              memoize=True)
+        self.assertEqual(len({id(db), id(db_mask), id(db_prune), id(db_sort)}), 4)
+        self.assertEqual(db_mask._frame_id_mask, 0xff)
+        self.assertIs(cantools.database.load_file(filename,
+                                                  frame_id_mask=0xff,
+                                                  memoize=True),
+                      db_mask)
+
+        # a modified file is reloaded
+        with tempfile.TemporaryDirectory() as tmpdir:
+            copy_filename = os.path.join(tmpdir, 'motohawk.dbc')
+            shutil.copyfile(filename, copy_filename)
+            db_copy = cantools.database.load_file(copy_filename, memoize=True)
+            self.assertIsNot(db_copy, db)
+            stat = os.stat(copy_filename)
+            os.utime(copy_filename,
+                     ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+            self.assertIsNot(cantools.database.load_file(copy_filename,
+                                                         memoize=True),
+                             db_copy)
+
+        # least recently used databases are evicted
+        with unittest.mock.patch.object(cantools.database.cache,
+                                        'MEMOIZE_MAXSIZE',
+                                        2):
+            cantools.database.load_file(filename, memoize=True)
+            cantools.database.load_file(filename,
+                                        strict=False,
+                                        memoize=True)
+            self.assertIs(cantools.database.load_file(filename, memoize=True), db)
+            self.assertIsNot(cantools.database.load_file(filename,
+                                                         frame_id_mask=0xff,
+                                                         memoize=True),
+                             db_mask)
+
+        self.assertEqual(cantools.database.cache.clear_memoized(), 2)
+
+        self.assertIsNot(cantools.database.load_file(filename, memoize=True), db)
+
+    def test_shared_conversions(self):
+        db = cantools.database.load_file('tests/files/dbc/abs.dbc')
+        message = db.get_message_by_name('BREMSE_53')
+        diag_fl = message.get_signal_by_name('Diag_FL')
+        diag_fr = message.get_signal_by_name('Diag_FR')
+        fault_info = message.get_signal_by_name('ABS_fault_info')
+
+        # loaded signals do not share their choices
+        self.assertIsNot(diag_fl.choices, diag_fr.choices)
+        diag_fl.choices[99] = 'Only FL'
+        self.assertNotIn(99, diag_fr.choices)
+        del diag_fl.choices[99]
+
+        # signals with equal value tables share their conversion once
+        # compacted
+        db.compact()
+        self.assertIs(diag_fl.conversion, diag_fr.conversion)
+        self.assertIsNot(diag_fl.conversion, fault_info.conversion)
+        self.assertFalse(message.needs_refresh())
+
+        # the objects have no per-instance dictionaries
+        for obj in [message, diag_fl, diag_fl.conversion, diag_fl.choices[0]]:
+            self.assertFalse(hasattr(obj, '__dict__'))
+
+        # assigning new choices does not affect other signals
+        diag_fl.choices = {0: 'Ok'}
+        self.assertEqual(diag_fr.choices[0], 'Signal ok')
+
+        # shared choices are pruned once
+        db = cantools.database.load_file('tests/files/sym/jopp-6.0.sym')
+        signals = [
+            signal
+            for message in db.messages
+            for signal in message.signals
+            if signal.choices
+        ]
+        self.assertEqual(len({id(signal.choices) for signal in signals}), 1)
+        choices = dict(signals[0].choices)
+        cantools.database.utils.prune_database_choices(db)
+        self.assertEqual(choices, signals[0].choices)
+
+        # pickling keeps the conversions shared and the messages
+        # refreshed
+        db.compact()
+        db = pickle.loads(pickle.dumps(db))
+        message = db.messages[0]
+        self.assertFalse(message.needs_refresh())
+
+    def test_compact(self):
+        filename = 'tests/files/dbc/vehicle.dbc'
+        db = cantools.database.load_file(filename)
+        other_db = cantools.database.load_file(filename)
+        encoded = db.encode_message('RT_SB_INS_Vel_Body_Axes',
+                                    {
+                                        'Validity_INS_Vel_Forwards': 1,
+                                        'Validity_INS_Vel_Sideways': 0,
+                                        'INS_Vel_Forwards_2D': 10.5,
+                                        'INS_Vel_Sideways_2D': -3.25,
+                                        'Accuracy_INS_Vel_Body': 5
+                                    })
+
+        self.assertGreater(db.compact(), 0)
+        self.assertGreater(other_db.compact(), 0)
+        self.assertEqual(db.compact(), 0)
+
+        # equal strings and receivers are shared, even across databases
+        signal = db.get_message_by_name('RT_SB_INS_Vel_Body_Axes') \
+            .get_signal_by_name('INS_Vel_Forwards_2D')
+        other_signal = db.get_message_by_name('RT_SB_INS_Vel_Body_Axes') \
+            .get_signal_by_name('INS_Vel_Sideways_2D')
+        self.assertEqual(signal.unit, 'm/s')
+        self.assertIs(signal.unit, other_signal.unit)
+        self.assertIs(signal.receivers, other_signal.receivers)
+        self.assertIs(signal.unit,
+                      other_db.get_message_by_name('RT_SB_INS_Vel_Body_Axes')
+                      .get_signal_by_name('INS_Vel_Forwards_2D').unit)
+
+        self.assertEqual(db.encode_message('RT_SB_INS_Vel_Body_Axes',
+                                           db.decode_message(
+                                               'RT_SB_INS_Vel_Body_Axes',
+                                               encoded)),
+                         encoded)
+        self.assertTrue(db.is_similar(other_db))
+
+    def assert_shared_decode(self,
+                             db,
+                             worker_db,
+                             message,
+                             frame_id_or_name,
+                             data,
+                             scaling):
+        kwargs = {
+            'scaling': scaling,
+            'force_extended_id': message.is_extended_frame
+        }
+
+        try:
+            expected = db.decode_message(frame_id_or_name, data, **kwargs)
+        except cantools.database.DecodeError as e:
+            with self.assertRaises(type(e)):
+                worker_db.decode_message(frame_id_or_name, data, **kwargs)
+        else:
+            self.assertEqual(worker_db.decode_message(frame_id_or_name,
+                                                      data,
+                                                      **kwargs),
+                             expected)
+
+    def test_shared_database(self):
+        shadowed_db = cantools.database.can.Database([
+            cantools.database.can.Message(
+                1, 'A', 1, [cantools.database.can.Signal('A', 0, 8)]),
+            cantools.database.can.Message(
+                1, 'B', 1, [cantools.database.can.Signal('B', 0, 4)])
+        ])
+        databases = [
+            cantools.database.load_file(filename)
+            for filename in ['tests/files/dbc/vehicle.dbc',
+                             'tests/files/dbc/multiplex_choices.dbc',
+                             'tests/files/arxml/system-4.2.arxml',
+                             'tests/files/sym/jopp-6.0.sym']
+        ]
+        databases.append(shadowed_db)
+
+        for db in databases:
+            shared_db = cantools.database.can.SharedDatabase.publish(db)
+            self.addCleanup(shared_db.unlink)
+            self.addCleanup(shared_db.close)
+
+            with cantools.database.can.SharedDatabase.attach(
+                    shared_db.name) as worker_db:
+                self.assertEqual(len(worker_db), len(db.messages))
+
+                for message in db.messages:
+                    for data in [bytes(message.length),
+                                 bytes(range(message.length))]:
+                        for frame_id_or_name in [message.frame_id,
+                                                 message.name]:
+                            for scaling in [True, False]:
+                                self.assert_shared_decode(db,
+                                                          worker_db,
+                                                          message,
+                                                          frame_id_or_name,
+                                                          data,
+                                                          scaling)
+
+                with self.assertRaises(KeyError):
+                    worker_db.decode_message(0x7ff, b'')
+
+                with self.assertRaises(KeyError):
+                    worker_db.decode_message('Missing', b'')
+
+        # a message with a shadowed frame id is found by name
+        with cantools.database.can.SharedDatabase.attach(
+                shared_db.name) as worker_db:
+            self.assertEqual(worker_db.decode_message('A', b'\xff'),
+                             {'A': 255})
+            self.assertEqual(worker_db.decode_message(1, b'\xff'),
+                             {'B': 15})
+
+    def test_pickle(self):
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        decoded = {'S0': 3, 'S1': 2, 'S2': 5}
+        data = db.encode_message('Shared', decoded)
+        pickled_db = pickle.loads(pickle.dumps(db))
+        message = pickled_db.get_message_by_name('Shared')
+
+        # the codecs are recreated on first use
+        self.assertIsNone(message._codecs)
+        self.assertFalse(message.needs_refresh())
+        self.assertEqual(message.get_signal_by_name('S0').name, 'S0')
+        self.assertEqual(pickled_db.decode_message('Shared', data), decoded)
+        self.assertEqual(pickled_db.encode_message('Shared', decoded), data)
+        self.assertEqual(message.signal_tree,
+                         db.get_message_by_name('Shared').signal_tree)
+        self.assertTrue(pickled_db.is_similar(db))
+
+    def test_formats_cache(self):
+        def create_message(frame_id):
+            return cantools.db.Message(
+                frame_id,
+                f'Cell{frame_id}',
+                8,
+                [
+                    cantools.db.Signal(f'Voltage{i}', 16 * i, 16)
+                    for i in range(4)
+                ])
+
+        first = create_message(1)
+        first.precompile()
+        info = cantools.database.utils.formats_cache_info()
+        second = create_message(2)
+        second.precompile()
+
+        # messages with equal layouts share their compiled formats
+        self.assertIs(first._codecs['formats'].little_endian,
+                      second._codecs['formats'].little_endian)
+        self.assertEqual(cantools.database.utils.formats_cache_info().hits,
+                         info.hits + 2)
+        self.assertEqual(second.decode(b'\x01\x00\x02\x00\x03\x00\x04\x00'),
+                         {
+                             'Voltage0': 1,
+                             'Voltage1': 2,
+                             'Voltage2': 3,
+                             'Voltage3': 4
+                         })
+
+    def test_lazy_codecs(self):
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Shared')
+
+        # the codecs are not needed to inspect the messages
+        self.assertTrue(message.is_multiplexed())
+        self.assertEqual(message.signal_tree,
+                         [
+                             {
+                                 'S0': {
+                                     1: ['S1'],
+                                     2: ['S2'],
+                                     3: ['S1', 'S2'],
+                                     4: ['S2'],
+                                     5: ['S2']
+                                 }
+                             }
+                         ])
+        db.as_dbc_string()
+
+        for db_message in db.messages:
+            self.assertIsNone(db_message._codecs)
+
+        # they are created on first use or by precompile()
+        encoded = message.encode({'S0': 1, 'S1': 2})
+        self.assertIsNotNone(message._codecs)
+        self.assertEqual(message.decode(encoded), {'S0': 1, 'S1': 2})
+        db.precompile()
+
+        for db_message in db.messages:
+            self.assertIsNotNone(db_message._codecs)
+
+        # a refresh drops outdated codecs
+        message.signals[0].length = 4
+        db.refresh()
+        self.assertIsNone(message._codecs)
+
     def test_sort_signals_by_name(self):
         filename = 'tests/files/dbc/vehicle.dbc'
         def sort_signals(signals):
@@ -6187,6 +6918,57 @@ class CanToolsDatabaseTest(unittest.TestCase):
 
         self.assertNotIn('BA_ "SystemSignalLongSymbol"', long_output)
 
+    def test_dump_streaming(self):
+        filename = 'tests/files/dbc/long_names.dbc'
+        db = cantools.database.load_file(filename)
+        expected_dbc = db.as_dbc_string()
+        node_names = [node.name for node in db.nodes]
+        message_names = [message.name for message in db.messages]
+        signal_attributes = [
+            dict(signal.dbc.attributes) if signal.dbc is not None else None
+            for message in db.messages
+            for signal in message.signals
+        ]
+        attribute_definitions = list(db.dbc.attribute_definitions)
+
+        for database_format, expected in [('dbc', expected_dbc),
+                                          ('kcd', db.as_kcd_string()),
+                                          ('sym', db.as_sym_string())]:
+            fout = StringIO()
+            cantools.database.dump(db, fout, database_format)
+            self.assertEqual(fout.getvalue(), expected)
+
+        # long names are shortened in the output only
+        self.assertEqual([node.name for node in db.nodes], node_names)
+        self.assertEqual([message.name for message in db.messages],
+                         message_names)
+        self.assertEqual([
+            dict(signal.dbc.attributes) if signal.dbc is not None else None
+            for message in db.messages
+            for signal in message.signals
+        ], signal_attributes)
+        self.assertEqual(list(db.dbc.attribute_definitions),
+                         attribute_definitions)
+        self.assertEqual(db.as_dbc_string(), expected_dbc)
+
+        with self.assertRaises(cantools.database.Error) as cm:
+            cantools.database.dump(db, StringIO(), 'arxml')
+
+        self.assertEqual(str(cm.exception),
+                         "Unsupported output database format 'arxml'.")
+
+        # databases without messages
+        db = cantools.database.Database()
+        fout = StringIO()
+        db.dump_sym(fout)
+        self.assertEqual(fout.getvalue(),
+                         'FormatVersion=6.0 // Do not edit this line!\n'
+                         'Title="SYM Database"\n\n\n\n\n\n')
+        fout = StringIO()
+        db.dump_kcd(fout)
+        self.assertEqual(cantools.database.load_string(fout.getvalue()).messages,
+                         [])
+
     def test_fd_detection(self):
         filename = "tests/files/dbc/fd_test.dbc"
         db = cantools.db.load_file(filename)
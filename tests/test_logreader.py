@@ -1,9 +1,49 @@
+import bz2
+import datetime
+import gzip
 import io
+import json
+import lzma
+import math
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
 import unittest
+import unittest.mock
+
+import can
 
 import cantools
 
 
+# Benchmarks take long, so they only run if the environment variable
+# CANTOOLS_BENCHMARK is set.
+benchmark = unittest.skipUnless(os.environ.get('CANTOOLS_BENCHMARK'),
+                                'CANTOOLS_BENCHMARK is not set')
+
+
+def _fields(frame):
+    return [getattr(frame, name) for name in cantools.logreader.DataFrame.__slots__]
+
+
+def _candump_log(lines, frame_ids=0x800):
+    """Returns a synthetic candump -l log with given number of lines,
+    one millisecond apart, cycling through given number of frame ids.
+
+    """
+
+    return ''.join(f'({1600000000 + i / 1000:.6f}) can0 '
+                   f'{i % frame_ids:03X}#{i * 0x10001:016X}\n'
+                   for i in range(lines))
+
+
 class TestLogreaderFormats(unittest.TestCase):
     def test_empty_line(self):
         parser = cantools.logreader.Parser()
@@ -118,6 +158,115 @@ class TestLogreaderFormats(unittest.TestCase):
         self.assertEqual(outp.timestamp.second, 24)
         self.assertEqual(outp.timestamp.microsecond, 501098)
 
+    def test_candump_log_fast_path(self):
+        """Lines unpacked by splitting them at their delimiters must give
+        the same frames as the regex, which is used for all other lines.
+
+        """
+
+        lines = [
+            (cantools.logreader.CandumpDefaultLogPattern,
+             "(1579857014.345944) can2 486#82967A6B006B07F8"),
+            (cantools.logreader.CandumpDefaultLogPattern,
+             "(1613656104.501098) can3 14C##1AABB T"),
+            (cantools.logreader.CandumpTimestampedPattern,
+             "(002.047817)  vcan0  064   [8]  31 30 30 2E 35 20 46 4D   '100.5 FM'"),
+            (cantools.logreader.CandumpTimestampedPattern,
+             "(1621271100.919019)  can1  123   [0]"),
+        ]
+
+        for pattern, line in lines:
+            frame = pattern.unpack_line(line)
+            expected = pattern.unpack(pattern.pattern.match(line))
+            self.assertEqual(_fields(frame), _fields(expected))
+
+        # Lines the fast path leaves to the regex.
+        lines = [
+            (cantools.logreader.CandumpDefaultLogPattern,
+             "(1579857014.345944) can2 486#82967A6B006B07F8 X"),
+            (cantools.logreader.CandumpDefaultLogPattern,
+             "(1579857014.345944) can2 4a6#82967A6B006B07F8"),
+            (cantools.logreader.CandumpTimestampedPattern,
+             "(002.047817)  vcan0  064   [8]F0 01"),
+        ]
+
+        for pattern, line in lines:
+            self.assertIsNone(pattern.unpack_line(line))
+
+        parser = cantools.logreader.Parser()
+        outp = parser.parse("(002.047817)  vcan0  064   [8]  F0 01\tFF FF")
+        self.assertEqual(outp.data, b'\xF0\x01')
+
+    def test_candump_log_bytes(self):
+        parser = cantools.logreader.Parser()
+
+        outp = parser.parse(b"(1579857014.345944) can2 486#82967A6B006B07F8")
+        self.assertEqual(outp.channel, 'can2')
+        self.assertEqual(outp.frame_id, 0x486)
+        self.assertEqual(outp.data, b'\x82\x96\x7A\x6B\x00\x6B\x07\xF8')
+
+        outp = parser.parse(b"(1579857014.345944) can2 ERROR")
+        self.assertIsNone(outp)
+
+    def test_float_timestamps(self):
+        lines = [
+            ("(1579857014.345944) can2 486#82967A6B006B07F8",
+             1579857014.345944,
+             cantools.logreader.TimestampFormat.ABSOLUTE),
+            ("(002.047817)  vcan0  064   [8]  F0 01 FF FF FF FF FF FF",
+             2.047817,
+             cantools.logreader.TimestampFormat.RELATIVE),
+            ("(2020-12-19 12:04:45.4852)  vcan0  0C8   [8]  F0 00 00 00 00 00 00 00",
+             datetime.datetime(2020, 12, 19, 12, 4, 45, 485200).timestamp(),
+             cantools.logreader.TimestampFormat.ABSOLUTE),
+            ("  vcan0  1F4   [4]  01 02 03 04",
+             None,
+             cantools.logreader.TimestampFormat.MISSING),
+            (" 1      1059.900 DT 0300 Rx 7 00 00 00 00 04 00 00",
+             1.0599,
+             cantools.logreader.TimestampFormat.RELATIVE),
+        ]
+
+        for line, timestamp, timestamp_format in lines:
+            outp = cantools.logreader.Parser(timestamps='float').parse(line)
+            self.assertEqual(outp.timestamp_format, timestamp_format)
+
+            if timestamp is None:
+                self.assertIsNone(outp.timestamp)
+            else:
+                self.assertAlmostEqual(outp.timestamp, timestamp, places=6)
+
+            # Same timestamp as a datetime object.
+            outp = cantools.logreader.Parser().parse(line)
+
+            if timestamp_format == cantools.logreader.TimestampFormat.RELATIVE:
+                self.assertAlmostEqual(outp.timestamp.total_seconds(),
+                                       timestamp,
+                                       places=6)
+            elif timestamp is not None:
+                self.assertAlmostEqual(outp.timestamp.timestamp(),
+                                       timestamp,
+                                       places=6)
+
+        with self.assertRaises(ValueError) as cm:
+            cantools.logreader.Parser(timestamps='int')
+
+        self.assertEqual(
+            str(cm.exception),
+            "Expected timestamps 'datetime' or 'float', but got 'int'.")
+
+    def test_candump_log_absolute_timestamp_invalid(self):
+        for timestamps in ['datetime', 'float']:
+            parser = cantools.logreader.Parser(timestamps=timestamps)
+
+            for line in [
+                    "(2020-12-19 12:04:60.485261)  vcan0  0C8   [1]  F0",
+                    "(2020-12-19 12:04:45.4852610)  vcan0  0C8   [1]  F0",
+                    "(2020-02-30 12:04:45.485261)  vcan0  0C8   [1]  F0"
+            ]:
+                with self.assertRaises(ValueError):
+                    parser.parse(line)
+
     def test_candump_log_absolute_timestamp(self):
         parser = cantools.logreader.Parser()
 
@@ -291,6 +440,817 @@ class TestLogreaderStreams(unittest.TestCase):
         f4 = next(frame_iter)
         self.assertEqual(f4.frame_id, 0x1f3)
 
+    def test_candump_log_binary_stream(self):
+        testvec = io.BytesIO(b"""\
+(1594172461.968006) vcan0 0C8#F000000000000000
+(1594172462.127684) vcan0 ERROR\r
+(1594172462.688432) vcan0 1F3#010203
+""")
+        parser = cantools.logreader.Parser(testvec)
+        lines = list(parser.iterlines(keep_unknowns=True))
+        self.assertEqual(
+            [(line, frame and frame.frame_id) for line, frame in lines],
+            [
+                ('(1594172461.968006) vcan0 0C8#F000000000000000', 0xc8),
+                ('(1594172462.127684) vcan0 ERROR', None),
+                ('(1594172462.688432) vcan0 1F3#010203', 0x1f3)
+            ])
+
+    @benchmark
+    def test_performance_candump_log(self):
+        """Test the parse throughput of synthetic candump logs, both with
+        the fast path and with the regex only.
+
+        """
+
+        lines = 100000
+        formats = [
+            (cantools.logreader.CandumpDefaultLogPattern,
+             '({:.6f}) can0 {:03X}#{:016X}\n'),
+            (cantools.logreader.CandumpTimestampedPattern,
+             '({:.6f})  can0  {:03X}   [8]  {:016X}\n')
+        ]
+
+        print()
+
+        for pattern, fmt in formats:
+            log = ''.join(fmt.format(1600000000 + i / 1000,
+                                     i % 0x800,
+                                     i * 0x10001)
+                          for i in range(lines))
+
+            if pattern is cantools.logreader.CandumpTimestampedPattern:
+                log = re.sub(r'(\[8\]  )(\w+)',
+                             lambda mo: mo.group(1) + ' '.join(
+                                 mo.group(2)[i:i + 2] for i in range(0, 16, 2)),
+                             log)
+
+            streams = [
+                ('text', lambda log=log: io.StringIO(log)),
+                ('binary', lambda log=log: io.BytesIO(log.encode('ascii'))),
+            ]
+
+            for stream_name, stream in streams:
+                time = timeit.timeit(
+                    lambda stream=stream: self.assertEqual(
+                        sum(1 for _ in cantools.logreader.Parser(stream())),
+                        lines),
+                    number=1)
+                print(f'{pattern.__name__} from a {stream_name} stream: '
+                      f'{lines / time:.0f} lines/s '
+                      f'({1e7 / lines * time:.1f} s/10M lines)')
+
+            with unittest.mock.patch.object(pattern,
+                                            'unpack_line',
+                                            lambda line, float_timestamps: None):
+                time = timeit.timeit(
+                    lambda log=log: sum(1 for _ in cantools.logreader.Parser(
+                        io.StringIO(log))),
+                    number=1)
+
+            print(f'{pattern.__name__} with the regex only: '
+                  f'{lines / time:.0f} lines/s '
+                  f'({1e7 / lines * time:.1f} s/10M lines)')
+
+    def test_parse_file(self):
+        log = ''.join(f'({1600000000 + i}.000000) can{i % 2} {i:03X}#{i:04X}\n'
+                      for i in range(1000))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'candump.log')
+
+            with open(filename, 'w') as fout:
+                fout.write('garbage\n' + log.replace('(1600000500', 'x'))
+
+            expected = [
+                _fields(frame)
+                for frame in cantools.logreader.Parser(io.StringIO(log))
+                if frame.frame_id != 500
+            ]
+
+            for processes, chunk_size in [(1, 1000), (2, 1000), (None, 1)]:
+                frames = cantools.logreader.parse_file(filename,
+                                                       processes,
+                                                       chunk_size)
+                self.assertEqual([_fields(frame) for frame in frames], expected)
+
+            # Stop before all chunks are parsed.
+            frames = cantools.logreader.parse_file(filename, 2, 100)
+            self.assertEqual(_fields(next(frames)), expected[0])
+            frames.close()
+
+            # Empty and unknown files.
+            for data in ['', 'garbage\n']:
+                with open(filename, 'w') as fout:
+                    fout.write(data)
+
+                frames = cantools.logreader.parse_file(filename)
+                self.assertEqual(list(frames), [])
+
+    def test_open_log(self):
+        log = b''.join(b'(1594172461.968006) vcan0 0C8#%016X\n' % i
+                       for i in range(10000))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for suffix, compress in [('', bytes),
+                                     ('.gz', gzip.compress),
+                                     ('.xz', lzma.compress),
+                                     ('.bz2', bz2.compress)]:
+                filename = os.path.join(tmp, 'candump.log' + suffix)
+
+                with open(filename, 'wb') as fout:
+                    fout.write(compress(log))
+
+                for threaded in [False, True]:
+                    with cantools.logreader.open_log(filename,
+                                                     'rb',
+                                                     threaded,
+                                                     block_size=1000) as fin:
+                        self.assertEqual(fin.read(), log)
+
+                    with cantools.logreader.open_log(filename,
+                                                     threaded=threaded) as fin:
+                        frames = list(cantools.logreader.Parser(fin))
+                        self.assertEqual(len(frames), 10000)
+                        self.assertEqual(frames[-1].data,
+                                         (9999).to_bytes(8, 'big'))
+
+                # Close before reading everything.
+                fin = cantools.logreader.open_log(filename,
+                                                  threaded=True,
+                                                  block_size=100)
+                fin.readline()
+                fin.close()
+
+            # Errors are raised by the reading thread.
+            filename = os.path.join(tmp, 'candump.log.gz')
+
+            with open(filename, 'wb') as fout:
+                fout.write(gzip.compress(log)[:-100])
+
+            with self.assertRaises(EOFError):
+                with cantools.logreader.open_log(filename, threaded=True) as fin:
+                    fin.read()
+
+        with self.assertRaises(ValueError) as cm:
+            cantools.logreader.open_log(filename, 'w')
+
+        self.assertEqual(str(cm.exception),
+                         "Expected mode 'r' or 'rb', but got 'w'.")
+
+    @benchmark
+    def test_performance_compressed(self):
+        """Test the parse throughput of compressed logs, compared to
+        decompressing them with external tools.
+
+        """
+
+        lines = 100000
+        log = _candump_log(lines).encode('ascii')
+
+        def parse(stream):
+            self.assertEqual(
+                sum(1 for _ in cantools.logreader.Parser(stream,
+                                                         timestamps='float')),
+                lines)
+
+        def parse_piped(command, filename):
+            with subprocess.Popen([command, filename],
+                                  stdout=subprocess.PIPE) as process:
+                parse(io.TextIOWrapper(process.stdout, encoding='utf-8'))
+
+        print()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for suffix, compress, command in [('.gz', gzip.compress, 'zcat'),
+                                              ('.xz', lzma.compress, 'xzcat'),
+                                              ('.bz2', bz2.compress, 'bzcat')]:
+                filename = os.path.join(tmp, 'candump.log' + suffix)
+
+                with open(filename, 'wb') as fout:
+                    fout.write(compress(log))
+
+                for threaded in [False, True]:
+                    def parse_file(filename=filename, threaded=threaded):
+                        with cantools.logreader.open_log(filename,
+                                                         threaded=threaded) as fin:
+                            parse(fin)
+
+                    time = timeit.timeit(parse_file, number=1)
+                    print(f'{suffix} with threaded={threaded}: '
+                          f'{lines / time:.0f} lines/s')
+
+                if shutil.which(command):
+                    time = timeit.timeit(
+                        lambda command=command, filename=filename: parse_piped(
+                            command,
+                            filename),
+                        number=1)
+                    print(f'{suffix} piped through {command}: '
+                          f'{lines / time:.0f} lines/s')
+
+    @benchmark
+    def test_performance_timestamps(self):
+        """Test the parse throughput of synthetic candump logs with
+        datetime and float timestamps.
+
+        """
+
+        lines = 100000
+        start = datetime.datetime(2020, 12, 19, 12, 4, 45)
+        formats = [
+            lambda i: f'({1600000000 + i / 1000:.6f}) can0 123#0102\n',
+            lambda i: f'({i / 1000:.6f})  can0  123   [2]  01 02\n',
+            lambda i: (f'({start + datetime.timedelta(milliseconds=i):%Y-%m-%d %H:%M:%S.%f})'
+                       '  can0  123   [2]  01 02\n')
+        ]
+
+        print()
+
+        for fmt in formats:
+            log = ''.join(fmt(i) for i in range(lines))
+
+            for timestamps in ['datetime', 'float']:
+                time = timeit.timeit(
+                    lambda log=log, timestamps=timestamps: self.assertEqual(
+                        sum(1 for _ in cantools.logreader.Parser(
+                            io.StringIO(log),
+                            timestamps=timestamps)),
+                        lines),
+                    number=1)
+                print(f'{log[:log.index(")") + 1]} with {timestamps} '
+                      f'timestamps: {lines / time:.0f} lines/s')
+
+    def test_performance_parse_file(self):
+        """Test the parse throughput of a synthetic candump log with one
+        and all CPUs.
+
+        """
+
+        lines = 100000
+        log = _candump_log(lines)
+
+        print()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'candump.log')
+
+            with open(filename, 'w') as fout:
+                fout.write(log)
+
+            for processes in sorted({1, os.cpu_count() or 1}):
+                time = timeit.timeit(
+                    lambda processes=processes: self.assertEqual(
+                        sum(1 for _ in cantools.logreader.parse_file(
+                            filename,
+                            processes,
+                            chunk_size=256 * 1024)),
+                        lines),
+                    number=1)
+                print(f'parse_file() with {processes} process(es): '
+                      f'{lines / time:.0f} lines/s')
+
+    def test_asc_reader(self):
+        asc = (
+            'date Mon Oct 19 11:34:20.983 2026\n'
+            'base hex  timestamps absolute\n'
+            'internal events logged\n'
+            'Begin Triggerblock Mon Oct 19 11:34:20.983 2026\n'
+            '   0.000000 Start of measurement\n'
+            '   0.001000 1  123             Rx   d 2 01 AB\n'
+            '   0.002000 2  1ABCDEFx        Tx   d 8 01 02 03 04 05 06 07 08 '
+            'Length = 0 BitCount = 0 ID = 28036591x\n'
+            '   0.003000 1  ErrorFrame\n'
+            '   0.004000 1  123             Rx   r\n'
+            '   0.005000 1  Statistic: D 0 R 0 XD 0 XR 0 E 0 O 0 B 0.00%\n'
+            '   0.006000 CANFD   3 Rx        418  Name       1 0 9 12 '
+            '01 02 03 04 05 06 07 08 09 0A 0B 0C    0    0     1000 0 0 0 0 0\n'
+            '   0.007000 CANFD   3 Rx        419             1 0 0  0  '
+            '0    0     1000 0 0 0 0 0\n'
+            'End TriggerBlock\n')
+
+        frames = list(cantools.logreader.AscReader(io.StringIO(asc)))
+
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[0].channel, '1')
+        self.assertEqual(frames[0].frame_id, 0x123)
+        self.assertEqual(frames[0].data, b'\x01\xab')
+        self.assertEqual(frames[0].timestamp,
+                         datetime.timedelta(milliseconds=1))
+        self.assertEqual(frames[0].timestamp_format,
+                         cantools.logreader.TimestampFormat.RELATIVE)
+        self.assertEqual(frames[1].channel, '2')
+        self.assertEqual(frames[1].frame_id, 0x1abcdef)
+        self.assertEqual(frames[1].data, bytes(range(1, 9)))
+        self.assertEqual(frames[2].channel, '3')
+        self.assertEqual(frames[2].frame_id, 0x418)
+        self.assertEqual(frames[2].data, bytes(range(1, 13)))
+        self.assertEqual(frames[2].timestamp,
+                         datetime.timedelta(milliseconds=6))
+
+        # Decimal base and timestamps relative to the previous event
+        # in a binary stream.
+        asc = (
+            'base dec  timestamps relative\n'
+            '   0.500000 1  291             Rx   d 2 1 171\n'
+            '   0.250000 1  Statistic: D 0 R 0 XD 0 XR 0 E 0 O 0 B 0.00%\n'
+            '   0.250000 1  292             Rx   d 1 255\n')
+
+        frames = list(cantools.logreader.AscReader(io.BytesIO(asc.encode()),
+                                                    timestamps='float'))
+
+        self.assertEqual([(frame.frame_id, frame.data, frame.timestamp)
+                          for frame in frames],
+                         [
+                             (0x123, b'\x01\xab', 0.5),
+                             (0x124, b'\xff', 1.0)
+                         ])
+
+    def test_blf_reader(self):
+        messages = [
+            can.Message(timestamp=1600000000.5,
+                        arbitration_id=0x123,
+                        is_extended_id=False,
+                        data=b'\x01\xab',
+                        channel=0),
+            can.Message(timestamp=1600000001.25,
+                        arbitration_id=0x1abcdef,
+                        data=bytes(range(1, 9)),
+                        channel=1),
+            can.Message(timestamp=1600000001.5,
+                        arbitration_id=0x124,
+                        is_extended_id=False,
+                        is_remote_frame=True,
+                        dlc=2,
+                        channel=0),
+            can.Message(timestamp=1600000002.0,
+                        arbitration_id=0x418,
+                        is_extended_id=False,
+                        is_fd=True,
+                        data=bytes(range(1, 13)),
+                        channel=2)
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'trace.blf')
+
+            # Many frames to span several log containers.
+            with can.BLFWriter(filename) as writer:
+                for _ in range(1000):
+                    for message in messages:
+                        writer.on_message_received(message)
+
+            with open(filename, 'rb') as fin:
+                frames = list(cantools.logreader.BlfReader(fin))
+
+            with open(filename, 'rb') as fin:
+                timestamps = [
+                    frame.timestamp
+                    for frame in cantools.logreader.BlfReader(
+                            fin,
+                            timestamps='float')
+                ]
+
+        self.assertEqual(len(frames), 3000)
+        self.assertEqual([(frame.channel, frame.frame_id, frame.data)
+                          for frame in frames[:3]],
+                         [
+                             ('1', 0x123, b'\x01\xab'),
+                             ('2', 0x1abcdef, bytes(range(1, 9))),
+                             ('3', 0x418, bytes(range(1, 13)))
+                         ])
+        # python-can writes the start time in UTC, while it is read as
+        # local time.
+        start_time = datetime.datetime(2020, 9, 13, 12, 26, 40, 500000)
+        self.assertEqual(frames[0].timestamp, start_time)
+        self.assertEqual(frames[0].timestamp_format,
+                         cantools.logreader.TimestampFormat.ABSOLUTE)
+        self.assertEqual(timestamps[:3],
+                         [
+                             start_time.timestamp(),
+                             start_time.timestamp() + 0.75,
+                             start_time.timestamp() + 1.5
+                         ])
+
+        with self.assertRaises(ValueError):
+            cantools.logreader.BlfReader(io.BytesIO(b'candump'))
+
+        # Malformed objects in an uncompressed log container.
+        file_header = struct.pack('<4sL136x', b'LOGG', 144)
+
+        for object_size, body in [(0, b''), (16, b''), (36, bytes(4))]:
+            objects = (struct.pack('<4sHHLLLHHQ',
+                                   b'LOBJ',
+                                   32,
+                                   1,
+                                   object_size,
+                                   1,
+                                   2,
+                                   0,
+                                   0,
+                                   0)
+                       + body)
+            container = (struct.pack('<4sHHLLH6xL4x',
+                                     b'LOBJ',
+                                     16,
+                                     1,
+                                     32 + len(objects),
+                                     10,
+                                     0,
+                                     len(objects))
+                         + objects)
+
+            with self.assertRaises(ValueError):
+                list(cantools.logreader.BlfReader(
+                    io.BytesIO(file_header + container)))
+
+    @benchmark
+    def test_performance_asc_blf(self):
+        """Test the read throughput of synthetic ASC and BLF logs, compared
+        to the python-can readers.
+
+        """
+
+        frames = 100000
+        messages = [
+            can.Message(timestamp=1600000000 + i / 1000,
+                        arbitration_id=i % 0x800,
+                        is_extended_id=False,
+                        data=(i * 0x10001).to_bytes(8, 'big'),
+                        channel=0)
+            for i in range(frames)
+        ]
+
+        print()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for suffix, writer_class, reader_class, mode, python_can_reader in [
+                    ('.asc', can.ASCWriter, cantools.logreader.AscReader, 'r',
+                     can.ASCReader),
+                    ('.blf', can.BLFWriter, cantools.logreader.BlfReader, 'rb',
+                     can.BLFReader)
+            ]:
+                filename = os.path.join(tmp, 'trace' + suffix)
+
+                with writer_class(filename) as writer:
+                    for message in messages:
+                        writer.on_message_received(message)
+
+                for timestamps in ['datetime', 'float']:
+                    def read(filename=filename,
+                             reader_class=reader_class,
+                             mode=mode,
+                             timestamps=timestamps):
+                        with open(filename, mode) as fin:
+                            self.assertEqual(
+                                sum(1 for _ in reader_class(
+                                    fin,
+                                    timestamps=timestamps)),
+                                frames)
+
+                    time = timeit.timeit(read, number=1)
+                    print(f'{reader_class.__name__} with '
+                          f'timestamps={timestamps}: '
+                          f'{frames / time:.0f} frames/s')
+
+                def read_python_can(filename=filename,
+                                    python_can_reader=python_can_reader):
+                    with python_can_reader(filename) as reader:
+                        self.assertEqual(sum(1 for _ in reader), frames)
+
+                time = timeit.timeit(read_python_can, number=1)
+                print(f'python-can {python_can_reader.__name__}: '
+                      f'{frames / time:.0f} frames/s')
+
+    def test_data_frame(self):
+        channel = ''.join(['vc', 'an0'])
+        data = b'\x01\x02'
+        frame = cantools.logreader.DataFrame(channel,
+                                             0x123,
+                                             data,
+                                             1.0,
+                                             cantools.logreader.TimestampFormat.ABSOLUTE)
+
+        self.assertFalse(hasattr(frame, '__dict__'))
+        self.assertIs(frame.channel, sys.intern('vcan0'))
+        self.assertIs(frame.data, data)
+        self.assertEqual(cantools.logreader.DataFrame('vcan0',
+                                                      0x123,
+                                                      bytearray(data),
+                                                      1.0,
+                                                      None).data,
+                         data)
+
+        for channel in [1, None]:
+            self.assertIs(cantools.logreader.DataFrame(channel,
+                                                       0x123,
+                                                       data,
+                                                       1.0,
+                                                       None).channel,
+                          channel)
+
+    def test_frame_columns(self):
+        log = ('(1.000000)  vcan0  1F4   [4]  01 02 03 04\n'
+               'invalid\n'
+               '(2.000000)  vcan1  1F3   [0]\n'
+               '(3.000000)  vcan0  123   [8]  01 02 03 04 05 06 07 08\n')
+        parser = cantools.logreader.Parser(io.StringIO(log))
+        columns = cantools.logreader.FrameColumns(2, payloads_capacity=0)
+
+        self.assertEqual(parser.read_columns(columns), 2)
+        self.assertEqual(len(columns), 2)
+        self.assertEqual(columns.timestamps[:2].tolist(), [1.0, 2.0])
+        self.assertEqual(columns.frame_ids[:2].tolist(), [0x1f4, 0x1f3])
+        self.assertEqual(columns.channels[:2].tolist(), [0, 1])
+        self.assertEqual(columns.channel_names, ['vcan0', 'vcan1'])
+        self.assertEqual(columns.offsets[:3].tolist(), [0, 4, 4])
+        self.assertEqual(columns.data(0), b'\x01\x02\x03\x04')
+        self.assertEqual(columns.data(1), b'')
+
+        with self.assertRaises(IndexError):
+            columns.data(2)
+
+        with self.assertRaises(IndexError):
+            columns.append(columns.frame(0))
+
+        self.assertEqual(parser.read_columns(columns), 1)
+        self.assertEqual(_fields(columns.frame(0)),
+                         _fields(cantools.logreader.DataFrame(
+                             'vcan0',
+                             0x123,
+                             bytes(range(1, 9)),
+                             3.0,
+                             cantools.logreader.TimestampFormat.RELATIVE)))
+        self.assertEqual(parser.read_columns(columns), 0)
+
+        # Missing timestamps.
+        parser = cantools.logreader.Parser(
+            io.StringIO('vcan0  1F4   [1]  01\n'))
+        columns = cantools.logreader.FrameColumns()
+
+        self.assertEqual(parser.read_columns(columns), 1)
+        self.assertTrue(math.isnan(columns.timestamps[0]))
+        self.assertIsNone(columns.frame(0).timestamp)
+
+    @benchmark
+    def test_performance_memory(self):
+        """Test the memory usage and parse throughput of a synthetic candump
+        log kept in memory as DataFrames and as FrameColumns.
+
+        """
+
+        lines = 100000
+        log = _candump_log(lines)
+
+        def parse_frames(timestamps):
+            return list(cantools.logreader.Parser(io.StringIO(log),
+                                                  timestamps=timestamps))
+
+        def parse_columns():
+            columns = cantools.logreader.FrameColumns(lines)
+            cantools.logreader.Parser(io.StringIO(log)).read_columns(columns)
+
+            return columns
+
+        print()
+
+        for name, parse in [
+                ('DataFrames with datetime timestamps',
+                 lambda: parse_frames('datetime')),
+                ('DataFrames with float timestamps',
+                 lambda: parse_frames('float')),
+                ('FrameColumns', parse_columns)
+        ]:
+            tracemalloc.start()
+
+            try:
+                start = time.perf_counter()
+                frames = parse()
+                elapsed = time.perf_counter() - start
+                size = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+            self.assertEqual(len(frames), lines)
+            del frames
+            print(f'{name}: {size / lines:.0f} bytes/frame, '
+                  f'{lines / elapsed:.0f} lines/s (traced)')
+
+    def test_frame_ids(self):
+        lines = [
+            'vcan0  0C8   [8]  F0 00 00 00 00 00 00 00',
+            '(000.000000)  vcan0  0C8   [8]  F0 00 00 00 00 00 00 00',
+            '(1579857014.345944) can2 0C8#82967A6B006B07F8',
+            '(2020-12-19 12:04:45.485261)  vcan0  0C8   [8]  F0 00 00 00 00 00 00 00',
+            '  1)      6357.213 1  Rx        00C8 -  8    00 00 00 00 00 00 00 00'
+        ]
+
+        for line in lines:
+            pattern = cantools.logreader.Parser.detect_pattern(line)
+            self.assertEqual(pattern.frame_id(line), 0xc8)
+            self.assertEqual(
+                cantools.logreader.Parser(frame_ids={0xc8}).parse(line).frame_id,
+                0xc8)
+            self.assertIsNone(
+                cantools.logreader.Parser(frame_ids=[0xc9]).parse(line))
+
+        # Frames of messages in a database, with a frame id mask.
+        db = cantools.database.load_file('tests/files/dbc/socialledge.dbc',
+                                         frame_id_mask=0xff)
+        log = ('(1.0) vcan0 1F4#01020304\n'
+               '(2.0) vcan0 2F4#01020304\n'
+               '(3.0) vcan0 1F5#01020304\n'
+               'invalid\n')
+        frames = list(cantools.logreader.Parser(io.StringIO(log), frame_ids=db))
+
+        self.assertEqual([frame.frame_id for frame in frames], [0x1f4, 0x2f4])
+
+        # Frames of messages with any of given signals.
+        frame_ids = cantools.logreader.DatabaseFrameIds(
+            db,
+            ['SENSOR_SONARS_left', 'Missing'])
+
+        self.assertIn(0xc8, frame_ids)
+        self.assertIn(0x2c8, frame_ids)
+        self.assertNotIn(0x1f4, frame_ids)
+        self.assertNotIn(0x1f5, frame_ids)
+
+    def test_performance_frame_ids(self):
+        """Test the parse throughput of a synthetic candump log with 30 known
+        out of 2000 frame ids.
+
+        """
+
+        lines = 100000
+        log = _candump_log(lines, frame_ids=2000)
+        frame_ids = set(range(0, 2000, 67))
+
+        self.assertEqual(len(frame_ids), 30)
+
+        def parse(frame_ids):
+            parser = cantools.logreader.Parser(io.StringIO(log),
+                                               frame_ids=frame_ids)
+
+            return sum(1 for _ in parser)
+
+        self.assertEqual(parse(frame_ids), 30 * lines // 2000)
+
+        print()
+
+        time = timeit.timeit(lambda: parse(None), number=1)
+        print(f'All frame ids: {lines / time:.0f} lines/s')
+        time = timeit.timeit(lambda: parse(frame_ids), number=1)
+        print(f'30 of 2000 frame ids: {lines / time:.0f} lines/s')
+
+    def test_index(self):
+        log = '# header\n' + ''.join(f'({i:.6f}) can0 {i % 3:03X}#{i:02X}\n'
+                                     for i in range(100))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'candump.log')
+
+            with open(filename, 'w') as fout:
+                fout.write(log)
+
+            self.assertIsNone(cantools.logreader.load_index(filename))
+
+            index = cantools.logreader.build_index(filename, block_frames=10)
+
+            self.assertEqual(len(index.blocks), 10)
+            self.assertEqual(index.frame_ids, [0, 1, 2])
+            self.assertEqual(index.first_timestamp, 0.0)
+            self.assertEqual(index.blocks[0], (0, 0.0, 9.0, 0b111))
+
+            loaded = cantools.logreader.load_index(filename)
+
+            self.assertEqual(loaded.blocks, index.blocks)
+            self.assertEqual(loaded.frame_ids, index.frame_ids)
+            self.assertEqual(loaded.first_timestamp, 0.0)
+
+            # Blocks by time and frame id.
+            self.assertEqual(loaded.select(25, 44.5),
+                             [(index.blocks[2][0], index.blocks[5][0])])
+            self.assertEqual(loaded.select(frame_ids=[3]), [])
+            self.assertEqual(loaded.select(), [(0, len(log))])
+
+            with loaded.open(95) as fin:
+                self.assertEqual(fin.read(), log[index.blocks[9][0]:])
+
+            frames = list(loaded.frames(25, 44.5, [1], timestamps='float'))
+
+            self.assertEqual([(frame.timestamp, frame.frame_id, frame.data)
+                              for frame in frames],
+                             [
+                                 (25.0, 1, b'\x19'),
+                                 (28.0, 1, b'\x1c'),
+                                 (31.0, 1, b'\x1f'),
+                                 (34.0, 1, b'\x22'),
+                                 (37.0, 1, b'\x25'),
+                                 (40.0, 1, b'\x28'),
+                                 (43.0, 1, b'\x2b')
+                             ])
+
+            frames = list(loaded.frames(98))
+
+            self.assertEqual([frame.timestamp for frame in frames],
+                             [
+                                 datetime.datetime.fromtimestamp(
+                                     98,
+                                     datetime.timezone.utc),
+                                 datetime.datetime.fromtimestamp(
+                                     99,
+                                     datetime.timezone.utc)
+                             ])
+
+            # A malformed index is ignored.
+            with open(filename + '.idx') as fin:
+                data = json.load(fin)
+
+            for key, value in [
+                    ('blocks', None),
+                    ('blocks', [[0, 0.0, 9.0]]),
+                    ('blocks', [[0, 0.0, 9.0, 7]]),
+                    ('size', None)
+            ]:
+                malformed = dict(data)
+
+                if value is None:
+                    del malformed[key]
+                else:
+                    malformed[key] = value
+
+                with open(filename + '.idx', 'w') as fout:
+                    json.dump(malformed, fout)
+
+                self.assertIsNone(cantools.logreader.load_index(filename))
+
+            with open(filename + '.idx', 'w') as fout:
+                json.dump(data, fout)
+
+            self.assertIsNotNone(cantools.logreader.load_index(filename))
+
+            # The index is ignored once the log file is modified.
+            with open(filename, 'a') as fout:
+                fout.write('(100.000000) can0 000#00\n')
+
+            self.assertIsNone(cantools.logreader.load_index(filename))
+
+            filename = os.path.join(tmp, 'candump.log.gz')
+
+            with open(filename, 'wb') as fout:
+                fout.write(gzip.compress(log.encode('ascii')))
+
+            with self.assertRaises(ValueError) as cm:
+                cantools.logreader.build_index(filename)
+
+            self.assertEqual(str(cm.exception),
+                             'Compressed log files cannot be indexed.')
+
+    @benchmark
+    def test_performance_index(self):
+        """Test reading a short time range of a synthetic candump log with
+        and without an index.
+
+        """
+
+        lines = 200000
+        log = _candump_log(lines)
+        start = 1600000100
+        stop = 1600000110
+
+        def read_all():
+            with open(filename, 'rb') as fin:
+                return sum(1
+                           for frame in cantools.logreader.Parser(
+                                   fin,
+                                   timestamps='float')
+                           if start <= frame.timestamp <= stop)
+
+        def read_indexed():
+            return sum(1 for _ in index.frames(start, stop, timestamps='float'))
+
+        print()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'candump.log')
+
+            with open(filename, 'w') as fout:
+                fout.write(log)
+
+            time = timeit.timeit(
+                lambda: cantools.logreader.build_index(filename),
+                number=1)
+            print(f'build_index(): {lines / time:.0f} lines/s')
+            index = cantools.logreader.load_index(filename)
+
+            self.assertEqual(read_all(), 10001)
+            self.assertEqual(read_indexed(), 10001)
+
+            time = timeit.timeit(read_all, number=1)
+            print(f'10 s of {lines / 1000:.0f} s without index: {time:.3f} s')
+            time = timeit.timeit(read_indexed, number=1)
+            print(f'10 s of {lines / 1000:.0f} s with index: {time:.3f} s')
+
     def test_candump_log_fd_absolute_time(self):
         testvec = io.StringIO("""\
   (1613656104.493702) can2 102##1150B7F0102010010000064A0020000100000000000E41F000000000090D1FF000020A600000000210100000000000000